@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -35,6 +36,10 @@ INSTALLED_APPS += [
 ]
 
 MIDDLEWARE = [
+    # First, so its total covers the rest of the stack
+    'feedback.middleware.RequestTimingMiddleware',
+    # Before anything resolves URLs
+    'feedback.middleware.AsgiUrlconfMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -46,6 +51,10 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'core.urls'
 
+# URLconf for requests served over ASGI: the async variants of the JSON
+# endpoints, then everything in ROOT_URLCONF
+ASGI_ROOT_URLCONF = 'core.urls_asgi'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -75,6 +84,29 @@ DATABASES = {
     }
 }
 
+# SQLite tuned for many readers plus autosave writers, applied in prod.py
+# (`python manage.py benchmark_sqlite` compares it with the defaults):
+# - WAL lets reads carry on while a write is in progress
+# - synchronous=NORMAL only syncs at checkpoints; safe from corruption in
+#   WAL mode, a power cut can lose the last moments of commits
+# - writers wait up to `timeout` seconds for the lock instead of failing
+# - IMMEDIATE transactions take the write lock up front, so a transaction
+#   that reads then writes can't fail on upgrading its lock
+# - memory-mapped reads, a larger page cache and in-memory temp tables
+SQLITE_PRODUCTION_OPTIONS = {
+    'timeout': 20,
+    'transaction_mode': 'IMMEDIATE',
+    'init_command': (
+        'PRAGMA journal_mode=WAL;'
+        'PRAGMA synchronous=NORMAL;'
+        'PRAGMA mmap_size=268435456;'
+        'PRAGMA cache_size=-20000;'
+        'PRAGMA temp_store=MEMORY'
+    ),
+}
+# Seconds to keep a connection open between requests
+SQLITE_PRODUCTION_CONN_MAX_AGE = 600
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -118,6 +150,35 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+CACHES = {
+    'default': {
+        # LocMemCache that counts hits and misses for Server-Timing
+        'BACKEND': 'feedback.timing.TimedLocMemCache',
+        'LOCATION': 'feedback',
+    }
+}
+
+# Seconds a rendered rubric is cached; entries are keyed by template content
+FEEDBACK_PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Release identifier (e.g. the commit id) folded into the ETags and cache
+# keys of template pages, for code changes feedback.page_cache can't see
+FEEDBACK_DEPLOY_ID = os.environ.get('FEEDBACK_DEPLOY_ID', '')
+
+# Buffer editor autosaves in memory and write them in batches (see
+# feedback/autosave.py), and how many seconds to buffer them for. The
+# buffer is per process, so it's only used when FEEDBACK_SINGLE_WORKER
+# declares that the app runs in exactly one worker process.
+FEEDBACK_AUTOSAVE_WRITE_BEHIND = False
+FEEDBACK_AUTOSAVE_FLUSH_INTERVAL = 2.0
+FEEDBACK_SINGLE_WORKER = False
+
+# Send Server-Timing headers (off in prod), and log requests slower than
+# this many milliseconds to the "feedback.slow_requests" logger (None to
+# disable)
+FEEDBACK_SERVER_TIMING = True
+FEEDBACK_SLOW_REQUEST_MS = 500
+
 # Logging configuration
 # Suppress "Broken pipe" warnings from tests
 LOGGING = {
@@ -134,5 +195,11 @@ LOGGING = {
             'level': 'ERROR',  # Only show errors, not warnings
             'propagate': False,
         },
+        # One JSON object per slow request
+        'feedback.slow_requests': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     },
 }
@@ -3,7 +3,21 @@ from .base import *
 
 DEBUG = False
 RUBRIC_MODE = True
+
 ALLOWED_HOSTS = ['mblacklock.pythonanywhere.com']
 
+DATABASES = {
+    'default': {
+        **DATABASES['default'],
+        'OPTIONS': SQLITE_PRODUCTION_OPTIONS,
+        'CONN_MAX_AGE': SQLITE_PRODUCTION_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+# The Server-Timing header shows every visitor query counts and render
+# timings; keep the slow request log only
+FEEDBACK_SERVER_TIMING = False
+
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = 'django-insecure-@4egzz4rm--gqesxb#f013#7(h!2t226s(-70f5y0vxj$fmths'
\ No newline at end of file
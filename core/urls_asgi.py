@@ -0,0 +1,19 @@
+"""
+URL configuration for requests served over ASGI.
+
+`feedback.middleware.AsgiUrlconfMiddleware` resolves ASGI requests here.
+The async variants of the JSON endpoints come first, with the same routes
+and names as their sync views, so they take those URLs; everything else
+falls through to `core.urls`.
+"""
+from django.urls import include, path
+
+from core.urls import urlpatterns as sync_urlpatterns
+from feedback.urls import async_urlpatterns as feedback_async_urlpatterns
+from feedback_generator.urls import async_urlpatterns as generator_async_urlpatterns
+
+urlpatterns = [
+    path("feedback/", include(feedback_async_urlpatterns)),
+    path("feedback-generator/", include(generator_async_urlpatterns)),
+    *sync_urlpatterns,
+]
@@ -4,3 +4,18 @@ from django.apps import AppConfig
 class FeedbackConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'feedback'
+
+    def ready(self):
+        # Memory-map the precomputed grade band table once per process
+        from feedback.utils import load_grade_band_table
+        load_grade_band_table()
+        
+        # Drop cached rendered pages when templates change
+        from feedback import signals  # noqa: F401
+        
+        from feedback import checks  # noqa: F401
+        
+        # Time queries and template rendering, if the Server-Timing header or
+        # slow request log is on
+        from feedback.timing import install
+        install()
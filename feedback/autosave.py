@@ -0,0 +1,250 @@
+"""Write-behind buffering of editor autosaves.
+
+SQLite allows one writer at a time, so when many people are editing,
+one write transaction per autosave queues up behind the database lock.
+With `FEEDBACK_AUTOSAVE_WRITE_BEHIND` enabled, `template_update` validates
+each autosave and stages the changed fields here instead of writing them.
+Successive autosaves of a template merge into one pending save. Every
+`FEEDBACK_AUTOSAVE_FLUSH_INTERVAL` seconds a background thread writes all
+pending saves in a single transaction.
+
+Pending saves are also flushed:
+
+- by the next autosave staged once the interval has passed, so they're
+  written even where the server doesn't run application threads (e.g.
+  uWSGI without enable-threads),
+- when the editor page closes (the editor sends a beacon to the flush
+  endpoint),
+- before the edit, rubric and feedback sheet pages of that template are
+  rendered, so people always read their own writes,
+- when the process exits.
+
+Each accepted autosave still gets a new version number immediately. The
+flush writes that version, so the client's stale-write checks keep
+working across flushes.
+
+The buffer lives in one process. With several worker processes, another
+worker would read the template's stored version and answer an editor's
+next autosave with a spurious 409. So the buffer is only used when
+`FEEDBACK_SINGLE_WORKER` is also set, and a system check warns when
+write-behind is requested without it.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 2.0
+
+
+def write_behind_requested():
+    return getattr(settings, "FEEDBACK_AUTOSAVE_WRITE_BEHIND", False)
+
+
+class AutosaveConflict(Exception):
+    """The template has been saved since the version the edit was made against."""
+
+    def __init__(self, version):
+        super().__init__(f"Template is at version {version}")
+        self.version = version
+
+
+class PendingSave:
+    """Field values waiting to be written for one template."""
+
+    __slots__ = ("values", "base_version", "version")
+
+    def __init__(self, base_version):
+        self.values = {}
+        # Stored version the pending values were made against
+        self.base_version = base_version
+        # Version the template will have once they're written
+        self.version = base_version
+
+
+class AutosaveBuffer:
+    """Per-process buffer of pending template saves."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Held for the whole of a flush so saves of a template land in order
+        self._flush_lock = threading.Lock()
+        self._pending = {}
+        self._flushing = {}
+        # When the oldest pending save is due to be written
+        self._due = None
+        self._worker = None
+        self._worker_pid = None
+
+    @property
+    def enabled(self):
+        return write_behind_requested() and getattr(settings, "FEEDBACK_SINGLE_WORKER", False)
+
+    @property
+    def interval(self):
+        return getattr(settings, "FEEDBACK_AUTOSAVE_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)
+
+    def has_pending(self, pk):
+        with self._lock:
+            return pk in self._pending or pk in self._flushing
+
+    def load(self, pk):
+        """
+        Fetch a template with any pending changes applied.
+
+        Raises AssessmentTemplate.DoesNotExist like `objects.get`.
+        """
+        from feedback.models import AssessmentTemplate
+
+        # Snapshot the buffer before reading the row: an entry only leaves
+        # the buffer once its flush has committed, so the row is never older
+        # than the snapshot assumes
+        with self._lock:
+            entries = [entry for entry in (self._flushing.get(pk), self._pending.get(pk)) if entry]
+            snapshot = [(dict(entry.values), entry.version) for entry in entries]
+        tpl = AssessmentTemplate.objects.get(pk=pk)
+        for values, version in snapshot:
+            for field, value in values.items():
+                setattr(tpl, field, value)
+            tpl.version = version
+        if snapshot:
+            tpl.content_hash = tpl.compute_content_hash()
+        return tpl
+
+    def stage(self, tpl, fields):
+        """
+        Buffer changed fields of a template returned by `load`.
+
+        Returns:
+            The template's new version
+        Raises:
+            AutosaveConflict if another autosave was staged since `load`
+        """
+        with self._lock:
+            entry = self._pending.get(tpl.pk)
+            current = entry or self._flushing.get(tpl.pk)
+            if current is not None and current.version != tpl.version:
+                raise AutosaveConflict(current.version)
+            if entry is None:
+                entry = self._pending[tpl.pk] = PendingSave(tpl.version)
+            for field in fields:
+                entry.values[field] = getattr(tpl, field)
+            entry.version = tpl.version + 1
+            version = entry.version
+            if self._due is None and self.interval > 0:
+                self._due = time.monotonic() + self.interval
+            due = self._due is not None and time.monotonic() >= self._due
+        if due:
+            # The flush thread hasn't got to them (or can't run); write now
+            self.flush()
+        else:
+            self._ensure_worker()
+        return version
+
+    def discard(self, pk):
+        """Drop pending changes, e.g. because the template was deleted."""
+        with self._lock:
+            self._pending.pop(pk, None)
+
+    def flush(self, pk=None):
+        """
+        Write pending saves (of one template, or all) in one transaction.
+
+        Failed writes are put back to be retried on the next flush.
+
+        Returns:
+            Number of templates written
+        """
+        from feedback.models import AssessmentTemplate
+
+        with self._flush_lock:
+            with self._lock:
+                if pk is None:
+                    self._flushing, self._pending = self._pending, {}
+                elif pk in self._pending:
+                    self._flushing = {pk: self._pending.pop(pk)}
+                if not self._pending:
+                    self._due = None
+                if not self._flushing:
+                    return 0
+                batch = dict(self._flushing)
+
+            written = 0
+            try:
+                with transaction.atomic():
+                    # Write first so SQLite takes (and waits for) the write
+                    # lock up front; a transaction that reads first can't
+                    # upgrade its lock while another writer holds it
+                    AssessmentTemplate.objects.filter(pk__in=list(batch)).update(version=F("version"))
+                    templates = AssessmentTemplate.objects.select_for_update().in_bulk(list(batch))
+                    for tpl_pk, entry in batch.items():
+                        tpl = templates.get(tpl_pk)
+                        if tpl is None:
+                            continue  # deleted since
+                        if tpl.version != entry.base_version:
+                            logger.warning(
+                                "Template %s was saved elsewhere (version %s, expected %s); "
+                                "buffered autosave overwrites it", tpl_pk, tpl.version, entry.base_version,
+                            )
+                        for field, value in entry.values.items():
+                            setattr(tpl, field, value)
+                        # save() increments the version to the one clients were given
+                        tpl.version = entry.version - 1
+                        tpl.save(update_fields=list(entry.values))
+                        written += 1
+            except Exception:
+                logger.exception("Flushing buffered autosaves failed; will retry")
+                with self._lock:
+                    self._requeue(batch)
+                written = 0
+            finally:
+                with self._lock:
+                    self._flushing = {}
+            return written
+
+    def _requeue(self, batch):
+        if self._due is None and self.interval > 0:
+            self._due = time.monotonic() + self.interval
+        for pk, entry in batch.items():
+            newer = self._pending.get(pk)
+            if newer is None:
+                self._pending[pk] = entry
+            else:
+                newer.values = {**entry.values, **newer.values}
+                newer.base_version = entry.base_version
+
+    def _ensure_worker(self):
+        if self.interval <= 0:
+            return
+        # Threads don't survive a fork, so each worker process starts its own
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive() and self._worker_pid == os.getpid():
+                return
+            self._worker = threading.Thread(target=self._run, name="autosave-flush", daemon=True)
+            self._worker_pid = os.getpid()
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            finally:
+                connection.close()
+
+    def flush_at_exit(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Flushing buffered autosaves at exit failed")
+
+
+autosave_buffer = AutosaveBuffer()
+atexit.register(autosave_buffer.flush_at_exit)
@@ -0,0 +1,175 @@
+"""Benchmarks for the grade band engine.
+
+Each benchmark sweeps max_marks 1..N for every subdivision and degree level
+and records throughput (operations per second, best of several repeats) and
+the memory each call allocates for its result. Results can be stored as a
+baseline and later runs compared against it, so changes to the engine can be
+judged on numbers. Run them with `python manage.py benchmark_grading`.
+
+Throughput depends on the machine, so a baseline is only meaningful on the
+machine (and Python version) it was recorded on.
+"""
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from pathlib import Path
+
+from feedback.utils import (
+    GRADE_BAND_TABLE_MAX_MARKS,
+    calculate_grade_bands,
+    grade_for_percentage,
+    group_bands_by_main_grade,
+    validate_subdivision,
+)
+
+BENCHMARK_BASELINE_PATH = Path(__file__).resolve().parent / "data" / "grading_benchmark_baseline.json"
+
+BENCHMARK_SUBDIVISIONS = ("none", "high_low", "high_mid_low")
+BENCHMARK_DEGREE_LEVELS = ("BEng", "MEng/MSc")
+
+# Default allowed regressions: throughput may drop by 30% (timings are noisy)
+# and allocation per call may grow by 10% plus a few bytes of rounding slack.
+DEFAULT_SPEED_TOLERANCE = 0.30
+DEFAULT_ALLOCATION_TOLERANCE = 0.10
+ALLOCATION_SLACK_BYTES = 8
+
+
+def _sweep(max_marks):
+    return [
+        (marks, subdivision, degree_level)
+        for marks in range(1, max_marks + 1)
+        for subdivision in BENCHMARK_SUBDIVISIONS
+        for degree_level in BENCHMARK_DEGREE_LEVELS
+    ]
+
+
+def _benchmark_cases(max_marks):
+    """Return {name: (function, list of argument tuples, one per operation)}."""
+    sweep = _sweep(max_marks)
+    bands = [calculate_grade_bands(*args) for args in sweep]
+    percentages = [(band.marks / args[0] * 100,) for args, result in zip(sweep, bands) for band in result]
+
+    return {
+        "calculate_grade_bands": (calculate_grade_bands, sweep),
+        "validate_subdivision": (validate_subdivision, sweep),
+        "grade_for_percentage": (grade_for_percentage, percentages),
+        "group_bands_by_main_grade": (group_bands_by_main_grade, [(result,) for result in bands]),
+    }
+
+
+def _time_sweep(func, calls):
+    # Like timeit, keep garbage collection pauses out of the timings
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for args in calls:
+            func(*args)
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _measure_allocations(func, calls):
+    """Bytes and memory blocks allocated by the results of one sweep."""
+    # Keep every result alive so everything a call allocates is counted
+    results = [None] * len(calls)
+    tracemalloc.start()
+    try:
+        for i, args in enumerate(calls):
+            results[i] = func(*args)
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    stats = snapshot.statistics("filename")
+    return sum(stat.size for stat in stats), sum(stat.count for stat in stats)
+
+
+def run_benchmarks(max_marks=GRADE_BAND_TABLE_MAX_MARKS, repeat=5):
+    """
+    Run every benchmark and return the results.
+
+    Args:
+        max_marks: Sweep max_marks from 1 up to this value
+        repeat: Timed runs per benchmark; the fastest is reported
+
+    Returns:
+        Dict of {"max_marks", "python", "machine", "results"} where results
+        maps each benchmark name to {"ops", "ops_per_sec", "bytes_per_op",
+        "blocks_per_op"}
+    """
+    results = {}
+    for name, (func, calls) in _benchmark_cases(max_marks).items():
+        # Warm up lazily built tables and caches before measuring
+        _time_sweep(func, calls)
+
+        best = min(_time_sweep(func, calls) for _ in range(max(repeat, 1)))
+        allocated_bytes, allocated_blocks = _measure_allocations(func, calls)
+
+        ops = len(calls)
+        results[name] = {
+            "ops": ops,
+            "ops_per_sec": round(ops / best, 1) if best > 0 else float("inf"),
+            "bytes_per_op": round(allocated_bytes / ops, 1),
+            "blocks_per_op": round(allocated_blocks / ops, 2),
+        }
+
+    return {
+        "max_marks": max_marks,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare_to_baseline(
+    current,
+    baseline,
+    speed_tolerance=DEFAULT_SPEED_TOLERANCE,
+    allocation_tolerance=DEFAULT_ALLOCATION_TOLERANCE,
+):
+    """
+    Compare benchmark results against a stored baseline.
+
+    Returns:
+        List of human-readable regression messages (empty if none regressed)
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+
+        min_ops = base["ops_per_sec"] * (1 - speed_tolerance)
+        if result["ops_per_sec"] < min_ops:
+            regressions.append(
+                f"{name}: {result['ops_per_sec']:,.0f} ops/sec is below the baseline "
+                f"{base['ops_per_sec']:,.0f} ops/sec by more than {speed_tolerance:.0%}"
+            )
+
+        max_bytes = base["bytes_per_op"] * (1 + allocation_tolerance) + ALLOCATION_SLACK_BYTES
+        if result["bytes_per_op"] > max_bytes:
+            regressions.append(
+                f"{name}: {result['bytes_per_op']:,.1f} bytes allocated per call exceeds the baseline "
+                f"{base['bytes_per_op']:,.1f} bytes by more than {allocation_tolerance:.0%}"
+            )
+    return regressions
+
+
+def load_baseline(path):
+    """Load a stored baseline, or return None if there isn't one."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, results):
+    """Store benchmark results as the baseline for later runs."""
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
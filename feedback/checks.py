@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from feedback.autosave import write_behind_requested
+
+
+@register()
+def check_write_behind_single_worker(app_configs, **kwargs):
+    """Write-behind autosaves are per process, so they need a single worker."""
+    if write_behind_requested() and not getattr(settings, "FEEDBACK_SINGLE_WORKER", False):
+        return [
+            Warning(
+                "FEEDBACK_AUTOSAVE_WRITE_BEHIND is ignored because FEEDBACK_SINGLE_WORKER isn't set.",
+                hint=(
+                    "The autosave buffer lives in one process; with several workers, editors "
+                    "get spurious version conflicts. Set FEEDBACK_SINGLE_WORKER = True only if "
+                    "the app runs in exactly one worker process."
+                ),
+                id="feedback.W001",
+            )
+        ]
+    return []
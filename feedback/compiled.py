@@ -0,0 +1,70 @@
+"""Precomputed display data for assessment templates.
+
+The rubric and feedback sheet need every grade category's bands, the bands
+grouped by main grade, the total of the category maxima and whether it
+matches the assessment's max marks. That only changes when the template is
+saved, so `AssessmentTemplate.save` stores it in the `compiled` JSON column
+and the read views render straight from it.
+
+Bump `COMPILED_FORMAT_VERSION` whenever the stored structure or the band
+calculation changes; rows compiled with another version are recompiled on
+read until `python manage.py compile_templates` backfills them.
+"""
+from feedback.utils import get_grade_bands, group_bands_by_main_grade
+
+COMPILED_FORMAT_VERSION = 1
+
+
+def compile_template(template):
+    """
+    Build the display data for a template.
+
+    Returns:
+        Dict with the format `version`, `categories` (each category dict
+        plus `bands`, `grouped_bands` and `grade_descriptions` for grade
+        categories), `total_category_marks` and `marks_mismatch` ({total,
+        max_marks} when the category maxima don't add up to max_marks)
+    """
+    categories = []
+    total_category_marks = 0
+    for cat in template.categories:
+        cat_data = dict(cat)
+        total_category_marks += cat.get("max", 0)
+
+        if cat.get("type") == "grade" and cat.get("subdivision"):
+            bands = get_grade_bands(cat["max"], cat["subdivision"], degree_level=template.degree_level)
+            cat_data["bands"] = [dict(band) for band in bands]
+            cat_data["grouped_bands"] = {
+                main_grade: [dict(band) for band in band_list]
+                for main_grade, band_list in group_bands_by_main_grade(bands).items()
+            }
+            # One description per main grade
+            cat_data["grade_descriptions"] = cat.get("grade_band_descriptions", {})
+
+        categories.append(cat_data)
+
+    marks_mismatch = None
+    if total_category_marks != template.max_marks:
+        marks_mismatch = {
+            "total": total_category_marks,
+            "max_marks": template.max_marks,
+        }
+
+    return {
+        "version": COMPILED_FORMAT_VERSION,
+        "categories": categories,
+        "total_category_marks": total_category_marks,
+        "marks_mismatch": marks_mismatch,
+    }
+
+
+def is_compiled(template):
+    """True if the stored display data was built by the current format version."""
+    return bool(template.compiled) and template.compiled.get("version") == COMPILED_FORMAT_VERSION
+
+
+def compiled_data(template):
+    """Stored display data for a template, compiled now if missing or outdated."""
+    if is_compiled(template):
+        return template.compiled
+    return compile_template(template)
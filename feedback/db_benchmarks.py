@@ -0,0 +1,201 @@
+"""Concurrency benchmark for SQLite connection profiles.
+
+Runs reader and autosave-writer processes against a scratch copy of the
+templates table and reports throughput, latency and "database is locked"
+errors for each profile. Readers fetch a whole template, as the rubric and
+edit pages do. Writers do what `template_update` does: read the row and
+write new categories in one transaction.
+
+The "default" profile is Django's out-of-the-box SQLite: rollback journal,
+a connection per request and deferred transactions. The "production"
+profile is `SQLITE_PRODUCTION_OPTIONS` and `SQLITE_PRODUCTION_CONN_MAX_AGE`
+from the settings. Run it with `python manage.py benchmark_sqlite`.
+"""
+import json
+import math
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from django.conf import settings
+
+# Django's sqlite3 backend waits this long for a lock by default
+DEFAULT_SQLITE_TIMEOUT = 5.0
+
+_SCHEMA = """
+CREATE TABLE template (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    categories TEXT NOT NULL,
+    compiled TEXT NOT NULL,
+    version INTEGER NOT NULL
+)
+"""
+
+
+def sqlite_profiles():
+    """Return {name: {"options", "persistent"}} for the profiles to compare."""
+    return {
+        "default": {"options": {}, "persistent": False},
+        "production": {
+            "options": settings.SQLITE_PRODUCTION_OPTIONS,
+            "persistent": bool(settings.SQLITE_PRODUCTION_CONN_MAX_AGE),
+        },
+    }
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def connect(path, options):
+    """Open a connection the way Django's sqlite3 backend would with these OPTIONS."""
+    conn = sqlite3.connect(path, timeout=options.get("timeout", DEFAULT_SQLITE_TIMEOUT), isolation_level=None)
+    for command in options.get("init_command", "").split(";"):
+        if command.strip():
+            conn.execute(command)
+    return conn
+
+
+def _categories(n_categories, seed):
+    rng = random.Random(seed)
+    return [
+        {
+            "label": f"Category {i}",
+            "max": 10,
+            "type": "grade",
+            "subdivision": "high_low",
+            "grade_band_descriptions": {
+                grade: " ".join(rng.choice(("clear", "thorough", "limited", "accurate", "weak")) for _ in range(30))
+                for grade in ("1st", "2:1", "2:2", "3rd", "Fail")
+            },
+        }
+        for i in range(n_categories)
+    ]
+
+
+def create_database(path, rows, options):
+    """Create the scratch table and fill it with `rows` templates."""
+    conn = connect(path, options)
+    conn.execute(_SCHEMA)
+    conn.execute("BEGIN")
+    for pk in range(1, rows + 1):
+        categories = json.dumps(_categories(5, pk))
+        conn.execute(
+            "INSERT INTO template (id, title, categories, compiled, version) VALUES (?, ?, ?, ?, 1)",
+            (pk, f"Template {pk}", categories, categories),
+        )
+    conn.execute("COMMIT")
+    conn.close()
+
+
+def _read(conn, pk):
+    conn.execute("SELECT id, title, categories, compiled, version FROM template WHERE id = ?", (pk,)).fetchone()
+
+
+def _write(conn, pk, transaction_mode):
+    conn.execute(f"BEGIN {transaction_mode}" if transaction_mode else "BEGIN")
+    try:
+        row = conn.execute("SELECT categories, version FROM template WHERE id = ?", (pk,)).fetchone()
+        categories = json.loads(row[0])
+        categories[0]["grade_band_descriptions"]["1st"] += "."
+        encoded = json.dumps(categories)
+        conn.execute(
+            "UPDATE template SET categories = ?, compiled = ?, version = ? WHERE id = ?",
+            (encoded, encoded, row[1] + 1, pk),
+        )
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+
+def _worker(role, path, profile, rows, duration, seed, results):
+    rng = random.Random(seed)
+    options = profile["options"]
+    conn = connect(path, options) if profile["persistent"] else None
+    ops = errors = 0
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        pk = rng.randint(1, rows)
+        start = time.perf_counter()
+        try:
+            # Without persistent connections each request opens its own
+            request_conn = conn or connect(path, options)
+            try:
+                if role == "reader":
+                    _read(request_conn, pk)
+                else:
+                    _write(request_conn, pk, options.get("transaction_mode"))
+            finally:
+                if conn is None:
+                    request_conn.close()
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+            errors += 1
+        else:
+            ops += 1
+            latencies.append(time.perf_counter() - start)
+    if conn is not None:
+        conn.close()
+    results.put((role, ops, errors, latencies))
+
+
+def run_profile(profile, readers=4, writers=4, duration=5.0, rows=200):
+    """
+    Benchmark one profile with concurrent reader and writer processes.
+
+    Returns:
+        Dict of {"reads_per_sec", "writes_per_sec", "read_p95_ms",
+        "write_p95_ms", "lock_errors"}
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "benchmark.sqlite3")
+        create_database(path, rows, profile["options"])
+
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=_worker, args=(role, path, profile, rows, duration, seed, results))
+            for seed, role in enumerate(["reader"] * readers + ["writer"] * writers)
+        ]
+        for process in processes:
+            process.start()
+        collected = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    totals = {"reader": [0, []], "writer": [0, []]}
+    lock_errors = 0
+    for role, ops, errors, latencies in collected:
+        totals[role][0] += ops
+        totals[role][1].extend(latencies)
+        lock_errors += errors
+
+    def p95_ms(latencies):
+        value = percentile(latencies, 95)
+        return None if value is None else round(value * 1000, 2)
+
+    return {
+        "reads_per_sec": round(totals["reader"][0] / duration, 1),
+        "writes_per_sec": round(totals["writer"][0] / duration, 1),
+        "read_p95_ms": p95_ms(totals["reader"][1]),
+        "write_p95_ms": p95_ms(totals["writer"][1]),
+        "lock_errors": lock_errors,
+    }
+
+
+def run_sqlite_benchmark(profiles=None, **kwargs):
+    """Run `run_profile` for each named profile; returns {name: results}."""
+    available = sqlite_profiles()
+    return {name: run_profile(available[name], **kwargs) for name in (profiles or available)}
@@ -0,0 +1,226 @@
+"""Grading scheme registry.
+
+Grading schemes are declared as plain data and compiled once at import into
+the bisect tables and band anchor arrays used by the grade band engine in
+`feedback.utils`. Supporting another institution's boundaries means adding a
+definition here (and, if needed, a degree level prefix), not a new code path.
+
+A definition is a dict with:
+
+- `name`: unique scheme name
+- `grades`: main grades, highest first, with the lowest percentage that
+  earns each one. Band marks are kept inside these grades.
+- `classification` (optional): grade labels and lower percentages used to
+  classify an overall percentage; defaults to `grades`
+- `subdivisions`: for each subdivision, the representative bands as
+  (label, target fraction of max marks, grade the mark must fall in)
+- `fail_bands`: (label, target fraction) fail sub-bands appended to every
+  subdivision
+- `snap_fail_bands`: keep fail band marks inside the lowest grade (True) or
+  use plain rounding of the target (False)
+- `relabel` (optional): (grade, new text) pairs applied to subdivision
+  band labels
+- `main_grades` (optional): (grade, main grade) pairs, highest first, giving
+  the heading each grade's bands are displayed under. Grades left out are not
+  displayed; defaults to every grade under its own name
+"""
+import hashlib
+from bisect import bisect_right
+from collections import namedtuple
+
+
+UK_UNDERGRADUATE = {
+    "name": "uk_ug",
+    "grades": (("1st", 70), ("2:1", 60), ("2:2", 50), ("3rd", 40), ("Fail", 0)),
+    "subdivisions": {
+        "none": (
+            ("Max 1st", 1.00, "1st"),
+            ("High 1st", 0.90, "1st"),
+            ("Mid 1st", 0.80, "1st"),
+            ("Low 1st", 0.70, "1st"),
+            ("2:1", 0.60, "2:1"),
+            ("2:2", 0.50, "2:2"),
+            ("3rd", 0.40, "3rd"),
+        ),
+        "high_low": (
+            ("Max 1st", 1.00, "1st"),
+            ("High 1st", 0.85, "1st"),
+            ("Low 1st", 0.72, "1st"),
+            ("High 2:1", 0.65, "2:1"),
+            ("Low 2:1", 0.62, "2:1"),
+            ("High 2:2", 0.55, "2:2"),
+            ("Low 2:2", 0.52, "2:2"),
+            ("High 3rd", 0.45, "3rd"),
+            ("Low 3rd", 0.42, "3rd"),
+        ),
+        "high_mid_low": (
+            ("Max 1st", 1.00, "1st"),
+            ("High 1st", 0.90, "1st"),
+            ("Mid 1st", 0.80, "1st"),
+            ("Low 1st", 0.70, "1st"),
+            ("High 2:1", 0.67, "2:1"),
+            ("Mid 2:1", 0.63, "2:1"),
+            ("Low 2:1", 0.60, "2:1"),
+            ("High 2:2", 0.57, "2:2"),
+            ("Mid 2:2", 0.53, "2:2"),
+            ("Low 2:2", 0.50, "2:2"),
+            ("High 3rd", 0.47, "3rd"),
+            ("Mid 3rd", 0.43, "3rd"),
+            ("Low 3rd", 0.40, "3rd"),
+        ),
+    },
+    # Undergraduate fail anchors: 30%, 20%, 10%, 0%
+    "fail_bands": (("Close Fail", 0.30), ("Fail", 0.20), ("Poor Fail", 0.10), ("Zero Fail", 0.0)),
+    "snap_fail_bands": True,
+}
+
+# Level 7 (MEng/MSc) keeps the undergraduate band marks but relabels the
+# passing grades, classifies with a 50% pass mark and uses an even split
+# (37.5%, 25%, 12.5%, 0%) for the fail bands.
+UK_LEVEL7 = {
+    **UK_UNDERGRADUATE,
+    "name": "uk_level7",
+    "classification": (("Dist", 70), ("Merit", 60), ("Pass", 50), ("Fail", 0)),
+    "fail_bands": (("Close Fail", 0.375), ("Fail", 0.25), ("Poor Fail", 0.125), ("Zero Fail", 0.0)),
+    "snap_fail_bands": False,
+    "relabel": (("1st", "1st/Dist"), ("2:1", "2:1/Merit"), ("2:2", "2:2/Pass")),
+    # 40-49% is a fail at Level 7, so the 3rd bands are not displayed
+    "main_grades": (("1st", "Dist"), ("2:1", "Merit"), ("2:2", "Pass"), ("Fail", "Fail")),
+}
+
+DEFAULT_GRADING_SCHEME = "uk_ug"
+
+# Degree levels starting with these prefixes (case-insensitive) use the
+# given scheme, e.g. 'MEng', 'MSc' and 'MEng/MSc' are Level 7.
+DEGREE_LEVEL_PREFIXES = (("m", "uk_level7"),)
+
+
+# One representative band. `lower`/`upper` are the percentage bounds of
+# `grade` (upper is None for the top grade); `snap` keeps the mark inside them.
+# `main_grade` is the heading the band is displayed under and `order` that
+# heading's position (both None when the band is not displayed).
+BandSlot = namedtuple(
+    "BandSlot", ["label", "target", "grade", "lower", "upper", "snap", "main_grade", "order"]
+)
+
+
+class GradingScheme:
+    """A grading scheme definition compiled into lookup tables."""
+
+    def __init__(self, definition):
+        self.name = definition["name"]
+
+        # Percentage bounds of each grade, used to keep band marks in range
+        self.grade_bounds = {}
+        upper = None
+        for grade, lower in definition["grades"]:
+            self.grade_bounds[grade] = (lower, upper)
+            upper = lower
+        fail_grade = definition["grades"][-1][0]
+
+        # Display heading of each grade and the order headings are shown in
+        grade_groups = definition.get("main_grades", tuple((grade, grade) for grade, _ in definition["grades"]))
+        self.main_grades = tuple(dict.fromkeys(main_grade for _, main_grade in grade_groups))
+        self.grade_groups = dict(grade_groups)
+
+        # Sorted lower bounds of every classification grade above the lowest
+        classification = definition.get("classification", definition["grades"])
+        self.labels = tuple(label for label, _ in classification)
+        self.thresholds = tuple(lower for _, lower in reversed(classification[:-1]))
+
+        relabel = tuple(definition.get("relabel", ()))
+        snap_fail = definition["snap_fail_bands"]
+        self.fail_bands = tuple(
+            self._slot(label, target, fail_grade, snap_fail)
+            for label, target in definition["fail_bands"]
+        )
+        self.bands = {
+            subdivision: tuple(
+                self._slot(label, target, grade, True, relabel) for label, target, grade in anchors
+            ) + self.fail_bands
+            for subdivision, anchors in definition["subdivisions"].items()
+        }
+        self.subdivisions = tuple(self.bands)
+        self.fingerprints = {
+            subdivision: slots_fingerprint(slots) for subdivision, slots in self.bands.items()
+        }
+
+    def _slot(self, label, target, grade, snap, relabel=()):
+        # Labels without a relabelled grade (e.g. 3rd variants) keep their name
+        for old, new in relabel:
+            if old in label:
+                label = label.replace(old, new)
+                break
+        lower, upper = self.grade_bounds[grade]
+        main_grade = self.grade_groups.get(grade)
+        order = self.main_grades.index(main_grade) if main_grade is not None else None
+        return BandSlot(label, target, grade, lower, upper, snap, main_grade, order)
+
+    def band_slots(self, subdivision):
+        """Band slots for a subdivision; unknown subdivisions only get fail bands."""
+        return self.bands.get(subdivision, self.fail_bands)
+
+    def classify(self, percentage):
+        """Return the classification label for a single percentage."""
+        # NaN compares unequal to itself; treat it as the lowest grade
+        if percentage != percentage:
+            return self.labels[-1]
+        return self.labels[len(self.thresholds) - bisect_right(self.thresholds, percentage)]
+
+    def __repr__(self):
+        return f"<GradingScheme {self.name}>"
+
+
+def slots_fingerprint(slots):
+    """Stable fingerprint of everything that determines a block of band marks."""
+    spec = repr(tuple((slot.target, slot.lower, slot.upper, slot.snap) for slot in slots))
+    return hashlib.sha256(spec.encode()).digest()[:8]
+
+
+GRADING_SCHEMES = {}
+
+# Resolved scheme for each degree level value seen, so the string work runs once
+_schemes_by_degree_level = {}
+_DEGREE_LEVEL_CACHE_SIZE = 256
+
+
+def register_grading_scheme(definition):
+    """Compile a scheme definition and add (or replace) it in the registry."""
+    scheme = GradingScheme(definition)
+    GRADING_SCHEMES[scheme.name] = scheme
+    _schemes_by_degree_level.clear()
+    return scheme
+
+
+def _resolve_degree_level(degree_level):
+    if isinstance(degree_level, str):
+        key = degree_level.strip().lower()
+        if key in GRADING_SCHEMES:
+            return GRADING_SCHEMES[key]
+        for prefix, name in DEGREE_LEVEL_PREFIXES:
+            if key.startswith(prefix):
+                return GRADING_SCHEMES[name]
+    return GRADING_SCHEMES[DEFAULT_GRADING_SCHEME]
+
+
+def scheme_for_degree_level(degree_level):
+    """
+    Return the compiled grading scheme for a degree level.
+
+    Accepts a degree level (e.g. 'BEng', 'MEng/MSc'), a registered scheme
+    name, or None for the default scheme.
+    """
+    try:
+        return _schemes_by_degree_level[degree_level]
+    except KeyError:
+        scheme = _resolve_degree_level(degree_level)
+        # Degree levels can come from request parameters; don't grow unbounded
+        if len(_schemes_by_degree_level) < _DEGREE_LEVEL_CACHE_SIZE:
+            _schemes_by_degree_level[degree_level] = scheme
+        return scheme
+    except TypeError:
+        return _resolve_degree_level(degree_level)
+
+
+for _definition in (UK_UNDERGRADUATE, UK_LEVEL7):
+    register_grading_scheme(_definition)
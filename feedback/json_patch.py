@@ -0,0 +1,127 @@
+"""JSON Patch (RFC 6902) for the template's JSON documents.
+
+The editor autosaves edits to `categories` and `charts` as patch operations
+instead of re-sending the whole array, e.g.
+
+    [{"op": "replace", "path": "/0/grade_band_descriptions/1st", "value": "..."}]
+
+All six operations (add, remove, replace, move, copy, test) are supported,
+with paths written as JSON Pointers (RFC 6901).
+"""
+import copy
+
+PATCH_OPERATIONS = ("add", "remove", "replace", "move", "copy", "test")
+
+
+class JsonPatchError(ValueError):
+    """A patch is malformed or an operation can't be applied to the document."""
+
+
+class JsonPatchConflict(JsonPatchError):
+    """A `test` operation failed: the document isn't in the state the patch expects."""
+
+
+def _parse_pointer(pointer):
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith("/")):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    if not pointer:
+        return []
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _list_index(container, token, allow_end=False):
+    if allow_end and token == "-":
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    limit = len(container) if allow_end else len(container) - 1
+    if index > limit:
+        raise JsonPatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _resolve(document, tokens):
+    """Return the value the tokens point at."""
+    node = document
+    for token in tokens:
+        if isinstance(node, list):
+            node = node[_list_index(node, token)]
+        elif isinstance(node, dict):
+            if token not in node:
+                raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+            node = node[token]
+        else:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+    return node
+
+
+def _add(document, tokens, value):
+    if not tokens:
+        return value
+    parent = _resolve(document, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, list):
+        parent.insert(_list_index(parent, key, allow_end=True), value)
+    elif isinstance(parent, dict):
+        parent[key] = value
+    else:
+        raise JsonPatchError(f"Can't add to a scalar at /{'/'.join(tokens[:-1])}")
+    return document
+
+
+def _remove(document, tokens):
+    if not tokens:
+        raise JsonPatchError("Can't remove the whole document")
+    parent = _resolve(document, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, list):
+        return document, parent.pop(_list_index(parent, key))
+    if isinstance(parent, dict) and key in parent:
+        return document, parent.pop(key)
+    raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+
+
+def apply_patch(document, operations):
+    """
+    Apply a list of patch operations to a JSON document.
+
+    The document isn't modified; a patched copy is returned. Either every
+    operation applies or JsonPatchError (JsonPatchConflict for a failed
+    `test`) is raised.
+    """
+    if not isinstance(operations, list):
+        raise JsonPatchError("A patch must be a list of operations")
+
+    document = copy.deepcopy(document)
+    for operation in operations:
+        if not isinstance(operation, dict) or operation.get("op") not in PATCH_OPERATIONS:
+            raise JsonPatchError(f"Invalid patch operation: {operation!r}")
+        op = operation["op"]
+        tokens = _parse_pointer(operation.get("path"))
+
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise JsonPatchError(f"'{op}' operation requires a value")
+
+        if op == "add":
+            document = _add(document, tokens, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            document, _ = _remove(document, tokens)
+        elif op == "replace":
+            if tokens:
+                _resolve(document, tokens)
+                document, _ = _remove(document, tokens)
+            document = _add(document, tokens, copy.deepcopy(operation["value"]))
+        elif op == "test":
+            if _resolve(document, tokens) != operation["value"]:
+                raise JsonPatchConflict(f"Test failed at {operation['path'] or '/'}")
+        else:
+            source = _parse_pointer(operation.get("from"))
+            if op == "move":
+                if tokens[:len(source)] == source and tokens != source:
+                    raise JsonPatchError("Can't move a value into itself")
+                document, value = _remove(document, source)
+            else:
+                value = copy.deepcopy(_resolve(document, source))
+            document = _add(document, tokens, value)
+    return document
@@ -0,0 +1,304 @@
+"""Load generator simulating concurrent editors and readers.
+
+Drives a mix of simulated users against a throwaway copy of the database
+through Django's request handlers, in process:
+
+- editors autosave a template every `editor_interval` seconds, as the
+  editor does after each pause in typing, sending JSON Patch operations
+  and the version they last saw;
+- readers open rubric pages;
+- previewers fire bursts of grade band previews, as typing a max marks
+  value does;
+- generator editors edit rows of the feedback generator's phrase bank.
+
+Each user waits a randomised think time (half to one and a half times its
+interval) between actions. With the "wsgi" handler every user is a thread
+with its own database connection, as in a threaded WSGI worker; with
+"asgi" users are tasks on one event loop, as in one ASGI worker process.
+
+The report gives requests per second, p50/p95/p99 latency, version
+conflicts, SQLite "database is locked" errors and other errors for each
+action. Run it with `python manage.py load_test`; add
+`--settings=core.settings.prod` to load the production SQLite profile.
+"""
+import asyncio
+import itertools
+import json
+import random
+import threading
+import time
+from contextlib import nullcontext
+
+from django.db import OperationalError, connections
+from django.test import AsyncClient, Client
+
+from feedback.db_benchmarks import percentile
+from feedback.server_benchmarks import quiet_loggers, scratch_database
+
+LOAD_ACTIONS = ("autosave", "preview", "rubric", "generator_edit")
+
+LOAD_HANDLERS = ("wsgi", "asgi")
+
+
+def _think(rng, interval):
+    return rng.uniform(0.5, 1.5) * interval
+
+
+# Simulated users are generators: they yield (action, method, path, body)
+# to make a request, and are sent the response; or yield a number of
+# seconds to wait.
+
+def _editor(rng, fixtures, index, interval):
+    pk = fixtures["templates"][index % len(fixtures["templates"])]
+    url = f"/feedback/template/{pk}/update/"
+    version = fixtures["versions"][pk]
+    yield rng.uniform(0, interval)
+    for edit in itertools.count(1):
+        response = yield ("autosave", "patch", url, {
+            "version": version,
+            "patch": {"categories": [
+                {"op": "replace", "path": "/0/grade_band_descriptions/1st", "value": f"Edit {index}.{edit}"},
+            ]},
+        })
+        if response is not None and response.status_code in (200, 409):
+            # Carry on from the stored version, as the editor does
+            version = json.loads(response.content).get("version", version)
+        yield _think(rng, interval)
+
+
+def _reader(rng, fixtures, index, interval):
+    yield rng.uniform(0, interval)
+    while True:
+        pk = rng.choice(fixtures["templates"])
+        yield ("rubric", "get", f"/feedback/template/{pk}/rubric/", None)
+        yield _think(rng, interval)
+
+
+def _previewer(rng, fixtures, index, interval, burst):
+    yield rng.uniform(0, interval)
+    while True:
+        subdivision = rng.choice(("none", "high_low", "high_mid_low"))
+        for _ in range(burst):
+            yield ("preview", "get", "/feedback/grade-bands-preview/", {
+                "max_marks": rng.randint(1, 100), "subdivision": subdivision,
+            })
+        yield _think(rng, interval)
+
+
+def _generator_editor(rng, fixtures, index, interval):
+    yield rng.uniform(0, interval)
+    for edit in itertools.count(1):
+        row = rng.choice(fixtures["rows"])
+        yield ("generator_edit", "post", "/feedback-generator/edit_row/", {
+            "id": row, "text_positive": f"Edit {index}.{edit}",
+        })
+        yield _think(rng, interval)
+
+
+def _is_lock_error(message):
+    return "locked" in message.lower()
+
+
+class _Recorder:
+    """Collects the outcome and latency of every request."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.outcomes = {action: [] for action in LOAD_ACTIONS}
+
+    def response(self, action, response, latency):
+        if response.status_code < 400:
+            outcome = "ok"
+        elif response.status_code == 409:
+            outcome = "conflict"
+        else:
+            # Autosave and phrase bank edits report database errors in JSON
+            outcome = "locked" if _is_lock_error(response.content.decode(errors="replace")) else "error"
+        self._add(action, outcome, latency)
+
+    def exception(self, action, error, latency):
+        locked = isinstance(error, OperationalError) and _is_lock_error(str(error))
+        self._add(action, "locked" if locked else "error", latency)
+
+    def _add(self, action, outcome, latency):
+        with self._lock:
+            self.outcomes[action].append((outcome, latency))
+
+
+def _send(client, method, path, body):
+    if method == "get":
+        return client.get(path, body)
+    return getattr(client, method)(path, data=json.dumps(body), content_type="application/json")
+
+
+def _run_user_sync(user, deadline, recorder):
+    client = Client()
+    try:
+        step = next(user)
+        while time.perf_counter() < deadline:
+            if not isinstance(step, tuple):
+                time.sleep(min(step, max(deadline - time.perf_counter(), 0)))
+                step = next(user)
+                continue
+            action, method, path, body = step
+            start = time.perf_counter()
+            try:
+                response = _send(client, method, path, body)
+            except Exception as e:
+                recorder.exception(action, e, time.perf_counter() - start)
+                response = None
+            else:
+                recorder.response(action, response, time.perf_counter() - start)
+            step = user.send(response)
+    finally:
+        connections.close_all()
+
+
+async def _run_user_async(user, deadline, recorder):
+    client = AsyncClient()
+    step = next(user)
+    while time.perf_counter() < deadline:
+        if not isinstance(step, tuple):
+            await asyncio.sleep(min(step, max(deadline - time.perf_counter(), 0)))
+            step = next(user)
+            continue
+        action, method, path, body = step
+        start = time.perf_counter()
+        try:
+            response = await _send(client, method, path, body)
+        except Exception as e:
+            recorder.exception(action, e, time.perf_counter() - start)
+            response = None
+        else:
+            recorder.response(action, response, time.perf_counter() - start)
+        step = user.send(response)
+
+
+def _run_wsgi(users, deadline, recorder):
+    threads = [threading.Thread(target=_run_user_sync, args=(user, deadline, recorder)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def _run_asgi(users, deadline, recorder):
+    async def run():
+        await asyncio.gather(*(_run_user_async(user, deadline, recorder) for user in users))
+
+    asyncio.run(run())
+
+
+def _create_fixtures(templates, questions, rows_per_question):
+    from feedback.models import AssessmentTemplate
+    from feedback_generator.models import FeedbackRow, Question
+
+    created = [
+        AssessmentTemplate.objects.create(
+            component=1, title=f"Load test {i}", module_code=f"LT{100 + i}", module_title="Load test",
+            assessment_title="Coursework", weighting=50, max_marks=50,
+            categories=[
+                {
+                    "label": f"Category {c}", "max": 10, "type": "grade", "subdivision": "high_low",
+                    "grade_band_descriptions": {"1st": "Excellent", "2:1": "Good", "Fail": "Missing"},
+                }
+                for c in range(5)
+            ],
+        )
+        for i in range(templates)
+    ]
+    bank = Question.objects.bulk_create(Question(text=f"Question {q}", order=q) for q in range(questions))
+    rows = FeedbackRow.objects.bulk_create(
+        FeedbackRow(question=question, label=f"Row {r}", text_positive="+", text_negative="-", order=r)
+        for question in bank
+        for r in range(rows_per_question)
+    )
+    return {
+        "templates": [tpl.pk for tpl in created],
+        "versions": {tpl.pk: tpl.version for tpl in created},
+        "rows": [row.pk for row in rows],
+    }
+
+
+def _summarise(outcomes, elapsed):
+    counts = {"ok": 0, "conflict": 0, "locked": 0, "error": 0}
+    for outcome, _ in outcomes:
+        counts[outcome] += 1
+    latencies = [latency for outcome, latency in outcomes if outcome in ("ok", "conflict")]
+
+    def ms(pct):
+        value = percentile(latencies, pct)
+        return None if value is None else round(value * 1000, 2)
+
+    return {
+        "requests": len(outcomes),
+        "requests_per_sec": round(len(outcomes) / elapsed, 1) if elapsed > 0 else None,
+        "p50_ms": ms(50),
+        "p95_ms": ms(95),
+        "p99_ms": ms(99),
+        "conflicts": counts["conflict"],
+        "lock_errors": counts["locked"],
+        "errors": counts["error"],
+    }
+
+
+def run_load_test(
+    editors=20, readers=40, previewers=10, generator_editors=5, duration=30.0, handler="wsgi",
+    editor_interval=2.0, reader_interval=1.0, preview_interval=3.0, preview_burst=8, generator_interval=5.0,
+    templates=50, seed=0, use_scratch_db=True,
+):
+    """
+    Run the simulated users for `duration` seconds and summarise the traffic.
+
+    Args:
+        editors, readers, previewers, generator_editors: Number of each kind
+            of simulated user
+        duration: Seconds to run for
+        handler: "wsgi" (a thread per user) or "asgi" (one event loop)
+        editor_interval: Seconds between an editor's autosaves
+        reader_interval: Seconds between a reader's rubric page views
+        preview_interval: Seconds between a previewer's bursts
+        preview_burst: Grade band previews per burst
+        generator_interval: Seconds between a generator editor's row edits
+        templates: Templates to create; editors share them when there are
+            more editors than templates
+        seed: Seed for the users' random choices
+        use_scratch_db: Run against a temporary database file (pass False
+            when a test database is already set up)
+
+    Returns:
+        Dict of {action: summary} for each of LOAD_ACTIONS, plus "all", each
+        summary holding requests, requests_per_sec, p50_ms, p95_ms, p99_ms,
+        conflicts, lock_errors and errors
+    """
+    from feedback.autosave import autosave_buffer
+
+    run = {"wsgi": _run_wsgi, "asgi": _run_asgi}[handler]
+    with scratch_database() if use_scratch_db else nullcontext(), quiet_loggers(
+        "django.request", "feedback.slow_requests",
+    ):
+        fixtures = _create_fixtures(templates, questions=10, rows_per_question=10)
+        rng = random.Random(seed)
+        users = (
+            [_editor(random.Random(rng.random()), fixtures, i, editor_interval) for i in range(editors)]
+            + [_reader(random.Random(rng.random()), fixtures, i, reader_interval) for i in range(readers)]
+            + [
+                _previewer(random.Random(rng.random()), fixtures, i, preview_interval, preview_burst)
+                for i in range(previewers)
+            ]
+            + [
+                _generator_editor(random.Random(rng.random()), fixtures, i, generator_interval)
+                for i in range(generator_editors)
+            ]
+        )
+
+        recorder = _Recorder()
+        start = time.perf_counter()
+        run(users, start + duration, recorder)
+        elapsed = time.perf_counter() - start
+        # Write any buffered autosaves before the database goes away
+        autosave_buffer.flush()
+
+    results = {action: _summarise(recorder.outcomes[action], elapsed) for action in LOAD_ACTIONS}
+    results["all"] = _summarise([o for action in LOAD_ACTIONS for o in recorder.outcomes[action]], elapsed)
+    return results
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from feedback.server_benchmarks import SERVER_BENCHMARK_ENDPOINTS, run_server_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the editor's JSON endpoints served through the WSGI path "
+        "(thread per request) and the ASGI path (one event loop)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500, help="Requests per burst (default: %(default)s)")
+        parser.add_argument(
+            "--concurrency", type=int, default=50, help="Requests in flight at once (default: %(default)s)"
+        )
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            choices=SERVER_BENCHMARK_ENDPOINTS,
+            help="Endpoint to benchmark; repeat for several (default: all)",
+        )
+
+    def handle(self, *args, **options):
+        results = run_server_benchmark(
+            endpoints=options["endpoint"] or SERVER_BENCHMARK_ENDPOINTS,
+            requests=options["requests"],
+            concurrency=options["concurrency"],
+        )
+
+        def ms(value):
+            return "-" if value is None else f"{value:,.2f}"
+
+        self.stdout.write(f"{'endpoint':<22} {'path':<5} {'req/sec':>9} {'p50 ms':>9} {'p95 ms':>9} {'failed':>7}")
+        for endpoint, paths in results.items():
+            for path, result in paths.items():
+                self.stdout.write(
+                    f"{endpoint:<22} {path:<5} {result['requests_per_sec']:>9,.0f} "
+                    f"{ms(result['p50_ms']):>9} {ms(result['p95_ms']):>9} {result['failed']:>7}"
+                )
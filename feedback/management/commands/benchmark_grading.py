@@ -0,0 +1,96 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from feedback.benchmarks import (
+    BENCHMARK_BASELINE_PATH,
+    DEFAULT_ALLOCATION_TOLERANCE,
+    DEFAULT_SPEED_TOLERANCE,
+    compare_to_baseline,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+from feedback.utils import GRADE_BAND_TABLE_MAX_MARKS
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the grade band engine (ops/sec and allocations) and fail "
+        "if it regresses past the stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-marks",
+            type=int,
+            default=GRADE_BAND_TABLE_MAX_MARKS,
+            help="Sweep max_marks from 1 up to this value (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timed runs per benchmark; the fastest is reported (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--baseline",
+            default=str(BENCHMARK_BASELINE_PATH),
+            help="Baseline results file (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Store these results as the new baseline instead of comparing",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=DEFAULT_SPEED_TOLERANCE,
+            help="Allowed drop in ops/sec as a fraction of the baseline (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--allocation-tolerance",
+            type=float,
+            default=DEFAULT_ALLOCATION_TOLERANCE,
+            help="Allowed growth in bytes allocated per call as a fraction of the baseline (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        results = run_benchmarks(max_marks=options["max_marks"], repeat=options["repeat"])
+
+        self.stdout.write(f"{'benchmark':<28} {'ops':>8} {'ops/sec':>14} {'bytes/op':>10} {'blocks/op':>10}")
+        for name, result in results["results"].items():
+            self.stdout.write(
+                f"{name:<28} {result['ops']:>8} {result['ops_per_sec']:>14,.0f} "
+                f"{result['bytes_per_op']:>10,.1f} {result['blocks_per_op']:>10,.2f}"
+            )
+
+        path = options["baseline"]
+        if options["save_baseline"]:
+            save_baseline(path, results)
+            self.stdout.write(self.style.SUCCESS(f"Saved baseline to {path}"))
+            return
+
+        baseline = load_baseline(path)
+        if baseline is None:
+            self.stdout.write(self.style.WARNING(f"No baseline at {path}; run with --save-baseline to record one"))
+            return
+        if baseline["python"].rsplit(".", 1)[0] != results["python"].rsplit(".", 1)[0]:
+            self.stdout.write(self.style.WARNING(
+                f"Baseline was recorded on Python {baseline['python']}; not comparing with Python {results['python']}"
+            ))
+            return
+        if baseline["max_marks"] != results["max_marks"]:
+            raise CommandError(
+                f"Baseline was recorded with --max-marks {baseline['max_marks']}, "
+                f"not {results['max_marks']}"
+            )
+
+        regressions = compare_to_baseline(
+            results,
+            baseline,
+            speed_tolerance=options["tolerance"],
+            allocation_tolerance=options["allocation_tolerance"],
+        )
+        if regressions:
+            raise CommandError("Benchmark regressions:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {path}"))
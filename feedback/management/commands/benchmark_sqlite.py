@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+
+from feedback.db_benchmarks import run_sqlite_benchmark, sqlite_profiles
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark concurrent readers and autosave writers on SQLite with the "
+        "default and production connection profiles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=4, help="Reader processes (default: %(default)s)")
+        parser.add_argument("--writers", type=int, default=4, help="Autosave writer processes (default: %(default)s)")
+        parser.add_argument("--duration", type=float, default=5.0, help="Seconds per profile (default: %(default)s)")
+        parser.add_argument("--rows", type=int, default=200, help="Templates in the scratch table (default: %(default)s)")
+        parser.add_argument(
+            "--profile",
+            action="append",
+            choices=sorted(sqlite_profiles()),
+            help="Profile to run; repeat for several (default: all)",
+        )
+
+    def handle(self, *args, **options):
+        results = run_sqlite_benchmark(
+            profiles=options["profile"],
+            readers=options["readers"],
+            writers=options["writers"],
+            duration=options["duration"],
+            rows=options["rows"],
+        )
+
+        def ms(value):
+            return "-" if value is None else f"{value:,.2f}"
+
+        self.stdout.write(
+            f"{'profile':<12} {'reads/sec':>10} {'writes/sec':>11} {'read p95 ms':>12} {'write p95 ms':>13} {'lock errors':>12}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<12} {result['reads_per_sec']:>10,.0f} {result['writes_per_sec']:>11,.0f} "
+                f"{ms(result['read_p95_ms']):>12} {ms(result['write_p95_ms']):>13} {result['lock_errors']:>12}"
+            )
+
+        if "default" in results and "production" in results:
+            base, tuned = results["default"], results["production"]
+            for label, key in (("reads", "reads_per_sec"), ("writes", "writes_per_sec")):
+                if base[key]:
+                    self.stdout.write(f"production {label}: {tuned[key] / base[key]:.1f}x default")
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from feedback.utils import GRADE_BAND_TABLE_PATH, build_grade_band_table, load_grade_band_table
+
+
+class Command(BaseCommand):
+    help = "Precompute every grade band into the memory-mapped lookup table used by calculate_grade_bands."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=str(GRADE_BAND_TABLE_PATH),
+            help="Path of the table file to write (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        path = options["output"]
+        size = build_grade_band_table(path)
+        if not load_grade_band_table(path):
+            self.stderr.write(self.style.ERROR(f"Wrote {path} but it could not be loaded back"))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Wrote grade band table to {path} ({size} bytes)"))
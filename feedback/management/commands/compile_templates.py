@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from feedback.compiled import is_compiled
+from feedback.models import AssessmentTemplate
+
+
+class Command(BaseCommand):
+    help = "Backfill the precomputed display data (and content hash) of assessment templates."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompile every template, not just those that are missing or outdated",
+        )
+
+    def handle(self, *args, **options):
+        compiled = 0
+        total = 0
+        for tpl in AssessmentTemplate.objects.order_by("pk").iterator():
+            total += 1
+            if not options["all"] and is_compiled(tpl) and tpl.content_hash:
+                continue
+            # Write only the derived fields: the template's content hasn't
+            # changed, so its version, save time and search entry stay put
+            tpl.compile()
+            AssessmentTemplate.objects.filter(pk=tpl.pk).update(
+                compiled=tpl.compiled,
+                category_count=tpl.category_count,
+                content_hash=tpl.compute_content_hash(),
+            )
+            compiled += 1
+        self.stdout.write(self.style.SUCCESS(f"Compiled {compiled} of {total} templates"))
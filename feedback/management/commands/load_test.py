@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand
+
+from feedback.load_generator import LOAD_HANDLERS, run_load_test
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate concurrent editors, rubric readers, grade band previews and "
+        "phrase bank edits against a scratch database, and report throughput, "
+        "latency percentiles and SQLite lock errors."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run for (default: %(default)s)")
+        parser.add_argument(
+            "--handler", choices=LOAD_HANDLERS, default="wsgi",
+            help="Serve through the WSGI path (thread per user) or the ASGI path (default: %(default)s)",
+        )
+        parser.add_argument("--editors", type=int, default=20, help="Editors autosaving (default: %(default)s)")
+        parser.add_argument("--readers", type=int, default=40, help="Rubric readers (default: %(default)s)")
+        parser.add_argument(
+            "--previewers", type=int, default=10, help="Users firing grade band previews (default: %(default)s)"
+        )
+        parser.add_argument(
+            "--generator-editors", type=int, default=5, help="Phrase bank row editors (default: %(default)s)"
+        )
+        parser.add_argument(
+            "--editor-interval", type=float, default=2.0, help="Seconds between autosaves (default: %(default)s)"
+        )
+        parser.add_argument(
+            "--reader-interval", type=float, default=1.0, help="Seconds between rubric views (default: %(default)s)"
+        )
+        parser.add_argument(
+            "--preview-interval", type=float, default=3.0, help="Seconds between preview bursts (default: %(default)s)"
+        )
+        parser.add_argument("--preview-burst", type=int, default=8, help="Previews per burst (default: %(default)s)")
+        parser.add_argument(
+            "--generator-interval", type=float, default=5.0, help="Seconds between row edits (default: %(default)s)"
+        )
+        parser.add_argument("--templates", type=int, default=50, help="Templates to create (default: %(default)s)")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed (default: %(default)s)")
+
+    def handle(self, *args, **options):
+        results = run_load_test(
+            editors=options["editors"],
+            readers=options["readers"],
+            previewers=options["previewers"],
+            generator_editors=options["generator_editors"],
+            duration=options["duration"],
+            handler=options["handler"],
+            editor_interval=options["editor_interval"],
+            reader_interval=options["reader_interval"],
+            preview_interval=options["preview_interval"],
+            preview_burst=options["preview_burst"],
+            generator_interval=options["generator_interval"],
+            templates=options["templates"],
+            seed=options["seed"],
+        )
+
+        def ms(value):
+            return "-" if value is None else f"{value:,.2f}"
+
+        self.stdout.write(
+            f"{'action':<15} {'requests':>9} {'req/sec':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+            f"{'conflicts':>10} {'locked':>7} {'errors':>7}"
+        )
+        for action, result in results.items():
+            self.stdout.write(
+                f"{action:<15} {result['requests']:>9,} {result['requests_per_sec']:>9,.1f} "
+                f"{ms(result['p50_ms']):>9} {ms(result['p95_ms']):>9} {ms(result['p99_ms']):>9} "
+                f"{result['conflicts']:>10} {result['lock_errors']:>7} {result['errors']:>7}"
+            )
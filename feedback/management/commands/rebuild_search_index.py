@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from feedback.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of assessment templates."
+
+    def handle(self, *args, **options):
+        count = rebuild_search_index()
+        if count is None:
+            raise CommandError("Full-text search needs SQLite with FTS5; searches fall back to substring matching")
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} templates"))
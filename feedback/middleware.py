@@ -0,0 +1,94 @@
+"""Request timing and ASGI routing middleware.
+
+`RequestTimingMiddleware` adds a `Server-Timing` header (total, db, template and cache time, with the
+query count and cache hits/misses) to every response when
+`FEEDBACK_SERVER_TIMING` is on, and logs requests slower than
+`FEEDBACK_SLOW_REQUEST_MS` to the "feedback.slow_requests" logger as one
+JSON object per line. The header exposes query counts and timings, so
+production leaves it off and keeps the log. See `feedback.timing` for how
+the numbers are gathered.
+
+`AsgiUrlconfMiddleware` resolves requests served over ASGI with
+`ASGI_ROOT_URLCONF`, which routes the JSON endpoints to their async
+variants. WSGI requests keep `ROOT_URLCONF` and the sync views.
+"""
+import json
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.asgi import ASGIRequest
+
+from feedback.timing import server_timing_enabled, slow_request_threshold, start_timing, stop_timing
+
+slow_request_logger = logging.getLogger("feedback.slow_requests")
+
+
+class RequestTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not server_timing_enabled() and slow_request_threshold() is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timing, token = start_timing()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_timing(token)
+        return self.finish(request, response, timing)
+
+    async def __acall__(self, request):
+        timing, token = start_timing()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_timing(token)
+        return self.finish(request, response, timing)
+
+    def finish(self, request, response, timing):
+        total = timing.elapsed()
+        if server_timing_enabled():
+            response["Server-Timing"] = timing.server_timing(total)
+
+        threshold = slow_request_threshold()
+        if threshold is not None and total * 1000 >= threshold:
+            match = request.resolver_match
+            entry = {
+                "method": request.method,
+                "path": request.path,
+                "view": f"{match.func.__module__}.{match.func.__name__}" if match else None,
+                "status": response.status_code,
+                **timing.as_dict(total),
+            }
+            slow_request_logger.warning(json.dumps(entry), extra={"timing": entry})
+        return response
+
+
+class AsgiUrlconfMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.urlconf = getattr(settings, "ASGI_ROOT_URLCONF", None)
+        if not self.urlconf:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        # The request type, not the chain's mode, says which server it came from
+        if isinstance(request, ASGIRequest):
+            request.urlconf = self.urlconf
+        return self.get_response(request)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0010_alter_assessmenttemplate_degree_level'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessmenttemplate',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, help_text='SHA-256 of the displayed fields, set on save; keys cached rendered pages', max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0011_assessmenttemplate_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessmenttemplate',
+            name='compiled',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Bands, totals and mark mismatch status for display, rebuilt on save'),
+        ),
+    ]
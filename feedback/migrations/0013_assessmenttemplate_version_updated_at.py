@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-17 09:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0012_assessmenttemplate_compiled'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessmenttemplate',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incremented on every save'),
+        ),
+        migrations.AddField(
+            model_name='assessmenttemplate',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, help_text='When the template was last saved'),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:14
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+def count_categories(apps, schema_editor):
+    AssessmentTemplate = apps.get_model('feedback', 'AssessmentTemplate')
+    for tpl in AssessmentTemplate.objects.only('id', 'categories').iterator():
+        count = len(tpl.categories) if isinstance(tpl.categories, list) else 0
+        AssessmentTemplate.objects.filter(pk=tpl.pk).update(category_count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0013_assessmenttemplate_version_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessmenttemplate',
+            name='category_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text="Number of categories, stored so listings needn't load the categories JSON"),
+        ),
+        migrations.RunPython(count_categories, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='assessmenttemplate',
+            index=models.Index(django.db.models.functions.text.Upper('module_code'), models.OrderBy(models.F('id'), descending=True), name='feedback_tpl_module_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assessmenttemplate',
+            index=models.Index(fields=['component', '-id'], name='feedback_tpl_component_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assessmenttemplate',
+            index=models.Index(fields=['degree_level', '-id'], name='feedback_tpl_degree_idx'),
+        ),
+    ]
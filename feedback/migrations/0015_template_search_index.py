@@ -0,0 +1,76 @@
+import sqlite3
+
+from django.db import migrations
+
+# Frozen copy of the table definition and row extraction at the time of
+# this migration; feedback.search may change independently
+
+SEARCH_TABLE = 'feedback_template_fts'
+
+SEARCH_COLUMNS = ('title', 'module_code', 'module_title', 'assessment_title', 'descriptions')
+
+
+def fts5_available(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    try:
+        sqlite3.connect(':memory:').execute('CREATE VIRTUAL TABLE fts5_probe USING fts5(text)')
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def description_text(categories):
+    lines = []
+    for cat in categories or []:
+        if not isinstance(cat, dict):
+            continue
+        descriptions = cat.get('grade_band_descriptions') or {}
+        if not isinstance(descriptions, dict):
+            continue
+        for text in descriptions.values():
+            if isinstance(text, str) and text.strip():
+                lines.append(text.strip())
+    return '\n'.join(lines)
+
+
+def create_index(apps, schema_editor):
+    if not fts5_available(schema_editor.connection):
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+        f"USING fts5({', '.join(SEARCH_COLUMNS)}, tokenize='unicode61 remove_diacritics 2')"
+    )
+    # Index rows that already exist; later saves are indexed by signals
+    AssessmentTemplate = apps.get_model('feedback', 'AssessmentTemplate')
+    templates = AssessmentTemplate.objects.only(
+        'id', 'title', 'module_code', 'module_title', 'assessment_title', 'categories',
+    )
+    insert = (
+        f"INSERT INTO {SEARCH_TABLE} (rowid, {', '.join(SEARCH_COLUMNS)}) "
+        f"VALUES ({', '.join(['%s'] * (len(SEARCH_COLUMNS) + 1))})"
+    )
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(insert, [
+            [
+                tpl.pk, tpl.title, tpl.module_code, tpl.module_title, tpl.assessment_title,
+                description_text(tpl.categories),
+            ]
+            for tpl in templates.iterator()
+        ])
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0014_assessmenttemplate_category_count_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
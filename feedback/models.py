@@ -1,6 +1,13 @@
+import hashlib
+import json
+
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Upper
 from django.core.exceptions import ValidationError
 
+from feedback.compiled import compile_template
+
 
 class AssessmentTemplate(models.Model):
     component = models.IntegerField()
@@ -22,6 +29,90 @@ class AssessmentTemplate(models.Model):
         default='BEng',
         help_text='Degree level (BEng or MEng/MSc)'
     )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text="SHA-256 of the displayed fields, set on save; keys cached rendered pages"
+    )
+
+    version = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        help_text="Incremented on every save"
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="When the template was last saved"
+    )
+    category_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of categories, stored so listings needn't load the categories JSON"
+    )
+    compiled = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Bands, totals and mark mismatch status for display, rebuilt on save"
+    )
+
+    class Meta:
+        # The home page lists newest first and filters on these columns
+        indexes = [
+            # Module codes are matched case-insensitively (see `home`)
+            models.Index(Upper("module_code"), F("id").desc(), name="feedback_tpl_module_idx"),
+            models.Index(fields=["component", "-id"], name="feedback_tpl_component_idx"),
+            models.Index(fields=["degree_level", "-id"], name="feedback_tpl_degree_idx"),
+        ]
+
+    # Fields that affect rendered pages, hashed into `content_hash`
+    CONTENT_FIELDS = (
+        "component", "title", "module_code", "module_title", "assessment_title",
+        "weighting", "max_marks", "categories", "charts", "degree_level",
+    )
+
+    # Fields the compiled display data and category count are derived from
+    # (plus the derived fields themselves, so naming them forces a rebuild)
+    COMPILED_FROM = frozenset({"categories", "max_marks", "degree_level", "compiled", "category_count"})
+
+    def compute_content_hash(self):
+        """Hash of the displayed fields, so identical content gives the same hash."""
+        content = {field: getattr(self, field) for field in self.CONTENT_FIELDS}
+        encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def compile(self):
+        """Rebuild the compiled display data and category count from the categories."""
+        self.category_count = len(self.categories) if isinstance(self.categories, list) else 0
+        try:
+            self.compiled = compile_template(self)
+        except (TypeError, ValueError, KeyError):
+            # Malformed categories still save; views compile (and fail) on read
+            self.compiled = {}
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None and not self._state.adding:
+            self.version += 1
+        
+        # Remember the hash being replaced so its cached pages can be dropped
+        self._previous_content_hash = self.content_hash
+        self.content_hash = self.compute_content_hash()
+        
+        # Partial saves that don't touch the categories, marks or degree
+        # level leave the (large) compiled data alone
+        update_fields = kwargs.get("update_fields")
+        recompile = update_fields is None or not self.COMPILED_FROM.isdisjoint(update_fields)
+        if recompile:
+            self.compile()
+        
+        # Derived fields are always written alongside the fields they come from
+        if update_fields is not None:
+            derived = {"content_hash", "version", "updated_at"}
+            if recompile:
+                derived |= {"compiled", "category_count"}
+            kwargs["update_fields"] = {*update_fields, *derived}
+        super().save(*args, **kwargs)
 
     def clean(self):
         """Validate categories structure and bounds."""
@@ -30,6 +121,14 @@ class AssessmentTemplate(models.Model):
         if not self.categories:
             raise ValidationError("At least one category is required")
         
+        # Patched documents can be any JSON; check the shape the checks below rely on
+        if not isinstance(self.categories, list) or not all(isinstance(cat, dict) for cat in self.categories):
+            raise ValidationError("Categories must be a list of objects")
+        if self.charts and (
+            not isinstance(self.charts, list) or not all(isinstance(chart, dict) for chart in self.charts)
+        ):
+            raise ValidationError("Charts must be a list of objects")
+        
         errors = []
         VALID_TYPES = ["numeric", "grade"]
         VALID_SUBDIVISIONS = ["none", "high_low", "high_mid_low"]
@@ -37,8 +136,11 @@ class AssessmentTemplate(models.Model):
         for idx, cat in enumerate(self.categories):
             cat_num = idx + 1
             
-            # Check label is not blank
-            if not cat.get("label", "").strip():
+            # Check label is text and not blank
+            label = cat.get("label", "")
+            if not isinstance(label, str):
+                errors.append(f"Category {cat_num}: label must be text")
+            elif not label.strip():
                 errors.append(f"Category {cat_num}: label cannot be blank")
             
             # Check max is numeric and in valid range
@@ -85,7 +187,10 @@ class AssessmentTemplate(models.Model):
                     errors.append(f"Chart {chart_num}: type must be one of {VALID_CHART_TYPES}")
                 
                 # Check title
-                if not chart.get("title", "").strip():
+                title = chart.get("title", "")
+                if not isinstance(title, str):
+                    errors.append(f"Chart {chart_num}: 'title' must be text")
+                elif not title.strip():
                     errors.append(f"Chart {chart_num}: 'title' cannot be blank")
                 
                 # Validate data source based on chart type
@@ -0,0 +1,83 @@
+"""Cache of rendered template pages.
+
+Entries are keyed by template id and `AssessmentTemplate.content_hash`, so a
+page is only served from the cache while the template content it was
+rendered from is unchanged, in every worker process. The signal handlers in
+`feedback.signals` drop a template's entries when it is saved or deleted so
+stale pages don't linger until they expire.
+
+Pages also depend on the code that renders them. `render_version` is a
+fingerprint of that code; it goes into the cache keys and the pages'
+ETags, so a deploy that changes rendering or grade band logic isn't hidden
+behind cached pages or 304s.
+"""
+import hashlib
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+
+_APP_DIR = Path(__file__).resolve().parent
+
+# What the rendered pages are built from: markup, static assets and the
+# modules that compute the page data
+RENDER_SOURCES = (
+    "templates", "static", "templatetags",
+    "views.py", "compiled.py", "utils.py", "grading_schemes.py",
+)
+
+# Seconds a rendered page is kept; content changes never serve stale pages
+PAGE_CACHE_TIMEOUT = getattr(settings, "FEEDBACK_PAGE_CACHE_TIMEOUT", 60 * 60 * 24)
+
+
+@lru_cache(maxsize=1)
+def _render_sources():
+    """Digest and newest modification time of the RENDER_SOURCES files."""
+    digest = hashlib.sha256()
+    newest = 0.0
+    for source in RENDER_SOURCES:
+        path = _APP_DIR / source
+        for file in sorted(path.rglob("*")) if path.is_dir() else [path]:
+            if not file.is_file() or file.suffix == ".pyc":
+                continue
+            digest.update(str(file.relative_to(_APP_DIR)).encode())
+            digest.update(file.read_bytes())
+            newest = max(newest, file.stat().st_mtime)
+    return digest.hexdigest(), datetime.fromtimestamp(newest, tz=timezone.utc)
+
+
+def render_version():
+    """
+    Short fingerprint of everything besides the template that shapes its pages.
+
+    Covers the compiled data format, the grading schemes' band definitions,
+    the RENDER_SOURCES files and the optional `FEEDBACK_DEPLOY_ID` setting
+    (e.g. a commit id, for changes elsewhere in the code).
+    """
+    from feedback.compiled import COMPILED_FORMAT_VERSION
+    from feedback.utils import grade_band_data_version
+    
+    spec = ":".join((
+        str(COMPILED_FORMAT_VERSION),
+        grade_band_data_version(),
+        _render_sources()[0],
+        str(getattr(settings, "FEEDBACK_DEPLOY_ID", "")),
+    ))
+    return hashlib.sha256(spec.encode()).hexdigest()[:12]
+
+
+def render_modified():
+    """When the RENDER_SOURCES files last changed (i.e. were deployed)."""
+    return _render_sources()[1]
+
+
+def rubric_cache_key(pk, content_hash):
+    return f"feedback:rubric:{pk}:{content_hash}:{render_version()}"
+
+
+def invalidate_template_pages(pk, content_hash):
+    """Drop every cached page rendered from this version of a template."""
+    if content_hash:
+        cache.delete(rubric_cache_key(pk, content_hash))
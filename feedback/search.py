@@ -0,0 +1,231 @@
+"""Full-text search over assessment templates.
+
+On SQLite the templates are indexed in an FTS5 virtual table
+(`feedback_template_fts`) whose rowid is the template id. The table is
+created by a migration and kept in sync by the post_save/post_delete signals
+in `feedback.signals`; bulk `QuerySet.update()` calls bypass those, so run
+`python manage.py rebuild_search_index` after one. Other database backends
+(or SQLite builds without FTS5) fall back to substring matching.
+
+Indexed columns are the title, module code and title, assessment title and
+the text of every grade band description, so descriptors written for past
+rubrics can be found by their wording.
+"""
+import html
+import re
+import sqlite3
+from functools import lru_cache
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+SEARCH_TABLE = "feedback_template_fts"
+
+SEARCH_COLUMNS = ("title", "module_code", "module_title", "assessment_title", "descriptions")
+
+# Model fields the index is built from
+INDEXED_FIELDS = ("id", "title", "module_code", "module_title", "assessment_title", "categories")
+
+# Relative column weights for ranking: a hit in a title counts for more
+# than one somewhere in the grade band descriptions
+SEARCH_WEIGHTS = (10.0, 8.0, 4.0, 6.0, 1.0)
+
+SEARCH_RESULT_LIMIT = 50
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+_INSERT_SQL = (
+    f"INSERT INTO {SEARCH_TABLE} (rowid, {', '.join(SEARCH_COLUMNS)}) "
+    f"VALUES ({', '.join(['%s'] * (len(SEARCH_COLUMNS) + 1))})"
+)
+
+# Snippet match markers; control characters can't clash with the indexed
+# text, so the snippet can be HTML-escaped before they become <mark> tags
+_MARK_START, _MARK_END = "\x02", "\x03"
+
+
+@lru_cache(maxsize=None)
+def _fts5_supported():
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE fts5_probe USING fts5(text)")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def search_available(conn=connection):
+    """True if the database supports the FTS5 index (migration 0015 creates it)."""
+    return conn.vendor == "sqlite" and _fts5_supported()
+
+
+def description_text(categories):
+    """All grade band description text of a template, one description per line."""
+    lines = []
+    for cat in categories or []:
+        if not isinstance(cat, dict):
+            continue
+        descriptions = cat.get("grade_band_descriptions") or {}
+        if not isinstance(descriptions, dict):
+            continue
+        for text in descriptions.values():
+            if isinstance(text, str) and text.strip():
+                lines.append(text.strip())
+    return "\n".join(lines)
+
+
+def _row(template):
+    return (
+        template.title,
+        template.module_code,
+        template.module_title,
+        template.assessment_title,
+        description_text(template.categories),
+    )
+
+
+def needs_reindex(update_fields):
+    """Whether a save of these fields (None for all) changes the indexed text."""
+    return update_fields is None or not set(update_fields).isdisjoint(INDEXED_FIELDS)
+
+
+def index_template(template):
+    """Add or replace a template in the search index."""
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [template.pk])
+        cursor.execute(_INSERT_SQL, [template.pk, *_row(template)])
+
+
+def unindex_template(pk):
+    """Remove a template from the search index."""
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [pk])
+
+
+def index_rows(cursor, templates, batch_size=500):
+    """
+    Insert templates into an empty index in batches.
+
+    `templates` need only have the indexed fields loaded.
+
+    Returns:
+        Number of templates inserted
+    """
+    count = 0
+    rows = []
+    for template in templates:
+        rows.append([template.pk, *_row(template)])
+        if len(rows) == batch_size:
+            cursor.executemany(_INSERT_SQL, rows)
+            count += len(rows)
+            rows = []
+    if rows:
+        cursor.executemany(_INSERT_SQL, rows)
+        count += len(rows)
+    return count
+
+
+def rebuild_search_index():
+    """
+    Re-index every template from scratch.
+
+    Returns:
+        Number of templates indexed, or None if full-text search isn't available
+    """
+    from feedback.models import AssessmentTemplate
+
+    if not search_available():
+        return None
+    templates = AssessmentTemplate.objects.only(*INDEXED_FIELDS).order_by("pk").iterator(chunk_size=500)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        count = index_rows(cursor, templates)
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+    return count
+
+
+def match_expression(query):
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Every word must appear (as a prefix, so "robot" finds "robotics");
+    quoting each term keeps FTS5 operators in user input from being parsed.
+    Returns "" if the query has no searchable words.
+    """
+    return " ".join(f'"{term}"*' for term in _TERM_RE.findall(query.lower()))
+
+
+def filter_templates(queryset, query):
+    """Restrict a template queryset to those matching a free-text query."""
+    expression = match_expression(query)
+    if not expression:
+        return queryset
+    if not search_available():
+        return queryset.filter(
+            Q(title__icontains=query)
+            | Q(module_code__icontains=query)
+            | Q(module_title__icontains=query)
+            | Q(assessment_title__icontains=query)
+        )
+    return queryset.filter(
+        id__in=RawSQL(f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s", [expression])
+    )
+
+
+def _highlight(snippet):
+    if not snippet or _MARK_START not in snippet:
+        return ""
+    return html.escape(snippet).replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def search_templates(query, limit=SEARCH_RESULT_LIMIT):
+    """
+    Rank templates against a free-text query.
+
+    Returns:
+        List of dicts with `id`, `title`, `module_code`, `module_title`,
+        `assessment_title`, `rank` (lower is better) and `snippet` (the
+        matching part of the grade band descriptions as escaped HTML with
+        the terms wrapped in <mark>, or "" if the match was elsewhere),
+        best matches first
+    """
+    from feedback.models import AssessmentTemplate
+
+    expression = match_expression(query)
+    if not expression:
+        return []
+
+    if not search_available():
+        templates = filter_templates(AssessmentTemplate.objects.order_by("-id"), query)
+        return [
+            {**row, "rank": 0.0, "snippet": ""}
+            for row in templates.values("id", "title", "module_code", "module_title", "assessment_title")[:limit]
+        ]
+
+    weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS)
+    descriptions = SEARCH_COLUMNS.index("descriptions")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, title, module_code, module_title, assessment_title, "
+            f"bm25({SEARCH_TABLE}, {weights}) AS score, "
+            f"snippet({SEARCH_TABLE}, {descriptions}, %s, %s, '…', 24) "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s ORDER BY score LIMIT %s",
+            [_MARK_START, _MARK_END, expression, limit],
+        )
+        rows = cursor.fetchall()
+    return [
+        {
+            "id": pk,
+            "title": title,
+            "module_code": module_code,
+            "module_title": module_title,
+            "assessment_title": assessment_title,
+            "rank": rank,
+            "snippet": _highlight(snippet),
+        }
+        for pk, title, module_code, module_title, assessment_title, rank, snippet in rows
+    ]
@@ -0,0 +1,169 @@
+"""ASGI vs WSGI benchmark for the editor's JSON endpoints.
+
+Fires a burst of concurrent requests at the autosave, grade band preview
+and feedback generator endpoints through Django's request handlers, in
+process:
+
+- the WSGI path runs each request on a thread pool, one thread per
+  concurrent request, as a threaded WSGI worker does;
+- the ASGI path runs them as tasks on one event loop, as a single ASGI
+  worker process does, and is routed to the endpoints' async variants
+  (see `core.urls_asgi`).
+
+It reports requests per second, p50/p95 latency and failed requests for
+each. The requests go through Django's test client handlers (the full
+middleware stack, without CSRF checks or a network socket) against a
+throwaway copy of the database. Run it with
+`python manage.py benchmark_asgi`.
+"""
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from feedback.db_benchmarks import percentile
+
+SERVER_BENCHMARK_ENDPOINTS = ("template_update", "grade_bands_preview", "edit_row")
+
+
+def _requests(endpoint, fixtures, count):
+    """Return (method, path, body) for each request of a burst."""
+    if endpoint == "template_update":
+        pk = fixtures["template"]
+        # Alternate titles so every request writes
+        return [("patch", f"/feedback/template/{pk}/update/", {"title": f"Autosave {i % 2}"}) for i in range(count)]
+    if endpoint == "grade_bands_preview":
+        return [
+            ("get", "/feedback/grade-bands-preview/", {"max_marks": 10 + i % 90, "subdivision": "high_low"})
+            for i in range(count)
+        ]
+    row = fixtures["row"]
+    return [
+        ("post", "/feedback-generator/edit_row/", {"id": row, "label": f"Row {i % 2}"})
+        for i in range(count)
+    ]
+
+
+def _call(client, method, path, body):
+    if method == "get":
+        return client.get(path, body)
+    return getattr(client, method)(path, data=json.dumps(body), content_type="application/json")
+
+
+@contextmanager
+def scratch_database():
+    """Point the default database at a new, migrated file in a temporary directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        connection.settings_dict.setdefault("TEST", {})["NAME"] = os.path.join(tmpdir, "benchmark.sqlite3")
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+
+@contextmanager
+def quiet_loggers(*names):
+    """Silence these loggers for the duration (failures are counted instead)."""
+    loggers = [logging.getLogger(name) for name in names]
+    levels = [logger.level for logger in loggers]
+    for logger in loggers:
+        logger.setLevel(logging.CRITICAL)
+    try:
+        yield
+    finally:
+        for logger, level in zip(loggers, levels):
+            logger.setLevel(level)
+
+
+def _run_wsgi(calls, concurrency):
+    def send(call):
+        client = Client(raise_request_exception=False)
+        start = time.perf_counter()
+        response = _call(client, *call)
+        return response.status_code, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(send, calls))
+
+
+def _run_asgi(calls, concurrency):
+    async def burst():
+        limit = asyncio.Semaphore(concurrency)
+
+        async def send(call):
+            async with limit:
+                client = AsyncClient(raise_request_exception=False)
+                start = time.perf_counter()
+                response = await _call(client, *call)
+                return response.status_code, time.perf_counter() - start
+
+        return await asyncio.gather(*(send(call) for call in calls))
+
+    return asyncio.run(burst())
+
+
+def _summarise(outcomes, elapsed):
+    latencies = [latency for status, latency in outcomes if status < 400]
+    return {
+        "requests": len(outcomes),
+        "requests_per_sec": round(len(outcomes) / elapsed, 1) if elapsed > 0 else None,
+        "p50_ms": None if not latencies else round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": None if not latencies else round(percentile(latencies, 95) * 1000, 2),
+        "failed": len(outcomes) - len(latencies),
+    }
+
+
+def _create_fixtures():
+    from feedback.models import AssessmentTemplate
+    from feedback_generator.models import FeedbackRow, Question
+
+    template = AssessmentTemplate.objects.create(
+        component=1, title="Benchmark", module_code="BM100", module_title="Benchmark",
+        assessment_title="Coursework", weighting=50, max_marks=30,
+        categories=[{"label": "Design", "max": 30, "type": "grade", "subdivision": "high_low"}],
+    )
+    question = Question.objects.create(text="Benchmark", order=1)
+    row = FeedbackRow.objects.create(question=question, label="Row", text_positive="+", text_negative="-", order=1)
+    return {"template": template.pk, "row": row.pk}
+
+
+def run_server_benchmark(endpoints=SERVER_BENCHMARK_ENDPOINTS, requests=500, concurrency=50, use_scratch_db=True):
+    """
+    Benchmark each endpoint through the WSGI and ASGI request paths.
+
+    Args:
+        endpoints: Names from SERVER_BENCHMARK_ENDPOINTS
+        requests: Requests per burst
+        concurrency: Requests in flight at once
+        use_scratch_db: Run against a temporary database file (pass False
+            when a test database is already set up)
+
+    Returns:
+        Dict of {endpoint: {"wsgi": summary, "asgi": summary}}, each summary
+        holding requests, requests_per_sec, p50_ms, p95_ms and failed
+    """
+    # Failed requests are counted and most are slow; don't log each one
+    with scratch_database() if use_scratch_db else nullcontext(), quiet_loggers(
+        "django.request", "feedback.slow_requests",
+    ):
+        fixtures = _create_fixtures()
+        results = {}
+        for endpoint in endpoints:
+            calls = _requests(endpoint, fixtures, requests)
+            results[endpoint] = {}
+            for path, run in (("wsgi", _run_wsgi), ("asgi", _run_asgi)):
+                start = time.perf_counter()
+                outcomes = run(calls, concurrency)
+                results[endpoint][path] = _summarise(outcomes, time.perf_counter() - start)
+        return results
@@ -0,0 +1,31 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from feedback.models import AssessmentTemplate
+from feedback.page_cache import invalidate_template_pages
+from feedback.search import index_template, needs_reindex, unindex_template
+
+
+@receiver(post_save, sender=AssessmentTemplate)
+def drop_cached_pages_on_save(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_content_hash", None)
+    if previous != instance.content_hash:
+        invalidate_template_pages(instance.pk, previous)
+
+
+@receiver(post_delete, sender=AssessmentTemplate)
+def drop_cached_pages_on_delete(sender, instance, **kwargs):
+    invalidate_template_pages(instance.pk, instance.content_hash)
+
+
+@receiver(post_save, sender=AssessmentTemplate)
+def update_search_index_on_save(sender, instance, update_fields=None, **kwargs):
+    # Saves that don't touch the indexed text (e.g. a weighting autosave)
+    # leave the index alone
+    if needs_reindex(update_fields):
+        index_template(instance)
+
+
+@receiver(post_delete, sender=AssessmentTemplate)
+def update_search_index_on_delete(sender, instance, **kwargs):
+    unindex_template(instance.pk)
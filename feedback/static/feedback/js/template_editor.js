@@ -2,11 +2,30 @@
 
 let saveTimeout = null;
 let isSaving = false;
+let savePending = false; // A save was requested while another was in flight
+let saveConflict = false; // The template was saved elsewhere; stop autosaving
+let patchRejected = false; // The server couldn't apply a JSON Patch; send whole documents until a save succeeds
 let categoryIdCounter = 0;  // Counter to ensure unique IDs for radio buttons
 let refreshChartsTimeout = null; // Debounce timer for refreshing chart configs
+let subdivisionMatrix = null; // Valid max_marks ranges per grading scheme and subdivision
+let subdivisionMatrixReady = null; // Promise resolved once the matrix has loaded (or failed)
+const bandDataCache = {}; // Grade band groups keyed by "degree|max:subdivision"
+let lastSavedData = null; // Field values the server last confirmed, to send only what changed
+const PATCHABLE_FIELDS = ['categories', 'charts']; // Documents autosaved as JSON Patch operations
 
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', function() {
+    // Start loading the subdivision matrix first; previews wait for its band data version
+    loadSubdivisionMatrix();
+    
+    // Previews for the saved categories are embedded in the page
+    if (window.templateData && window.templateData.bandPreviews) {
+        const degreeLevel = window.templateData.degree_level || 'BEng';
+        Object.entries(window.templateData.bandPreviews).forEach(([item, groups]) => {
+            bandDataCache[`${degreeLevel}|${item}`] = groups;
+        });
+    }
+    
     // Load existing categories if any
     if (window.templateData && window.templateData.categories && window.templateData.categories.length > 0) {
         window.templateData.categories.forEach(cat => {
@@ -29,13 +48,18 @@ document.addEventListener('DOMContentLoaded', function() {
     if (degreeEl) {
         degreeEl.addEventListener('change', function() {
             // Update previews for every category row to reflect the new degree level
+            const gradeRows = [];
             document.querySelectorAll('.category-row').forEach(row => {
+                updateSubdivisionAvailability(row);
                 // Only update if this row uses grade bands
                 const typeRadio = row.querySelector('input[type="radio"]:checked');
                 if (typeRadio && typeRadio.value === 'grade') {
-                    updateGradeBandsPreview(row);
+                    gradeRows.push(row);
                 }
             });
+            // Fetch every row's new bands in one request, then render from the cache
+            prefetchBandGroups(gradeRows, degreeEl.value)
+                .finally(() => gradeRows.forEach(updateGradeBandsPreview));
             // Use debouncedSave to match behavior of other `.auto-save` fields
             // and also trigger a blur so the immediate `saveNow()` handler runs
             // (many inputs rely on blur to persist immediately).
@@ -52,6 +76,57 @@ document.addEventListener('DOMContentLoaded', function() {
     checkMaxMarksMatch();
 });
 
+// Once every row has been built, the form holds what the server has stored
+window.addEventListener('load', function() {
+    if (lastSavedData === null) {
+        lastSavedData = collectTemplateData();
+    }
+});
+
+function loadSubdivisionMatrix() {
+    // The matrix is static and cached by the browser, so this is usually free
+    subdivisionMatrixReady = fetch('/feedback/subdivision-matrix/')
+        .then(response => response.json())
+        .then(data => {
+            subdivisionMatrix = data;
+            document.querySelectorAll('.category-row').forEach(updateSubdivisionAvailability);
+        })
+        .catch(error => {
+            console.error('Error loading subdivision matrix:', error);
+        });
+    return subdivisionMatrixReady;
+}
+
+function getCurrentDegreeLevel() {
+    const degreeEl = document.getElementById('degree_level');
+    return degreeEl ? degreeEl.value : (window.templateData && window.templateData.degree_level ? window.templateData.degree_level : 'BEng');
+}
+
+function isSubdivisionValid(maxMarks, subdivision, degreeLevel) {
+    // Unknown until the matrix loads (or outside its range): let the server decide
+    if (!subdivisionMatrix || !maxMarks || maxMarks < 1 || maxMarks > subdivisionMatrix.max_marks) {
+        return true;
+    }
+    const scheme = subdivisionMatrix.degree_levels[degreeLevel];
+    const ranges = scheme && subdivisionMatrix.valid[scheme] ? subdivisionMatrix.valid[scheme][subdivision] : null;
+    if (!ranges) {
+        return true;
+    }
+    return ranges.some(([first, last]) => maxMarks >= first && maxMarks <= last);
+}
+
+function updateSubdivisionAvailability(row) {
+    const maxMarks = parseInt(row.querySelector('.cat-max').value);
+    const degreeLevel = getCurrentDegreeLevel();
+    
+    row.querySelectorAll('.subdivision-btn').forEach(btn => {
+        const valid = isSubdivisionValid(maxMarks, btn.dataset.subdivision, degreeLevel);
+        // Keep the current selection clickable so saved templates still display
+        btn.disabled = !valid && !btn.classList.contains('active');
+        btn.title = valid ? '' : `Not available for ${maxMarks} marks (grade bands would overlap)`;
+    });
+}
+
 // Add category button
 document.getElementById('add-category').addEventListener('click', function() {
     addCategoryRow();
@@ -142,6 +217,7 @@ function addCategoryRow(categoryData = null) {
     
     // Set up event handlers for this row
     setupRowEventHandlers(row);
+    updateSubdivisionAvailability(row);
     // After adding a category row, refresh chart configs so any radar chart category lists include this row
     debouncedRefreshCharts();
 }
@@ -188,6 +264,7 @@ function setupRowEventHandlers(row) {
     
     // Validate when max marks changes
     maxMarksInput.addEventListener('input', function() {
+        updateSubdivisionAvailability(row);
         const typeRadio = row.querySelector('input[type="radio"]:checked');
         if (typeRadio && typeRadio.value === 'grade') {
             validateRow(row);
@@ -201,6 +278,7 @@ function setupRowEventHandlers(row) {
             subdivisionButtons.forEach(b => b.classList.remove('active'));
             this.classList.add('active');
             subdivisionInput.value = this.dataset.subdivision;
+            updateSubdivisionAvailability(row);
             validateRow(row);
             updateGradeBandsPreview(row);
             debouncedSave();
@@ -333,7 +411,12 @@ function updateStoredCategoryData(row) {
 }
 
 function saveNow() {
-    if (isSaving) return;
+    if (saveConflict) return;
+    if (isSaving) {
+        // Run once the current save finishes; it will pick up every change since
+        savePending = true;
+        return;
+    }
     
     // Clear any pending timeout
     if (saveTimeout) {
@@ -346,10 +429,159 @@ function saveNow() {
         updateStoredCategoryData(row);
     });
     
+    const { current, data, changed } = buildSavePayload();
+    if (Object.keys(changed).length === 0) {
+        updateSaveStatus('saved');
+        return;
+    }
+    
+    data.version = window.templateData.version;
+    
     updateSaveStatus('saving');
     isSaving = true;
     
-    // Collect data
+    // Get CSRF token
+    const csrftoken = document.querySelector('[name=csrfmiddlewaretoken]')?.value || 
+                     getCookie('csrftoken');
+        
+    // Send to server
+    fetch(`/feedback/template/${window.templateData.id}/update/`, {
+        method: 'PATCH',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrftoken
+        },
+        body: JSON.stringify(data)
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.status === 'saved') {
+            lastSavedData = Object.assign({}, lastSavedData || current, changed);
+            window.templateData.version = result.version;
+            patchRejected = false;
+            updateSaveStatus('saved');
+        } else if (result.conflict === 'version') {
+            // Don't overwrite the newer copy; the user has to reload
+            saveConflict = true;
+            updateSaveStatus('conflict');
+        } else if (data.patch && !patchRejected) {
+            // The patch didn't apply to the stored documents (they aren't what
+            // lastSavedData says); resend them whole, once, rather than repeat it
+            patchRejected = true;
+            savePending = true;
+        } else {
+            updateSaveStatus('error');
+            console.error('Save error:', result.error);
+        }
+        finishSave();
+    })
+    .catch(error => {
+        updateSaveStatus('error');
+        console.error('Save failed:', error);
+        finishSave();
+    });
+}
+
+function buildSavePayload() {
+    // Only send the fields that differ from what the server last saved
+    const current = collectTemplateData();
+    const data = {};
+    const changed = {};
+    Object.keys(current).forEach(field => {
+        if (lastSavedData === null || JSON.stringify(current[field]) !== JSON.stringify(lastSavedData[field])) {
+            changed[field] = current[field];
+            // Send edits to the categories and charts documents as JSON Patch
+            // operations when they're smaller than the whole document
+            if (lastSavedData !== null && !patchRejected && PATCHABLE_FIELDS.includes(field)) {
+                const ops = jsonPatchOps(lastSavedData[field], current[field]);
+                if (JSON.stringify(ops).length < JSON.stringify(current[field]).length) {
+                    data.patch = data.patch || {};
+                    data.patch[field] = ops;
+                    return;
+                }
+            }
+            data[field] = current[field];
+        }
+    });
+    return { current, data, changed };
+}
+
+function flushOnClose() {
+    // Hand the last edits to the server as the page goes away; it writes them
+    // and anything it has buffered for this template straight through
+    if (saveConflict || !window.templateData || !navigator.sendBeacon) return;
+    
+    const form = new FormData();
+    form.append('csrfmiddlewaretoken', document.querySelector('[name=csrfmiddlewaretoken]')?.value || getCookie('csrftoken'));
+    const { data, changed } = buildSavePayload();
+    if (Object.keys(changed).length > 0) {
+        // Always send the last version this page saw, so the server rejects
+        // the edits (409) rather than overwrite a newer save from elsewhere
+        data.version = window.templateData.version;
+        form.append('payload', JSON.stringify(data));
+    }
+    navigator.sendBeacon(`/feedback/template/${window.templateData.id}/flush/`, form);
+}
+
+window.addEventListener('pagehide', flushOnClose);
+
+// A page restored from the back/forward cache has an outdated version; reload it
+window.addEventListener('pageshow', function(event) {
+    if (event.persisted) {
+        window.location.reload();
+    }
+});
+
+function finishSave() {
+    isSaving = false;
+    if (savePending) {
+        savePending = false;
+        saveNow();
+    }
+}
+
+function escapePointerToken(token) {
+    return String(token).replace(/~/g, '~0').replace(/\//g, '~1');
+}
+
+function jsonPatchOps(before, after, path = '', ops = []) {
+    // RFC 6902 operations turning `before` into `after`
+    const isObject = value => value !== null && typeof value === 'object' && !Array.isArray(value);
+    
+    if (Array.isArray(before) && Array.isArray(after)) {
+        const common = Math.min(before.length, after.length);
+        for (let i = 0; i < common; i++) {
+            jsonPatchOps(before[i], after[i], `${path}/${i}`, ops);
+        }
+        // Remove from the end so earlier indexes stay valid
+        for (let i = before.length - 1; i >= after.length; i--) {
+            ops.push({ op: 'remove', path: `${path}/${i}` });
+        }
+        for (let i = common; i < after.length; i++) {
+            ops.push({ op: 'add', path: `${path}/-`, value: after[i] });
+        }
+    } else if (isObject(before) && isObject(after)) {
+        Object.keys(before).forEach(key => {
+            if (!(key in after)) {
+                ops.push({ op: 'remove', path: `${path}/${escapePointerToken(key)}` });
+            }
+        });
+        Object.keys(after).forEach(key => {
+            const keyPath = `${path}/${escapePointerToken(key)}`;
+            if (key in before) {
+                jsonPatchOps(before[key], after[key], keyPath, ops);
+            } else {
+                ops.push({ op: 'add', path: keyPath, value: after[key] });
+            }
+        });
+    } else if (JSON.stringify(before) !== JSON.stringify(after)) {
+        ops.push({ op: 'replace', path: path, value: after });
+    }
+    return ops;
+}
+
+function collectTemplateData() {
+    // Read every saved field from the form
     const data = {
         title: document.getElementById('title').value,
         module_code: document.getElementById('module_code').value,
@@ -453,34 +685,7 @@ function saveNow() {
         data.charts.push(chart);
     });
     
-    // Get CSRF token
-    const csrftoken = document.querySelector('[name=csrfmiddlewaretoken]')?.value || 
-                     getCookie('csrftoken');
-        
-    // Send to server
-    fetch(`/feedback/template/${window.templateData.id}/update/`, {
-        method: 'POST',
-        headers: {
-            'Content-Type': 'application/json',
-            'X-CSRFToken': csrftoken
-        },
-        body: JSON.stringify(data)
-    })
-    .then(response => response.json())
-    .then(result => {
-        if (result.status === 'saved') {
-            updateSaveStatus('saved');
-        } else {
-            updateSaveStatus('error');
-            console.error('Save error:', result.error);
-        }
-        isSaving = false;
-    })
-    .catch(error => {
-        updateSaveStatus('error');
-        console.error('Save failed:', error);
-        isSaving = false;
-    });
+    return data;
 }
 
 function updateSaveStatus(status) {
@@ -502,6 +707,9 @@ function updateSaveStatus(status) {
         case 'error':
             statusEl.innerHTML = '<span class="text-danger"><i class="bi bi-exclamation-circle"></i> Save failed</span>';
             break;
+        case 'conflict':
+            statusEl.innerHTML = '<span class="text-danger"><i class="bi bi-exclamation-circle"></i> Changed in another window &ndash; reload to keep editing</span>';
+            break;
     }
 }
 
@@ -542,16 +750,10 @@ function updateGradeBandsPreview(row) {
         }
     });
     
-        // Read current degree level if present
-        const degreeEl = document.getElementById('degree_level');
-        const degreeLevel = degreeEl ? degreeEl.value : (window.templateData && window.templateData.degree_level ? window.templateData.degree_level : 'BEng');
-
-        // Fetch grade bands HTML from server (include degree_level)
-        fetch(`/feedback/grade-bands-preview/?max_marks=${maxMarks}&subdivision=${subdivision}&degree_level=${encodeURIComponent(degreeLevel)}`)
-        .then(response => response.json())
-        .then(data => {
-            if (data.html) {
-                previewEl.innerHTML = data.html;
+    getBandGroups(maxMarks, subdivision, getCurrentDegreeLevel())
+        .then(groups => {
+            if (groups && groups.length) {
+                previewEl.innerHTML = renderGradeBandsGrid(groups);
                 
                 // Get existing descriptions from saved category data
                 const categoryData = getCategoryDataForRow(row);
@@ -561,19 +763,16 @@ function updateGradeBandsPreview(row) {
                 const descriptions = { ...savedDescriptions, ...currentDescriptions };
                 
                 // Fill in existing descriptions and attach event listeners
-                // Use setTimeout to ensure DOM is ready
-                setTimeout(() => {
-                    previewEl.querySelectorAll('.grade-description').forEach(textarea => {
-                        const grade = textarea.getAttribute('data-grade');
-                        if (descriptions[grade]) {
-                            textarea.value = descriptions[grade];
-                        }
-                        
-                        // Attach event listeners
-                        textarea.addEventListener('input', debouncedSave);
-                        textarea.addEventListener('blur', saveNow);
-                    });
-                }, 0);
+                previewEl.querySelectorAll('.grade-description').forEach(textarea => {
+                    const grade = textarea.getAttribute('data-grade');
+                    if (descriptions[grade]) {
+                        textarea.value = descriptions[grade];
+                    }
+                    
+                    // Attach event listeners
+                    textarea.addEventListener('input', debouncedSave);
+                    textarea.addEventListener('blur', saveNow);
+                });
             } else {
                 previewEl.innerHTML = '';
             }
@@ -584,6 +783,112 @@ function updateGradeBandsPreview(row) {
         });
 }
 
+// Band data is a pure function of the query; with the band data version in
+// the URL the browser caches it as immutable and repeat previews are free
+function bandDataUrl(path, params) {
+    const query = new URLSearchParams(params);
+    if (subdivisionMatrix && subdivisionMatrix.bands_version) {
+        query.set('v', subdivisionMatrix.bands_version);
+    }
+    return `${path}?${query}`;
+}
+
+function getBandGroups(maxMarks, subdivision, degreeLevel) {
+    const key = `${degreeLevel}|${maxMarks}:${subdivision}`;
+    if (key in bandDataCache) {
+        return Promise.resolve(bandDataCache[key]);
+    }
+    return (subdivisionMatrixReady || Promise.resolve())
+        .then(() => fetch(bandDataUrl('/feedback/grade-bands-data/', {
+            max_marks: maxMarks,
+            subdivision: subdivision,
+            degree_level: degreeLevel
+        })))
+        .then(response => response.json())
+        .then(data => {
+            bandDataCache[key] = data.groups || [];
+            return bandDataCache[key];
+        });
+}
+
+function prefetchBandGroups(rows, degreeLevel) {
+    // One batch request for every row whose bands aren't cached yet
+    const items = new Set();
+    rows.forEach(row => {
+        const maxMarks = parseInt(row.querySelector('.cat-max').value);
+        const subdivision = row.querySelector('.subdivision-value').value;
+        if (maxMarks >= 1 && subdivision && !(`${degreeLevel}|${maxMarks}:${subdivision}` in bandDataCache)) {
+            items.add(`${maxMarks}:${subdivision}`);
+        }
+    });
+    if (items.size === 0) {
+        return Promise.resolve();
+    }
+    return (subdivisionMatrixReady || Promise.resolve())
+        .then(() => fetch(bandDataUrl('/feedback/grade-bands-data/batch/', {
+            items: Array.from(items).join(','),
+            degree_level: degreeLevel
+        })))
+        .then(response => response.json())
+        .then(data => {
+            Object.entries(data.previews || {}).forEach(([item, groups]) => {
+                bandDataCache[`${degreeLevel}|${item}`] = groups;
+            });
+        })
+        .catch(error => {
+            console.error('Error fetching grade bands:', error);
+        });
+}
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = String(text);
+    return div.innerHTML.replace(/"/g, '&quot;');
+}
+
+// Client-side equivalent of partials/grade_bands_grid.html with editable descriptions
+function renderGradeBandsGrid(groups) {
+    const lgCols = groups.some(group => group.main_grade === 'Dist') ? 4 : 5;
+    const columns = groups.map((group, index) => {
+        const grade = escapeHtml(group.main_grade);
+        let headerClass = 'bg-light';
+        if (group.main_grade === '1st' || group.main_grade === 'Dist') {
+            headerClass = 'bg-success-subtle bg-gradient';
+        } else if (group.main_grade === 'Fail') {
+            headerClass = 'bg-danger-subtle bg-gradient';
+        }
+        const cardClasses = [
+            'card h-100 d-flex flex-column',
+            index > 0 ? 'border-start-0' : '',
+            'rounded-0',
+            index === 0 ? 'rounded-start' : '',
+            index === groups.length - 1 ? 'rounded-end' : ''
+        ].filter(Boolean).join(' ');
+        const bands = group.bands.map(band => `
+                            <div class="col d-flex flex-column">
+                                <div class="fw-semibold text-muted" style="min-height: 2.5rem;">${escapeHtml(band.grade)}</div>
+                                <div class="badge bg-secondary-subtle text-black w-100">${escapeHtml(band.marks)}</div>
+                            </div>`).join('');
+        return `
+        <div class="col">
+            <div class="${cardClasses}">
+                <div class="card-body ${headerClass} p-2 d-flex flex-column">
+                    <textarea class="form-control form-control-sm grade-description mb-2"
+                            data-grade="${grade}"
+                            placeholder="Description for ${grade}..."
+                            rows="3"></textarea>
+                    <div class="mt-auto pt-2 border-top">
+                        <div class="row g-1 text-center small">${bands}
+                        </div>
+                    </div>
+                </div>
+            </div>
+        </div>`;
+    }).join('');
+    return `<div class="row row-cols-1 row-cols-sm-2 row-cols-md-3 row-cols-lg-${lgCols} g-0 grade-bands-grid">${columns}
+</div>`;
+}
+
 function getCategoryDataForRow(row) {
     // Find the index of this row
     const allRows = document.querySelectorAll('.category-row');
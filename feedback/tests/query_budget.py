@@ -0,0 +1,100 @@
+"""Query budget harness for view regression tests.
+
+`QueryBudgetMixin.assertViewBudget` requests a page and fails if it runs a
+different number of queries than expected or takes longer than its
+wall-clock ceiling. Budgets are pinned against the large fixtures built
+here, so a view that starts querying per template, category or row (an
+N+1) fails however fast the queries are.
+
+Ceilings are deliberately generous; set QUERY_BUDGET_TIME_FACTOR to scale
+them on a slow machine (e.g. 3 for a loaded CI runner).
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+
+def time_factor():
+    return float(os.environ.get("QUERY_BUDGET_TIME_FACTOR", 1))
+
+
+def grade_category(i, max_marks=10):
+    return {
+        "label": f"Category {i}",
+        "max": max_marks,
+        "type": "grade",
+        "subdivision": "high_low",
+        "grade_band_descriptions": {
+            grade: f"{grade} work in category {i}"
+            for grade in ("1st", "2:1", "2:2", "3rd", "Fail")
+        },
+    }
+
+
+def create_templates(count, categories=5):
+    """Create `count` templates with `categories` grade categories each."""
+    from feedback.models import AssessmentTemplate
+    
+    return [
+        AssessmentTemplate.objects.create(
+            component=1 + i % 3, title=f"Template {i}", module_code=f"KB{5000 + i % 50}",
+            module_title=f"Module {i % 50}", assessment_title="Coursework", weighting=50,
+            max_marks=categories * 10, categories=[grade_category(c) for c in range(categories)],
+        )
+        for i in range(count)
+    ]
+
+
+def create_phrase_bank(questions, rows):
+    """Create `questions` questions with `rows` feedback rows each."""
+    from feedback_generator.models import FeedbackRow, Question
+    
+    created = Question.objects.bulk_create(
+        Question(text=f"Question {q}", order=q) for q in range(questions)
+    )
+    FeedbackRow.objects.bulk_create(
+        FeedbackRow(
+            question=question, label=f"Row {r}", order=r,
+            text_positive=f"Strong {question.text.lower()} row {r}.",
+            text_negative=f"Weak {question.text.lower()} row {r}.",
+        )
+        for question in created
+        for r in range(rows)
+    )
+    return created
+
+
+class QueryBudgetMixin:
+    """TestCase mixin for pinning the queries and time a view may take."""
+    
+    @contextmanager
+    def assertQueryBudget(self, queries, seconds, using="default"):
+        """
+        Fail unless the block runs exactly `queries` queries within
+        `seconds` (scaled by QUERY_BUDGET_TIME_FACTOR).
+        """
+        with CaptureQueriesContext(connections[using]) as captured:
+            start = time.perf_counter()
+            yield captured
+            elapsed = time.perf_counter() - start
+        
+        executed = len(captured.captured_queries)
+        if executed != queries:
+            listing = "\n".join(
+                f"{i}. {query['sql']}" for i, query in enumerate(captured.captured_queries, start=1)
+            )
+            self.fail(f"{executed} queries executed, budget is {queries}:\n{listing}")
+        ceiling = seconds * time_factor()
+        self.assertLessEqual(
+            elapsed, ceiling, f"Took {elapsed * 1000:.0f} ms, ceiling is {ceiling * 1000:.0f} ms",
+        )
+    
+    def assertViewBudget(self, url, queries, seconds, data=None):
+        """GET `url` within the budget and return the (200) response."""
+        with self.assertQueryBudget(queries, seconds):
+            response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+        return response
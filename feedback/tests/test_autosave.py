@@ -0,0 +1,128 @@
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from feedback.autosave import AutosaveConflict, autosave_buffer
+from feedback.models import AssessmentTemplate
+
+
+@override_settings(
+    FEEDBACK_AUTOSAVE_WRITE_BEHIND=True, FEEDBACK_SINGLE_WORKER=True, FEEDBACK_AUTOSAVE_FLUSH_INTERVAL=0,
+)
+class WriteBehindAutosaveTests(TestCase):
+    """Tests for buffering autosaves and writing them in batches."""
+    
+    def setUp(self):
+        self.template = AssessmentTemplate.objects.create(
+            component=1, title="Draft", module_code="KB5031", module_title="Module",
+            assessment_title="Test", weighting=50, max_marks=10,
+            categories=[{"label": "Design", "max": 10, "type": "numeric"}],
+        )
+        self.url = reverse("template_update", kwargs={"pk": self.template.pk})
+        self.addCleanup(autosave_buffer.discard, self.template.pk)
+    
+    def patch(self, payload):
+        return self.client.patch(self.url, data=json.dumps(payload), content_type="application/json")
+    
+    def stored(self):
+        return AssessmentTemplate.objects.get(pk=self.template.pk)
+    
+    def test_autosaves_are_buffered_then_written_in_one_flush(self):
+        self.assertEqual(self.patch({"title": "First", "version": 1}).json()["version"], 2)
+        self.assertEqual(self.patch({"module_title": "Second", "version": 2}).json()["version"], 3)
+        self.assertEqual(self.stored().title, "Draft")
+        
+        self.assertEqual(autosave_buffer.flush(), 1)
+        stored = self.stored()
+        self.assertEqual((stored.title, stored.module_title, stored.version), ("First", "Second", 3))
+        self.assertEqual(stored.content_hash, stored.compute_content_hash())
+        
+        # The client's version still matches after the flush
+        self.assertEqual(self.patch({"title": "Third", "version": 3}).json()["version"], 4)
+    
+    def test_buffered_autosaves_dont_open_a_write_transaction(self):
+        """Staging only reads, so it never takes SQLite's write lock."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.patch({"title": "Buffered", "version": 1}).status_code, 200)
+        self.assertEqual([q["sql"].split()[0] for q in ctx.captured_queries], ["SELECT"])
+    
+    def test_autosave_after_the_interval_writes_overdue_saves(self):
+        """Without a flush thread, the next autosave writes what's overdue."""
+        import time
+        
+        self.patch({"title": "First", "version": 1})
+        self.assertEqual(self.stored().title, "Draft")
+        
+        autosave_buffer._due = time.monotonic() - 1
+        self.patch({"module_title": "Second", "version": 2})
+        stored = self.stored()
+        self.assertEqual((stored.title, stored.module_title, stored.version), ("First", "Second", 3))
+        self.assertFalse(autosave_buffer.has_pending(self.template.pk))
+    
+    def test_buffered_changes_are_visible_to_later_autosaves(self):
+        """Patches and version checks apply on top of what's buffered."""
+        self.patch({"patch": {"categories": [{"op": "replace", "path": "/0/max", "value": 8}]}, "version": 1})
+        resp = self.patch({"patch": {"categories": [{"op": "test", "path": "/0/max", "value": 8}]}, "version": 2})
+        self.assertEqual(resp.status_code, 200)
+        
+        stale = self.patch({"title": "Other tab", "version": 1})
+        self.assertEqual(stale.status_code, 409)
+        self.assertEqual(stale.json()["version"], 2)
+    
+    def test_reading_pages_writes_buffered_changes_first(self):
+        self.patch({"title": "Read your writes", "version": 1})
+        
+        resp = self.client.get(reverse("template_edit", kwargs={"pk": self.template.pk}))
+        self.assertContains(resp, "Read your writes")
+        self.assertContains(resp, "version: 2,")
+        self.assertFalse(autosave_buffer.has_pending(self.template.pk))
+        self.assertEqual(self.stored().title, "Read your writes")
+    
+    def test_close_beacon_saves_payload_and_flushes(self):
+        flush_url = reverse("template_flush", kwargs={"pk": self.template.pk})
+        self.patch({"title": "Buffered", "version": 1})
+        
+        resp = self.client.post(flush_url, {"payload": json.dumps({"module_title": "On close", "version": 2})})
+        self.assertEqual(resp.json()["version"], 3)
+        stored = self.stored()
+        self.assertEqual((stored.title, stored.module_title, stored.version), ("Buffered", "On close", 3))
+        
+        self.assertEqual(self.client.post(flush_url).json(), {"status": "flushed"})
+    
+    def test_stage_rejects_edits_made_against_a_superseded_version(self):
+        first = autosave_buffer.load(self.template.pk)
+        second = autosave_buffer.load(self.template.pk)
+        first.title = "First"
+        autosave_buffer.stage(first, ["title"])
+        
+        second.title = "Second"
+        with self.assertRaises(AutosaveConflict):
+            autosave_buffer.stage(second, ["title"])
+    
+    def test_deleting_discards_buffered_changes(self):
+        self.patch({"title": "Gone", "version": 1})
+        self.client.post(reverse("template_delete", kwargs={"pk": self.template.pk}))
+        
+        self.assertFalse(autosave_buffer.has_pending(self.template.pk))
+        self.assertEqual(autosave_buffer.flush(), 0)
+
+
+class WriteBehindSettingsTests(TestCase):
+    """Write-behind needs an explicit single-worker declaration."""
+    
+    @override_settings(FEEDBACK_AUTOSAVE_WRITE_BEHIND=True, FEEDBACK_SINGLE_WORKER=False)
+    def test_write_behind_is_ignored_and_flagged_without_single_worker(self):
+        from feedback.checks import check_write_behind_single_worker
+        
+        self.assertFalse(autosave_buffer.enabled)
+        self.assertEqual([w.id for w in check_write_behind_single_worker(None)], ["feedback.W001"])
+    
+    @override_settings(FEEDBACK_AUTOSAVE_WRITE_BEHIND=True, FEEDBACK_SINGLE_WORKER=True)
+    def test_write_behind_is_used_with_single_worker(self):
+        from feedback.checks import check_write_behind_single_worker
+        
+        self.assertTrue(autosave_buffer.enabled)
+        self.assertEqual(check_write_behind_single_worker(None), [])
@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase
+from feedback.benchmarks import compare_to_baseline, run_benchmarks
+from feedback.db_benchmarks import connect, percentile, run_sqlite_benchmark
+from feedback.load_generator import LOAD_ACTIONS, run_load_test
+from feedback.server_benchmarks import run_server_benchmark
+
+
+class GradingBenchmarkTests(TestCase):
+    """Tests for the grade band engine benchmarks and baseline comparison."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "baseline.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_run_benchmarks_sweeps_every_subdivision_and_degree_level(self):
+        """Each benchmark reports ops/sec and allocations for the whole sweep."""
+        results = run_benchmarks(max_marks=5, repeat=1)["results"]
+        self.assertEqual(
+            set(results),
+            {"calculate_grade_bands", "validate_subdivision", "grade_for_percentage", "group_bands_by_main_grade"},
+        )
+        # 5 max marks x 3 subdivisions x 2 degree levels
+        self.assertEqual(results["calculate_grade_bands"]["ops"], 30)
+        self.assertGreater(results["calculate_grade_bands"]["ops_per_sec"], 0)
+        self.assertGreater(results["calculate_grade_bands"]["bytes_per_op"], 0)
+
+    def test_compare_to_baseline_flags_slower_or_larger_results(self):
+        """Drops in ops/sec or growth in allocation past the tolerance are regressions."""
+        baseline = {"results": {"calculate_grade_bands": {"ops_per_sec": 1000, "bytes_per_op": 100}}}
+        within = {"results": {"calculate_grade_bands": {"ops_per_sec": 800, "bytes_per_op": 105}}}
+        slower = {"results": {"calculate_grade_bands": {"ops_per_sec": 500, "bytes_per_op": 200}}}
+
+        self.assertEqual(compare_to_baseline(within, baseline), [])
+        self.assertEqual(len(compare_to_baseline(slower, baseline)), 2)
+
+    def test_command_saves_baseline_and_fails_on_regression(self):
+        """The command stores a baseline and raises when a later run regresses past it."""
+        options = {"max_marks": 5, "repeat": 1, "baseline": self.path, "stdout": StringIO()}
+        call_command("benchmark_grading", save_baseline=True, **options)
+
+        with open(self.path) as f:
+            baseline = json.load(f)
+        for result in baseline["results"].values():
+            result["ops_per_sec"] *= 1000
+        with open(self.path, "w") as f:
+            json.dump(baseline, f)
+
+        with self.assertRaises(CommandError):
+            call_command("benchmark_grading", **options)
+
+
+class SqliteBenchmarkTests(TestCase):
+    """Tests for the SQLite connection profile benchmark."""
+
+    def test_percentile_uses_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile([3], 99), 3)
+        self.assertIsNone(percentile([], 50))
+
+    def test_production_profile_pragmas_apply(self):
+        from django.conf import settings
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = connect(os.path.join(tmpdir, "db.sqlite3"), settings.SQLITE_PRODUCTION_OPTIONS)
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            # NORMAL
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+            conn.close()
+
+    def test_benchmark_reports_each_profile(self):
+        results = run_sqlite_benchmark(readers=1, writers=1, duration=0.2, rows=5)
+        self.assertEqual(set(results), {"default", "production"})
+        for result in results.values():
+            self.assertGreater(result["reads_per_sec"], 0)
+            self.assertGreater(result["writes_per_sec"], 0)
+            self.assertIn("lock_errors", result)
+
+
+class ServerBenchmarkTests(TransactionTestCase):
+    """Tests for the ASGI vs WSGI endpoint benchmark."""
+
+    def test_benchmark_serves_each_endpoint_through_both_paths(self):
+        results = run_server_benchmark(requests=4, concurrency=1, use_scratch_db=False)
+        self.assertEqual(set(results), {"template_update", "grade_bands_preview", "edit_row"})
+        for paths in results.values():
+            self.assertEqual(set(paths), {"wsgi", "asgi"})
+            for result in paths.values():
+                self.assertEqual(result["requests"], 4)
+                self.assertEqual(result["failed"], 0)
+
+
+class LoadGeneratorTests(TransactionTestCase):
+    """Tests for the simulated editor and reader load."""
+
+    def test_every_action_is_exercised_through_both_handlers(self):
+        for handler in ("wsgi", "asgi"):
+            with self.subTest(handler=handler):
+                results = run_load_test(
+                    editors=2, readers=2, previewers=1, generator_editors=1, duration=0.5, handler=handler,
+                    editor_interval=0.05, reader_interval=0.05, preview_interval=0.05, preview_burst=2,
+                    generator_interval=0.05, templates=2, use_scratch_db=False,
+                )
+                self.assertEqual(set(results), {*LOAD_ACTIONS, "all"})
+                for action in LOAD_ACTIONS:
+                    self.assertGreater(results[action]["requests"], 0, action)
+                    self.assertEqual(results[action]["errors"], 0, action)
+                total = results["all"]
+                self.assertEqual(total["requests"], sum(results[action]["requests"] for action in LOAD_ACTIONS))
+                self.assertLessEqual(total["p50_ms"], total["p95_ms"])
+                self.assertLessEqual(total["p95_ms"], total["p99_ms"])
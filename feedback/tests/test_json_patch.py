@@ -0,0 +1,60 @@
+from django.test import SimpleTestCase
+from feedback.json_patch import JsonPatchConflict, JsonPatchError, apply_patch
+
+
+class ApplyPatchTests(SimpleTestCase):
+    """Tests for applying RFC 6902 JSON Patch operations."""
+    
+    def setUp(self):
+        self.categories = [
+            {"label": "Design", "max": 10, "grade_band_descriptions": {"1st": "Excellent", "2:1": "Good"}},
+            {"label": "Testing", "max": 20},
+        ]
+    
+    def test_editor_diff_round_trips(self):
+        """The operations the editor generates turn the stored document into the edited one."""
+        patch = [
+            {"op": "remove", "path": "/0/grade_band_descriptions/2:1"},
+            {"op": "replace", "path": "/0/grade_band_descriptions/1st", "value": "Outstanding"},
+            {"op": "replace", "path": "/1/max", "value": 30},
+            {"op": "add", "path": "/-", "value": {"label": "Report", "max": 5}},
+        ]
+        result = apply_patch(self.categories, patch)
+        self.assertEqual(result, [
+            {"label": "Design", "max": 10, "grade_band_descriptions": {"1st": "Outstanding"}},
+            {"label": "Testing", "max": 30},
+            {"label": "Report", "max": 5},
+        ])
+        # The original document is left untouched
+        self.assertEqual(self.categories[1]["max"], 20)
+    
+    def test_move_copy_and_escaped_pointers(self):
+        doc = {"a/b": [1, 2], "c~d": {}}
+        result = apply_patch(doc, [
+            {"op": "copy", "from": "/a~1b/0", "path": "/c~0d/x"},
+            {"op": "move", "from": "/a~1b/1", "path": "/a~1b/0"},
+        ])
+        self.assertEqual(result, {"a/b": [2, 1], "c~d": {"x": 1}})
+    
+    def test_failed_test_operation_is_a_conflict(self):
+        with self.assertRaises(JsonPatchConflict):
+            apply_patch(self.categories, [
+                {"op": "test", "path": "/0/label", "value": "Other"},
+                {"op": "replace", "path": "/0/label", "value": "Never applied"},
+            ])
+    
+    def test_invalid_operations_raise(self):
+        invalid = [
+            {"op": "replace", "path": "/5/max", "value": 1},
+            {"op": "remove", "path": "/0/missing"},
+            {"op": "add", "path": "/01", "value": {}},
+            {"op": "add", "path": "0", "value": {}},
+            {"op": "replace", "path": "/0/label"},
+            {"op": "shuffle", "path": "/0"},
+            {"op": "move", "from": "/0", "path": "/0/label"},
+        ]
+        for operation in invalid:
+            with self.subTest(operation=operation), self.assertRaises(JsonPatchError):
+                apply_patch(self.categories, [operation])
+        with self.assertRaises(JsonPatchError):
+            apply_patch(self.categories, {"op": "remove", "path": "/0"})
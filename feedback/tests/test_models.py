@@ -436,6 +436,144 @@ class AssessmentTemplateModelTests(TestCase):
             tpl.full_clean()
 
 
+class ContentHashTests(TestCase):
+    def test_content_hash_tracks_displayed_fields(self):
+        """The content hash is set on save and changes only when displayed content does."""
+        template = AssessmentTemplate.objects.create(
+            component=1,
+            title="Hashed",
+            module_code="CS101",
+            module_title="Intro",
+            assessment_title="CW1",
+            weighting=50,
+            max_marks=100,
+            categories=[{"label": "Design", "max": 100}]
+        )
+        original = template.content_hash
+        self.assertEqual(len(original), 64)
+        
+        template.save()
+        self.assertEqual(template.content_hash, original)
+        
+        template.categories = [{"label": "Design", "max": 90}]
+        template.save(update_fields=["categories"])
+        template.refresh_from_db()
+        self.assertNotEqual(template.content_hash, original)
+        self.assertEqual(template.content_hash, template.compute_content_hash())
+
+
+class VersionTrackingTests(TestCase):
+    def test_every_save_bumps_version_and_updated_at(self):
+        """Version starts at 1 and each save increments it and refreshes updated_at."""
+        tpl = AssessmentTemplate.objects.create(
+            component=1,
+            title="Versioned",
+            module_code="CS101",
+            module_title="Intro",
+            assessment_title="CW1",
+            weighting=50,
+            max_marks=100,
+            categories=[]
+        )
+        self.assertEqual(tpl.version, 1)
+        first_saved = tpl.updated_at
+        
+        tpl.title = "Versioned again"
+        tpl.save(update_fields=["title"])
+        tpl.refresh_from_db()
+        self.assertEqual(tpl.version, 2)
+        self.assertGreaterEqual(tpl.updated_at, first_saved)
+
+
+class CompiledDisplayDataTests(TestCase):
+    def _create(self, **kwargs):
+        fields = dict(
+            component=1,
+            title="Compiled",
+            module_code="CS101",
+            module_title="Intro",
+            assessment_title="CW1",
+            weighting=50,
+            max_marks=50,
+            categories=[
+                {"label": "Design", "max": 30, "type": "grade", "subdivision": "high_low"},
+                {"label": "Testing", "max": 10, "type": "numeric"},
+            ]
+        )
+        fields.update(kwargs)
+        return AssessmentTemplate.objects.create(**fields)
+    
+    def test_save_stores_bands_totals_and_mismatch(self):
+        """Saving a template stores its bands, grouped bands, total and mismatch status."""
+        from feedback.compiled import COMPILED_FORMAT_VERSION
+        
+        tpl = self._create()
+        tpl.refresh_from_db()
+        compiled = tpl.compiled
+        self.assertEqual(compiled["version"], COMPILED_FORMAT_VERSION)
+        self.assertEqual(compiled["total_category_marks"], 40)
+        self.assertEqual(compiled["marks_mismatch"], {"total": 40, "max_marks": 50})
+        
+        design = compiled["categories"][0]
+        self.assertEqual(design["bands"][0], {"grade": "Max 1st", "marks": 30, "main_grade": "1st", "order": 0})
+        self.assertEqual(list(design["grouped_bands"]), ["1st", "2:1", "2:2", "3rd", "Fail"])
+        self.assertNotIn("bands", compiled["categories"][1])
+    
+    def test_malformed_categories_still_save(self):
+        """Categories the band engine can't handle don't block saving."""
+        tpl = self._create(categories=[{"label": "Odd", "max": "lots", "type": "grade", "subdivision": "none"}])
+        tpl.refresh_from_db()
+        self.assertEqual(tpl.compiled, {})
+    
+    def test_compile_command_backfills_missing_data(self):
+        """The backfill command compiles rows written without display data."""
+        from io import StringIO
+        from django.core.management import call_command
+        
+        tpl = self._create()
+        AssessmentTemplate.objects.filter(pk=tpl.pk).update(compiled={}, content_hash="")
+        
+        out = StringIO()
+        call_command("compile_templates", stdout=out)
+        self.assertIn("Compiled 1 of 1 templates", out.getvalue())
+        tpl.refresh_from_db()
+        self.assertEqual(tpl.compiled["total_category_marks"], 40)
+        self.assertEqual(tpl.content_hash, tpl.compute_content_hash())
+    
+    def test_compile_command_leaves_version_and_save_time_alone(self):
+        """Backfilling isn't an edit: open editors and conditional GETs are unaffected."""
+        from io import StringIO
+        from django.core.management import call_command
+        
+        tpl = self._create()
+        tpl.refresh_from_db()
+        
+        call_command("compile_templates", "--all", stdout=StringIO())
+        stored = AssessmentTemplate.objects.get(pk=tpl.pk)
+        self.assertEqual((stored.version, stored.updated_at), (tpl.version, tpl.updated_at))
+        self.assertEqual(stored.compiled, tpl.compiled)
+    
+    def test_partial_save_only_recompiles_when_inputs_change(self):
+        """A title-only save keeps the compiled data out of the UPDATE."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        tpl = self._create()
+        tpl.title = "Renamed"
+        with CaptureQueriesContext(connection) as ctx:
+            tpl.save(update_fields=["title"])
+        update = next(q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE"))
+        self.assertNotIn('"compiled"', update)
+        self.assertNotIn('"categories"', update)
+        self.assertIn('"content_hash"', update)
+        
+        tpl.max_marks = 40
+        tpl.save(update_fields=["max_marks"])
+        tpl.refresh_from_db()
+        self.assertEqual(tpl.title, "Renamed")
+        self.assertIsNone(tpl.compiled["marks_mismatch"])
+
+
 class ChartConfigTests(TestCase):
     """Tests for chart configuration on AssessmentTemplate."""
     
@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from feedback.models import AssessmentTemplate
+from feedback.tests.query_budget import QueryBudgetMixin, create_templates, grade_category
+
+
+class ViewQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Query and time budgets for the template pages, against large fixtures."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        # 500 templates: 20 pages of the home listing
+        cls.templates = create_templates(500)
+        cls.rubric = AssessmentTemplate.objects.create(
+            component=1, title="Large rubric", module_code="KB6000", module_title="Capstone",
+            assessment_title="Dissertation", weighting=100, max_marks=400,
+            categories=[grade_category(i) for i in range(40)],
+        )
+    
+    def setUp(self):
+        cache.clear()
+    
+    def test_home_pages_take_one_query(self):
+        url = reverse("home")
+        middle = self.templates[250].pk
+        
+        response = self.assertViewBudget(url, queries=1, seconds=0.5)
+        self.assertContains(response, 'id="older-templates"')
+        self.assertViewBudget(url, queries=1, seconds=0.5, data={"after": middle})
+        self.assertViewBudget(url, queries=1, seconds=0.5, data={"before": middle})
+    
+    def test_filtered_home_and_search_take_one_query(self):
+        self.assertViewBudget(reverse("home"), queries=1, seconds=0.5, data={"q": "Category", "component": 2})
+        self.assertViewBudget(reverse("template_search"), queries=1, seconds=0.5, data={"q": "Category"})
+    
+    def test_rubric_takes_two_queries_then_one_when_cached(self):
+        url = reverse("template_rubric", kwargs={"pk": self.rubric.pk})
+        
+        # Validators, then the template
+        response = self.assertViewBudget(url, queries=2, seconds=1.0)
+        self.assertContains(response, "Category 39")
+        # Validators only: the page comes from the cache
+        self.assertViewBudget(url, queries=1, seconds=0.2)
+    
+    def test_feedback_sheet_and_editor_take_two_queries(self):
+        self.assertViewBudget(reverse("template_feedback_sheet", kwargs={"pk": self.rubric.pk}), queries=2, seconds=1.0)
+        self.assertViewBudget(reverse("template_edit", kwargs={"pk": self.rubric.pk}), queries=2, seconds=1.0)
+    
+    def test_budget_overruns_fail(self):
+        with self.assertRaisesMessage(AssertionError, "2 queries executed, budget is 1"):
+            with self.assertQueryBudget(queries=1, seconds=1.0):
+                list(AssessmentTemplate.objects.all()[:1])
+                list(AssessmentTemplate.objects.all()[:1])
+        with self.assertRaisesMessage(AssertionError, "ceiling is 0 ms"):
+            with self.assertQueryBudget(queries=1, seconds=0):
+                list(AssessmentTemplate.objects.all()[:1])
@@ -0,0 +1,118 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from feedback.models import AssessmentTemplate
+from feedback.search import SEARCH_TABLE, match_expression, search_templates
+
+
+def make_template(title, descriptions=None, **fields):
+    categories = [{"label": "Design", "max": 30, "type": "grade", "subdivision": "none"}]
+    if descriptions:
+        categories[0]["grade_band_descriptions"] = descriptions
+    return AssessmentTemplate.objects.create(
+        component=fields.pop("component", 1),
+        title=title,
+        module_code=fields.pop("module_code", "EG100"),
+        module_title=fields.pop("module_title", "Engineering"),
+        assessment_title=fields.pop("assessment_title", "Coursework"),
+        weighting=50,
+        max_marks=30,
+        categories=categories,
+        **fields,
+    )
+
+
+class SearchIndexTests(TestCase):
+    """Tests for the FTS5 template search index."""
+
+    def test_match_expression_quotes_terms_as_prefixes(self):
+        """User input can't inject FTS5 syntax; each word becomes a quoted prefix."""
+        self.assertEqual(match_expression('robot "arm" OR NEAR('), '"robot"* "arm"* "or"* "near"*')
+        self.assertEqual(match_expression("  -- "), "")
+
+    def test_descriptions_are_searchable_with_highlighted_snippets(self):
+        tpl = make_template("Design report", {"1st": "Insightful critique of the <b>trade-offs</b>", "Fail": "No analysis"})
+        make_template("Lab report", {"1st": "Accurate measurements"})
+
+        results = search_templates("critique")
+        self.assertEqual([r["id"] for r in results], [tpl.pk])
+        self.assertIn("<mark>critique</mark>", results[0]["snippet"])
+        # Description text is escaped; only the match markers are HTML
+        self.assertIn("&lt;b&gt;trade", results[0]["snippet"])
+
+    def test_title_matches_rank_above_description_matches(self):
+        in_description = make_template("Lab report", {"1st": "Clear robotics discussion"})
+        in_title = make_template("Robotics project")
+
+        results = search_templates("robotics")
+        self.assertEqual([r["id"] for r in results], [in_title.pk, in_description.pk])
+        self.assertEqual(results[1]["snippet"].count("<mark>"), 1)
+        self.assertEqual(results[0]["snippet"], "")
+
+    def test_index_follows_saves_and_deletes(self):
+        tpl = make_template("Thermodynamics exam")
+        self.assertEqual(len(search_templates("thermodynamics")), 1)
+
+        tpl.title = "Fluids exam"
+        tpl.save()
+        self.assertEqual(search_templates("thermodynamics"), [])
+        self.assertEqual(len(search_templates("fluids")), 1)
+
+        tpl.delete()
+        self.assertEqual(search_templates("fluids"), [])
+
+    def test_saves_that_dont_touch_indexed_fields_skip_the_index(self):
+        from django.test.utils import CaptureQueriesContext
+
+        tpl = make_template("Thermodynamics exam")
+        tpl.weighting = 40
+        with CaptureQueriesContext(connection) as ctx:
+            tpl.save(update_fields=["weighting"])
+        self.assertFalse([q for q in ctx.captured_queries if SEARCH_TABLE in q["sql"]])
+
+        tpl.title = "Fluids exam"
+        tpl.save(update_fields=["title"])
+        self.assertEqual(len(search_templates("fluids")), 1)
+
+    def test_rebuild_command_reindexes_bulk_updates(self):
+        tpl = make_template("Circuits exam")
+        # QuerySet.update() skips signals, so the index goes stale until rebuilt
+        AssessmentTemplate.objects.filter(pk=tpl.pk).update(title="Signals exam")
+        self.assertEqual(search_templates("signals"), [])
+
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+        self.assertIn("Indexed 1 templates", out.getvalue())
+        self.assertEqual([r["id"] for r in search_templates("signals")], [tpl.pk])
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {SEARCH_TABLE}")
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+
+class TemplateSearchViewTests(TestCase):
+    def test_search_endpoint_returns_ranked_json(self):
+        tpl = make_template("Control systems", {"2:1": "Sound stability analysis"})
+
+        resp = self.client.get(reverse("template_search"), {"q": "stability"})
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(data["query"], "stability")
+        self.assertEqual(data["results"][0]["id"], tpl.pk)
+        self.assertIn("<mark>stability</mark>", data["results"][0]["snippet"])
+
+    def test_empty_query_and_bad_limit(self):
+        make_template("Control systems")
+
+        self.assertEqual(self.client.get(reverse("template_search")).json()["results"], [])
+        self.assertEqual(self.client.get(reverse("template_search"), {"q": "control", "limit": "x"}).status_code, 400)
+
+    def test_home_search_uses_index(self):
+        """Home page search matches grade band descriptions through the index."""
+        make_template("Control systems", {"1st": "Elegant controller tuning"})
+        make_template("Materials lab")
+
+        resp = self.client.get("/feedback/", {"q": "controller tun"})
+        self.assertEqual([t.title for t in resp.context["templates"]], ["Control systems"])
@@ -0,0 +1,100 @@
+import json
+import re
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from feedback.models import AssessmentTemplate
+
+
+def server_timing(response):
+    """Parse a Server-Timing header into {name: (dur, desc)}."""
+    metrics = {}
+    for metric in response["Server-Timing"].split(", "):
+        name, *params = metric.split(";")
+        values = dict(param.split("=", 1) for param in params)
+        metrics[name] = (float(values["dur"]), values.get("desc", "").strip('"'))
+    return metrics
+
+
+class RequestTimingTests(TestCase):
+    """Tests for the Server-Timing header and the slow request log."""
+    
+    def setUp(self):
+        cache.clear()
+        self.template = AssessmentTemplate.objects.create(
+            component=1, title="Timed", module_code="KB5031", module_title="Module",
+            assessment_title="Test", weighting=50, max_marks=10,
+            categories=[{"label": "Design", "max": 10, "type": "numeric"}],
+        )
+    
+    def test_header_reports_total_db_template_and_cache(self):
+        response = self.client.get(reverse("home"))
+        metrics = server_timing(response)
+        
+        self.assertEqual(set(metrics), {"total", "db", "template", "cache"})
+        queries = int(re.match(r"(\d+) queries", metrics["db"][1]).group(1))
+        self.assertGreater(queries, 0)
+        self.assertGreater(metrics["template"][0], 0)
+        self.assertGreaterEqual(metrics["total"][0], metrics["db"][0] + metrics["template"][0])
+    
+    def test_header_counts_rubric_page_cache_hits(self):
+        url = reverse("template_rubric", kwargs={"pk": self.template.pk})
+        
+        first = server_timing(self.client.get(url))
+        second = server_timing(self.client.get(url))
+        
+        self.assertEqual(first["cache"][1], "0 hits / 1 misses")
+        self.assertEqual(second["cache"][1], "1 hits / 0 misses")
+        # Served from the cache without rendering
+        self.assertEqual(second["template"][0], 0)
+    
+    def test_async_views_are_timed(self):
+        url = reverse("template_update", kwargs={"pk": self.template.pk})
+        response = self.client.patch(url, data=json.dumps({"title": "Renamed"}), content_type="application/json")
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(server_timing(response)["db"][1], r"^[1-9]\d* queries$")
+    
+    @override_settings(FEEDBACK_SERVER_TIMING=False)
+    def test_header_can_be_disabled(self):
+        self.assertNotIn("Server-Timing", self.client.get(reverse("home")))
+    
+    def test_production_hides_header(self):
+        from core.settings import prod
+        
+        self.assertFalse(prod.FEEDBACK_SERVER_TIMING)
+        self.assertIsNotNone(prod.FEEDBACK_SLOW_REQUEST_MS)
+    
+    @override_settings(FEEDBACK_SERVER_TIMING=False, FEEDBACK_SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_without_the_header(self):
+        with self.assertLogs("feedback.slow_requests", "WARNING") as logs:
+            response = self.client.get(reverse("home"))
+        
+        self.assertNotIn("Server-Timing", response)
+        self.assertGreater(json.loads(logs.records[0].getMessage())["queries"], 0)
+    
+    @override_settings(FEEDBACK_SERVER_TIMING=False, FEEDBACK_SLOW_REQUEST_MS=None)
+    def test_middleware_unused_when_header_and_log_are_off(self):
+        from django.core.exceptions import MiddlewareNotUsed
+        from feedback.middleware import RequestTimingMiddleware
+        
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestTimingMiddleware(lambda request: None)
+    
+    @override_settings(FEEDBACK_SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_as_json(self):
+        with self.assertLogs("feedback.slow_requests", "WARNING") as logs:
+            self.client.get(reverse("home"), {"q": "Timed"})
+        
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual(entry["path"], reverse("home"))
+        self.assertEqual(entry["method"], "GET")
+        self.assertEqual(entry["view"], "feedback.views.home")
+        self.assertEqual(entry["status"], 200)
+        self.assertGreater(entry["queries"], 0)
+        self.assertIn("total_ms", entry)
+    
+    def test_fast_requests_are_not_logged(self):
+        with self.assertNoLogs("feedback.slow_requests"):
+            self.client.get(reverse("home"))
@@ -1,5 +1,45 @@
+import math
+import os
+import tempfile
+from array import array
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.core.management import call_command
 from django.test import TestCase
-from feedback.utils import calculate_grade_bands, validate_subdivision
+from feedback import grading_schemes, utils
+from feedback.grading_schemes import register_grading_scheme, scheme_for_degree_level
+from feedback.utils import (
+    Band,
+    _calculate_mark_for_grade,
+    _get_grade_band_for_percentage,
+    _round_marks,
+    build_grade_band_table,
+    calculate_grade_bands,
+    classify_percentages,
+    clear_grade_band_cache,
+    get_grade_bands,
+    grade_band_cache_info,
+    grade_for_percentage,
+    load_grade_band_table,
+    subdivision_validity_matrix,
+    validate_subdivision,
+)
+
+
+def _linear_search_mark_for_grade(max_marks, target_percentage, expected_grade):
+    """Reference implementation: walk outward from the rounded target one mark at a time."""
+    target_mark = _round_marks(max_marks * target_percentage)
+    if _get_grade_band_for_percentage((target_mark / max_marks) * 100) == expected_grade:
+        return target_mark
+    for distance in range(1, max_marks + 1):
+        mark_above = target_mark + distance
+        if mark_above <= max_marks and _get_grade_band_for_percentage((mark_above / max_marks) * 100) == expected_grade:
+            return mark_above
+        mark_below = target_mark - distance
+        if mark_below >= 0 and _get_grade_band_for_percentage((mark_below / max_marks) * 100) == expected_grade:
+            return mark_below
+    return 0
 
 
 class GradeBandUtilsTests(TestCase):
@@ -66,3 +106,299 @@ class GradeBandUtilsTests(TestCase):
         # Level 7 bands should include Merit/Pass labels and a 50 mark representative
         self.assertTrue(('Merit' in grades) or ('Pass' in grades))
         self.assertIn('50', marks_text)
+
+    def test_bands_carry_main_grade_and_order(self):
+        """Each band names the main grade it is displayed under and that grade's position."""
+        bands = calculate_grade_bands(30, "high_low")
+        self.assertEqual(
+            [(b["main_grade"], b["order"]) for b in bands[:4]],
+            [("1st", 0), ("1st", 0), ("1st", 0), ("2:1", 1)],
+        )
+        self.assertEqual({b["main_grade"] for b in bands[-4:]}, {"Fail"})
+        
+        # Level 7 displays 1st/2:1/2:2 as Dist/Merit/Pass and has no 3rd heading
+        level7 = calculate_grade_bands(30, "high_low", degree_level="MEng/MSc")
+        self.assertEqual(level7[0]["main_grade"], "Dist")
+        self.assertEqual([b["main_grade"] for b in level7 if "3rd" in b["grade"]], [None, None])
+        self.assertEqual(level7[-1]["order"], 3)
+
+    def test_mark_for_grade_matches_linear_search_for_all_max_marks(self):
+        """The closed-form solver picks the same mark as a linear search for 1-1000 marks."""
+        anchors = [
+            (1.00, "1st"), (0.90, "1st"), (0.85, "1st"), (0.80, "1st"), (0.72, "1st"), (0.70, "1st"),
+            (0.67, "2:1"), (0.65, "2:1"), (0.63, "2:1"), (0.62, "2:1"), (0.60, "2:1"),
+            (0.57, "2:2"), (0.55, "2:2"), (0.53, "2:2"), (0.52, "2:2"), (0.50, "2:2"),
+            (0.47, "3rd"), (0.45, "3rd"), (0.43, "3rd"), (0.42, "3rd"), (0.40, "3rd"),
+            (0.30, "Fail"), (0.20, "Fail"), (0.10, "Fail"),
+        ]
+        for max_marks in range(1, 1001):
+            for target, grade in anchors:
+                self.assertEqual(
+                    _calculate_mark_for_grade(max_marks, target, grade),
+                    _linear_search_mark_for_grade(max_marks, target, grade),
+                    f"max_marks={max_marks}, target={target}, grade={grade}",
+                )
+    
+    def test_mark_for_grade_is_constant_time_for_huge_max_marks(self):
+        """Marks too large for float percentages to tell apart are still solved directly."""
+        max_marks = 10**25 + 3
+        
+        bands = calculate_grade_bands(max_marks, "none")
+        
+        self.assertEqual(bands[0]["marks"], max_marks)
+        marks = [band["marks"] for band in bands]
+        self.assertEqual(marks, sorted(marks, reverse=True))
+        # Exact ceiling of 70% of max_marks, moved at most one mark to agree
+        # with the float grade check
+        self.assertIn(_calculate_mark_for_grade(max_marks, 0.0, "1st"), (7 * 10**24 + 2, 7 * 10**24 + 3))
+
+
+class SubdivisionValidityTests(TestCase):
+    """Tests for the precomputed subdivision validity matrix."""
+
+    def _ordered_by_grade(self, max_marks, subdivision, degree_level):
+        scheme = scheme_for_degree_level(degree_level)
+        slots = scheme.band_slots(subdivision)
+        marks = [band["marks"] for band in calculate_grade_bands(max_marks, subdivision, degree_level)]
+        return all(
+            marks[i] < marks[i - 1]
+            for i in range(1, len(slots))
+            if slots[i].grade != slots[i - 1].grade
+        )
+
+    def test_matrix_matches_direct_check_for_all_max_marks(self):
+        """validate_subdivision agrees with checking the computed bands for 1-1000 marks."""
+        for degree_level in ("BEng", "MEng/MSc"):
+            for subdivision in ("none", "high_low", "high_mid_low"):
+                for max_marks in range(1, 1001):
+                    self.assertEqual(
+                        validate_subdivision(max_marks, subdivision, degree_level),
+                        self._ordered_by_grade(max_marks, subdivision, degree_level),
+                        f"{degree_level} {subdivision} max_marks={max_marks}",
+                    )
+
+    def test_level7_fail_bands_make_some_low_marks_invalid(self):
+        """Level 7 fail anchors overlap the 3rd band for a few small max marks."""
+        self.assertFalse(validate_subdivision(10, "none", "MEng/MSc"))
+        self.assertTrue(validate_subdivision(10, "none", "BEng"))
+        self.assertTrue(validate_subdivision(21, "high_mid_low", "MEng/MSc"))
+
+    def test_validity_matrix_lists_valid_ranges(self):
+        """The matrix compresses valid max marks into inclusive ranges per scheme."""
+        matrix = subdivision_validity_matrix()
+        self.assertEqual(matrix["uk_ug"]["high_low"], [[9, 1000]])
+        self.assertEqual(matrix["uk_level7"]["none"][0], [9, 9])
+        self.assertEqual(matrix["uk_level7"]["none"][-1], [21, 1000])
+
+
+class GradeBandTableTests(TestCase):
+    """Tests for the precomputed, memory-mapped grade band table."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "grade_bands.bin")
+
+    def tearDown(self):
+        load_grade_band_table()
+        self.tmpdir.cleanup()
+
+    def _computed_bands(self, max_marks, subdivision, degree_level):
+        """Bands calculated with the table unloaded."""
+        with mock.patch("feedback.utils._table_blocks", None):
+            return calculate_grade_bands(max_marks, subdivision, degree_level=degree_level)
+
+    def test_shipped_table_is_loaded(self):
+        """The shipped table file matches the current band definitions."""
+        self.assertTrue(load_grade_band_table())
+
+    def test_table_lookup_matches_computed_bands(self):
+        """Every table entry equals the directly computed bands."""
+        self.assertTrue(load_grade_band_table())
+        for max_marks in range(1, 1001):
+            for subdivision in ("none", "high_low", "high_mid_low"):
+                for degree_level in ("BEng", "MEng/MSc"):
+                    self.assertEqual(
+                        calculate_grade_bands(max_marks, subdivision, degree_level=degree_level),
+                        self._computed_bands(max_marks, subdivision, degree_level),
+                        f"max_marks={max_marks}, subdivision={subdivision}, degree_level={degree_level}",
+                    )
+
+    def test_out_of_range_marks_fall_back_to_calculation(self):
+        """Marks beyond the table are still calculated."""
+        bands = calculate_grade_bands(1500, "none")
+        self.assertEqual(bands[0], Band("Max 1st", 1500, "1st", 0))
+
+    def test_missing_or_truncated_table_is_ignored(self):
+        """A missing or truncated table file is not loaded."""
+        self.assertFalse(load_grade_band_table(self.path))
+        
+        build_grade_band_table(self.path)
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 2)
+        self.assertFalse(load_grade_band_table(self.path))
+        self.assertEqual(calculate_grade_bands(30, "none")[1], Band("High 1st", 27, "1st", 0))
+
+    def test_stale_table_blocks_are_computed(self):
+        """Blocks whose band definitions changed are computed instead of read."""
+        build_grade_band_table(self.path)
+        with open(self.path, "r+b") as f:
+            f.seek(10)  # fingerprint of the first directory entry
+            f.write(b"stale!!!")
+        self.assertTrue(load_grade_band_table(self.path))
+        for subdivision in ("none", "high_low", "high_mid_low"):
+            self.assertEqual(
+                calculate_grade_bands(30, subdivision),
+                self._computed_bands(30, subdivision, None),
+            )
+
+    def test_build_command_writes_loadable_table(self):
+        """The management command writes a table that can be memory-mapped."""
+        call_command("build_grade_band_table", output=self.path, stdout=StringIO())
+        self.assertTrue(load_grade_band_table(self.path))
+
+
+class GradeBandCacheTests(TestCase):
+    """Tests for the memoized, read-only grade band layer."""
+
+    def setUp(self):
+        clear_grade_band_cache()
+
+    def tearDown(self):
+        clear_grade_band_cache()
+
+    def test_get_grade_bands_matches_calculate_grade_bands(self):
+        """Cached bands carry the same grades and marks as a fresh calculation."""
+        for degree_level in (None, "MEng/MSc"):
+            cached = get_grade_bands(30, "high_low", degree_level=degree_level)
+            fresh = calculate_grade_bands(30, "high_low", degree_level=degree_level)
+            self.assertEqual(list(cached), fresh)
+
+    def test_get_grade_bands_returns_immutable_bands(self):
+        """Shared cached results cannot be modified by callers."""
+        bands = get_grade_bands(20, "none")
+        self.assertIsInstance(bands, tuple)
+        with self.assertRaises(TypeError):
+            bands[0]["marks"] = 99
+        with self.assertRaises(AttributeError):
+            bands[0].marks = 99
+        self.assertEqual(get_grade_bands(20, "none")[0].marks, 20)
+
+    def test_bands_are_slotted_and_readable_like_dicts(self):
+        """Band records have no per-instance dict but keep read-only item access."""
+        band = get_grade_bands(20, "none")[0]
+        self.assertFalse(hasattr(band, "__dict__"))
+        self.assertEqual((band.grade, band.marks), ("Max 1st", 20))
+        self.assertEqual((band["grade"], band.get("marks")), ("Max 1st", 20))
+        self.assertIn("grade", band)
+        self.assertEqual(dict(band), {"grade": "Max 1st", "marks": 20, "main_grade": "1st", "order": 0})
+        with self.assertRaises(KeyError):
+            band["label"]
+
+    def test_cache_key_normalises_degree_level(self):
+        """Equivalent degree levels share a cache entry."""
+        first = get_grade_bands(40, "none", degree_level="MEng/MSc")
+        second = get_grade_bands(40, "none", degree_level=" msc ")
+        self.assertIs(first, second)
+        self.assertIs(get_grade_bands(40, "none"), get_grade_bands(40, "none", degree_level="BEng"))
+
+    def test_cache_info_reports_hits_misses_and_evictions(self):
+        """Counters track hits and misses; evictions stay zero while entries fit."""
+        get_grade_bands(10, "none")
+        get_grade_bands(10, "none")
+        get_grade_bands(10, "high_low")
+        info = grade_band_cache_info()
+        self.assertEqual(info["hits"], 1)
+        self.assertEqual(info["misses"], 2)
+        self.assertEqual(info["evictions"], 0)
+        self.assertEqual(info["size"], 2)
+
+
+class BulkClassificationTests(TestCase):
+    """Tests for vectorised grade classification of whole cohorts."""
+
+    percentages = [100, 70, 69.99, 60, 59.5, 50, 49, 40, 39.99, 0, math.nan]
+
+    def test_classify_matches_grade_for_percentage(self):
+        """Bulk labels agree with the single-value helper across 0-100%."""
+        sweep = [p / 10 for p in range(0, 1001)] + [math.nan]
+        result = classify_percentages(array("d", sweep))
+        self.assertEqual(list(result.labels), [grade_for_percentage(p) for p in sweep])
+
+    def test_classify_level7_uses_dist_merit_pass_labels(self):
+        """Postgraduate degree levels use the Dist/Merit/Pass/Fail label set."""
+        result = classify_percentages(self.percentages, degree_level="MEng/MSc")
+        self.assertEqual(
+            list(result.labels),
+            ["Dist", "Dist", "Merit", "Merit", "Pass", "Pass", "Fail", "Fail", "Fail", "Fail", "Fail"],
+        )
+        self.assertEqual(list(result.indices), [0, 0, 1, 1, 2, 2, 3, 3, 3, 3, 3])
+
+    def test_classify_without_numpy_accepts_buffers(self):
+        """The bisect fallback classifies buffer-protocol input."""
+        with mock.patch("feedback.utils.np", None):
+            result = classify_percentages(array("d", self.percentages))
+        self.assertIsInstance(result.indices, array)
+        self.assertEqual(
+            result.labels,
+            ["1st", "1st", "2:1", "2:1", "2:2", "2:2", "3rd", "3rd", "Fail", "Fail", "Fail"],
+        )
+
+    @skipUnless(utils.np is not None, "NumPy not installed")
+    def test_classify_with_numpy_returns_arrays(self):
+        """NumPy input is classified with searchsorted and returns arrays."""
+        np = utils.np
+        result = classify_percentages(np.array(self.percentages))
+        self.assertIsInstance(result.indices, np.ndarray)
+        self.assertEqual(result.indices.tolist(), [0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 4])
+        self.assertEqual(result.labels.tolist()[:3], ["1st", "1st", "2:1"])
+
+
+class GradingSchemeRegistryTests(TestCase):
+    """Tests for the data-driven grading scheme registry."""
+
+    # A different institution's boundaries: 60/50/40 with a single pass band
+    EXAMPLE_SCHEME = {
+        "name": "example_institution",
+        "grades": (("A", 60), ("B", 50), ("C", 40), ("Fail", 0)),
+        "subdivisions": {
+            "none": (("A", 0.80, "A"), ("B", 0.55, "B"), ("C", 0.45, "C")),
+        },
+        "fail_bands": (("Fail", 0.20), ("Zero Fail", 0.0)),
+        "snap_fail_bands": True,
+    }
+
+    def tearDown(self):
+        grading_schemes.GRADING_SCHEMES.pop("example_institution", None)
+        grading_schemes._schemes_by_degree_level.clear()
+        clear_grade_band_cache()
+
+    def test_degree_levels_resolve_to_compiled_schemes(self):
+        """BEng uses the undergraduate scheme and M-level degrees use Level 7."""
+        self.assertEqual(scheme_for_degree_level(None).name, "uk_ug")
+        self.assertEqual(scheme_for_degree_level("BEng").name, "uk_ug")
+        self.assertEqual(scheme_for_degree_level("MEng/MSc").name, "uk_level7")
+        self.assertEqual(scheme_for_degree_level(" msc ").name, "uk_level7")
+
+    def test_compiled_scheme_classifies_with_bisect_thresholds(self):
+        """Compiled thresholds classify exactly at the boundaries."""
+        level7 = scheme_for_degree_level("MEng/MSc")
+        self.assertEqual(level7.thresholds, (50, 60, 70))
+        self.assertEqual([level7.classify(p) for p in (70, 69.9, 50, 49.9)], ["Dist", "Merit", "Pass", "Fail"])
+
+    def test_new_scheme_needs_no_new_code_path(self):
+        """A registered scheme drives band calculation and classification by name."""
+        register_grading_scheme(self.EXAMPLE_SCHEME)
+        
+        bands = calculate_grade_bands(20, "none", degree_level="example_institution")
+        self.assertEqual(
+            bands,
+            [
+                Band("A", 16, "A", 0),
+                Band("B", 11, "B", 1),
+                Band("C", 9, "C", 2),
+                Band("Fail", 4, "Fail", 3),
+                Band("Zero Fail", 0, "Fail", 3),
+            ],
+        )
+        result = classify_percentages([65, 55, 45, 10], degree_level="example_institution")
+        self.assertEqual(list(result.labels), ["A", "B", "C", "Fail"])
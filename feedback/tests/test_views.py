@@ -77,6 +77,103 @@ class HomeViewTest(TestCase):
         assert f'data-template-id="{template2.pk}"'.encode() in resp.content
         assert b'delete-template' in resp.content  # Check for delete button class
 
+class HomeListingTests(TestCase):
+    """Tests for search, filters and keyset pagination on the home page."""
+    
+    def make_template(self, title, module_code="CS101", component=1, degree_level="BEng", categories=None):
+        return AssessmentTemplate.objects.create(
+            component=component,
+            title=title,
+            module_code=module_code,
+            module_title="Module",
+            assessment_title="Coursework",
+            weighting=50,
+            max_marks=100,
+            degree_level=degree_level,
+            categories=categories if categories is not None else [{"label": "Content", "max": 10}],
+        )
+    
+    def titles(self, resp):
+        return [template.title for template in resp.context["templates"]]
+    
+    def test_pages_are_keyed_by_id(self):
+        """Pages hold HOME_PAGE_SIZE templates newest first and link older/newer by id."""
+        from feedback.views import HOME_PAGE_SIZE
+        templates = [self.make_template(f"T{i}") for i in range(HOME_PAGE_SIZE + 3)]
+        
+        first = self.client.get("/feedback/")
+        self.assertEqual(len(first.context["templates"]), HOME_PAGE_SIZE)
+        self.assertEqual(first.context["templates"][0].pk, templates[-1].pk)
+        self.assertIsNone(first.context["newer_cursor"])
+        older = first.context["older_cursor"]
+        self.assertContains(first, f"after={older}")
+        
+        second = self.client.get("/feedback/", {"after": older})
+        self.assertEqual(self.titles(second), ["T2", "T1", "T0"])
+        self.assertIsNone(second.context["older_cursor"])
+        
+        back = self.client.get("/feedback/", {"before": second.context["newer_cursor"]})
+        self.assertEqual(self.titles(back), self.titles(first))
+    
+    def test_listing_reads_only_display_columns(self):
+        """The categories JSON is not loaded; the stored count is shown instead."""
+        self.make_template("Two", categories=[{"label": "A", "max": 5}, {"label": "B", "max": 5}])
+        
+        with self.assertNumQueries(1):
+            resp = self.client.get("/feedback/")
+        template = resp.context["templates"][0]
+        self.assertIn("categories", template.get_deferred_fields())
+        self.assertEqual(template.category_count, 2)
+        self.assertContains(resp, "2 categories")
+    
+    def test_search_matches_title_and_module(self):
+        self.make_template("Robotics report", module_code="EG300")
+        self.make_template("Circuits exam", module_code="EG101")
+        
+        self.assertEqual(self.titles(self.client.get("/feedback/", {"q": "robot"})), ["Robotics report"])
+        self.assertEqual(self.titles(self.client.get("/feedback/", {"q": "eg101"})), ["Circuits exam"])
+    
+    def test_filters_combine(self):
+        self.make_template("A", module_code="EG300", component=1, degree_level="BEng")
+        self.make_template("B", module_code="EG300", component=2, degree_level="MEng/MSc")
+        self.make_template("C", module_code="EG101", component=2, degree_level="MEng/MSc")
+        
+        resp = self.client.get("/feedback/", {"module_code": "eg300", "component": "2", "degree_level": "MEng/MSc"})
+        self.assertEqual(self.titles(resp), ["B"])
+        self.assertEqual(self.titles(self.client.get("/feedback/", {"title": "c"})), ["C"])
+    
+    def test_module_code_filter_uses_index(self):
+        """Module codes match case-insensitively, through the index on UPPER(module_code)."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        tpl = self.make_template("A", module_code="eg300")
+        self.make_template("B", module_code="EG301")
+        tpl.refresh_from_db()
+        self.assertEqual(tpl.module_code, "eg300")
+        
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/feedback/", {"module_code": "Eg300"})
+        self.assertEqual(self.titles(resp), ["A"])
+        listing = next(q["sql"] for q in ctx.captured_queries if "UPPER" in q["sql"])
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {listing}")
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        self.assertIn("feedback_tpl_module_idx", plan)
+    
+    def test_invalid_filter_values_are_ignored(self):
+        self.make_template("A")
+        
+        resp = self.client.get("/feedback/", {"component": "x", "degree_level": "PhD", "after": "y"})
+        self.assertEqual(self.titles(resp), ["A"])
+        self.assertFalse(resp.context["filtering"])
+    
+    def test_no_matches_shows_search_empty_state(self):
+        self.make_template("A")
+        
+        resp = self.client.get("/feedback/", {"q": "nothing"})
+        self.assertContains(resp, "No templates match your search")
+
 class TemplateDeleteViewTests(TestCase):
     def test_post_delete_removes_template_and_returns_json(self):
         """POST /feedback/template/<pk>/delete/ removes the template and returns JSON."""
@@ -321,6 +418,253 @@ class TemplateUpdateViewTests(TestCase):
         template.refresh_from_db()
         self.assertEqual(template.component, 2)
         self.assertEqual(template.title, "Updated Title")
+    
+    def test_patch_writes_only_changed_fields(self):
+        """A PATCH with one changed field updates just that column (and derived ones)."""
+        import json
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        template = AssessmentTemplate.objects.create(
+            component=1, title="Original", module_code="KB5031", module_title="Module", assessment_title="Test", weighting=50, max_marks=10,
+            categories=[{"label": "Design", "max": 10, "type": "grade", "subdivision": "none"}]
+        )
+        url = reverse("template_update", kwargs={"pk": template.pk})
+        
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.patch(
+                url, data=json.dumps({"title": "Renamed", "module_code": "KB5031", "version": 1}),
+                content_type="application/json",
+            )
+        self.assertEqual(resp.json(), {"status": "saved", "updated": ["title"], "version": 2})
+        statements = [q["sql"] for q in ctx.captured_queries]
+        # Read outside the transaction, then claim the row at the version read
+        # (waiting for the write lock) before writing
+        self.assertTrue(statements[0].startswith("SELECT"), statements)
+        self.assertTrue(statements[1].startswith("SAVEPOINT"), statements)
+        self.assertRegex(statements[2], r'^UPDATE .* SET "version" = .*"version" WHERE .*"version" = 1\)$')
+        update = statements[3]
+        self.assertIn('"title"', update)
+        self.assertNotIn('"module_code"', update)
+        self.assertNotIn('"categories"', update)
+        
+        template.refresh_from_db()
+        self.assertEqual(template.title, "Renamed")
+        self.assertEqual(template.version, 2)
+    
+    def test_unchanged_payload_does_not_write(self):
+        import json
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        template = AssessmentTemplate.objects.create(
+            component=1, title="Same", module_code="KB5031", module_title="Module", assessment_title="Test", weighting=50, max_marks=10,
+            categories=[{"label": "Test", "max": 10}]
+        )
+        url = reverse("template_update", kwargs={"pk": template.pk})
+        
+        unchanged_patch = {"patch": {"categories": [{"op": "replace", "path": "/0/max", "value": 10}]}}
+        for payload in ({"title": "Same"}, unchanged_patch):
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.patch(url, data=json.dumps(payload), content_type="application/json")
+            self.assertEqual(resp.json()["updated"], [])
+            # A plain read: no transaction is opened, so no write lock is taken
+            self.assertEqual([q["sql"].split()[0] for q in ctx.captured_queries], ["SELECT"])
+        template.refresh_from_db()
+        self.assertEqual(template.version, 1)
+    
+    def test_rejects_non_object_payload(self):
+        template = AssessmentTemplate.objects.create(
+            component=1, title="Same", module_code="KB5031", module_title="Module", assessment_title="Test", weighting=50, max_marks=10,
+            categories=[{"label": "Test", "max": 10}]
+        )
+        url = reverse("template_update", kwargs={"pk": template.pk})
+        
+        self.assertEqual(self.client.patch(url, data="[1]", content_type="application/json").status_code, 400)
+        self.assertEqual(self.client.patch(url, data="{", content_type="application/json").status_code, 400)
+
+class TemplatePatchUpdateTests(TestCase):
+    """Tests for autosaving categories and charts as JSON Patch operations."""
+    
+    def setUp(self):
+        self.template = AssessmentTemplate.objects.create(
+            component=1, title="Patched", module_code="KB5031", module_title="Module",
+            assessment_title="Test", weighting=50, max_marks=30,
+            categories=[
+                {"label": "Design", "max": 20, "type": "grade", "subdivision": "none",
+                 "grade_band_descriptions": {"1st": "Excellent"}},
+                {"label": "Testing", "max": 10, "type": "numeric"},
+            ],
+        )
+        self.url = reverse("template_update", kwargs={"pk": self.template.pk})
+    
+    def patch(self, payload):
+        import json
+        return self.client.patch(self.url, data=json.dumps(payload), content_type="application/json")
+    
+    def test_patch_operations_update_stored_document(self):
+        resp = self.patch({"patch": {"categories": [
+            {"op": "replace", "path": "/0/grade_band_descriptions/1st", "value": "Outstanding"},
+        ]}})
+        self.assertEqual(resp.json(), {"status": "saved", "updated": ["categories"], "version": 2})
+        
+        self.template.refresh_from_db()
+        self.assertEqual(self.template.categories[0]["grade_band_descriptions"], {"1st": "Outstanding"})
+        self.assertEqual(self.template.categories[1]["label"], "Testing")
+    
+    def test_patches_that_break_validation_are_rejected(self):
+        resp = self.patch({"title": "Renamed", "patch": {"categories": [
+            {"op": "replace", "path": "/1/max", "value": 5000},
+        ]}})
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("max must be between 1 and 1000", resp.json()["error"])
+        
+        # Nothing in the update was written
+        self.template.refresh_from_db()
+        self.assertEqual(self.template.title, "Patched")
+        self.assertEqual(self.template.categories[1]["max"], 10)
+    
+    def test_failed_test_operation_returns_conflict(self):
+        resp = self.patch({"patch": {"categories": [
+            {"op": "test", "path": "/0/label", "value": "Stale"},
+            {"op": "replace", "path": "/0/label", "value": "Other"},
+        ]}})
+        self.assertEqual(resp.status_code, 409)
+    
+    def test_stale_version_is_rejected_without_writing(self):
+        """An edit made against an older version doesn't overwrite newer data."""
+        first = self.patch({"title": "From tab one", "version": 1})
+        self.assertEqual(first.json()["version"], 2)
+        
+        stale = self.patch({"title": "From tab two", "version": 1})
+        self.assertEqual(stale.status_code, 409)
+        self.assertEqual(stale.json()["conflict"], "version")
+        self.assertEqual(stale.json()["version"], 2)
+        self.template.refresh_from_db()
+        self.assertEqual(self.template.title, "From tab one")
+        
+        current = self.patch({"title": "From tab two", "version": 2})
+        self.assertEqual(current.json()["version"], 3)
+    
+    def test_unchanged_content_keeps_version(self):
+        resp = self.patch({"title": "Patched", "version": 1, "patch": {"categories": []}})
+        self.assertEqual(resp.json(), {"status": "saved", "updated": [], "version": 1})
+    
+    def test_edit_page_embeds_version(self):
+        self.patch({"title": "Renamed"})
+        resp = self.client.get(reverse("template_edit", kwargs={"pk": self.template.pk}))
+        self.assertContains(resp, "version: 2,")
+    
+    def test_invalid_patches_are_rejected(self):
+        self.assertEqual(self.patch({"patch": {"title": []}}).status_code, 400)
+        self.assertEqual(self.patch({"patch": {"charts": [{"op": "remove", "path": "/3"}]}}).status_code, 400)
+    
+    def test_patches_that_malform_the_documents_are_rejected(self):
+        """Patches leaving categories or charts anything but a list of objects give 400, not 500."""
+        for patch in (
+            {"categories": [{"op": "replace", "path": "", "value": "xx"}]},
+            {"categories": [{"op": "add", "path": "/-", "value": "str"}]},
+            {"categories": [{"op": "replace", "path": "/0/label", "value": 5}]},
+            {"charts": [{"op": "add", "path": "/-", "value": "str"}]},
+            {"charts": [{"op": "add", "path": "/-", "value": {"type": "radar", "title": 5, "categories": ["Design"]}}]},
+        ):
+            resp = self.patch({"version": 1, "patch": patch})
+            self.assertEqual(resp.status_code, 400, patch)
+            self.assertIn("error", resp.json())
+        
+        self.template.refresh_from_db()
+        self.assertEqual(self.template.version, 1)
+    
+    def test_versionless_save_applies_to_the_current_row(self):
+        """A save without a version that races another save is written over the newer row."""
+        from unittest import mock
+        
+        real_get = AssessmentTemplate.objects.get
+        
+        def get_then_save_elsewhere(*args, **kwargs):
+            tpl = real_get(*args, **kwargs)
+            if get.call_count == 1:
+                other = real_get(pk=tpl.pk)
+                other.categories = [{"label": "Elsewhere", "max": 10, "type": "numeric"}]
+                other.save()
+            return tpl
+        
+        with mock.patch.object(AssessmentTemplate.objects, "get", side_effect=get_then_save_elsewhere) as get:
+            resp = self.patch({"title": "Renamed"})
+        
+        self.assertEqual(resp.json(), {"status": "saved", "updated": ["title"], "version": 3})
+        self.template.refresh_from_db()
+        self.assertEqual(self.template.title, "Renamed")
+        self.assertEqual(self.template.version, 3)
+        self.assertEqual(self.template.categories[0]["label"], "Elsewhere")
+        self.assertEqual(self.template.category_count, 1)
+        self.assertEqual(self.template.content_hash, self.template.compute_content_hash())
+
+class AsyncEndpointTests(TestCase):
+    """Tests for the async variants the ASGI URLconf routes the JSON endpoints to."""
+    
+    def setUp(self):
+        self.template = AssessmentTemplate.objects.create(
+            component=1, title="Async", module_code="KB5031", module_title="Module",
+            assessment_title="Test", weighting=50, max_marks=30,
+            categories=[{"label": "Design", "max": 20, "type": "grade", "subdivision": "none"}],
+        )
+        self.url = reverse("template_update", kwargs={"pk": self.template.pk})
+    
+    def apatch(self, payload):
+        import json
+        from asgiref.sync import async_to_sync
+        return async_to_sync(self.async_client.patch)(self.url, data=json.dumps(payload), content_type="application/json")
+    
+    def test_asgi_requests_use_async_variants_and_wsgi_the_sync_views(self):
+        from asgiref.sync import async_to_sync
+        from feedback import views
+        
+        preview = {"max_marks": "30", "subdivision": "none"}
+        asgi = async_to_sync(self.async_client.get)(reverse("grade_bands_preview"), preview)
+        wsgi = self.client.get(reverse("grade_bands_preview"), preview)
+        self.assertEqual(asgi.resolver_match.func, views.grade_bands_preview_async)
+        self.assertEqual(wsgi.resolver_match.func, views.grade_bands_preview)
+        self.assertEqual(asgi.json(), wsgi.json())
+        # Everything without an async variant is served by the sync view
+        home = async_to_sync(self.async_client.get)(reverse("home"))
+        self.assertEqual(home.resolver_match.func, views.home)
+    
+    def test_async_autosave_applies_patches_and_rejects_stale_versions(self):
+        from feedback import views
+        
+        resp = self.apatch({"version": 1, "title": "Renamed", "patch": {"categories": [
+            {"op": "replace", "path": "/0/max", "value": 25},
+        ]}})
+        self.assertEqual(resp.resolver_match.func, views.template_update_async)
+        self.assertEqual(resp.json(), {"status": "saved", "updated": ["title", "categories"], "version": 2})
+        
+        stale = self.apatch({"version": 1, "title": "Stale"})
+        self.assertEqual(stale.status_code, 409)
+        self.assertEqual(self.apatch({"version": 2, "patch": {"categories": [
+            {"op": "replace", "path": "", "value": "xx"},
+        ]}}).status_code, 400)
+        
+        self.template.refresh_from_db()
+        self.assertEqual((self.template.title, self.template.categories[0]["max"]), ("Renamed", 25))
+        self.assertEqual(self.template.version, 2)
+    
+    def test_async_autosave_of_unchanged_content_doesnt_write(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.apatch({"version": 1, "title": "Async"})
+        self.assertEqual(resp.json(), {"status": "saved", "updated": [], "version": 1})
+        self.assertEqual([q["sql"].split()[0] for q in ctx.captured_queries], ["SELECT"])
+    
+    def test_async_delete(self):
+        from asgiref.sync import async_to_sync
+        
+        url = reverse("template_delete", kwargs={"pk": self.template.pk})
+        self.assertEqual(async_to_sync(self.async_client.post)(url).json(), {"status": "deleted"})
+        self.assertEqual(async_to_sync(self.async_client.post)(url).status_code, 404)
+        self.assertFalse(AssessmentTemplate.objects.exists())
 
 class TemplateBuilderViewTests(TestCase):
     def test_get_new_template_creates_template_and_redirects_to_edit(self):
@@ -396,14 +740,13 @@ class GradeBandsPreviewTests(TestCase):
         self.assertIn("2:1", html)
         self.assertIn("Zero Fail", html)
     
-    def test_grade_bands_preview_returns_empty_for_invalid_marks(self):
-        """Preview endpoint returns empty HTML for invalid marks."""
+    def test_grade_bands_preview_rejects_out_of_range_marks(self):
+        """Preview endpoint rejects marks outside 1-1000, like template validation."""
         url = reverse("grade_bands_preview")
-        res = self.client.get(url, {"max_marks": "0", "subdivision": "none"})
-        
-        import json
-        data = json.loads(res.content)
-        self.assertEqual(data["html"], "")
+        for max_marks in ("0", "-5", "1001", "10000000000000000000000003"):
+            res = self.client.get(url, {"max_marks": max_marks, "subdivision": "none"})
+            self.assertEqual(res.status_code, 400, max_marks)
+        self.assertEqual(self.client.get(url, {"max_marks": "1000", "subdivision": "none"}).status_code, 200)
     
     def test_grade_bands_preview_returns_empty_for_missing_params(self):
         """Preview endpoint returns empty HTML when params are missing."""
@@ -415,6 +758,133 @@ class GradeBandsPreviewTests(TestCase):
         self.assertEqual(data["html"], "")
 
 
+class GradeBandsDataTests(TestCase):
+    def test_returns_band_data_grouped_by_main_grade(self):
+        """GET /feedback/grade-bands-data/ returns band data for the client to render."""
+        resp = self.client.get(reverse("grade_bands_data"), {"max_marks": "30", "subdivision": "high_low"})
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(data["scheme"], "uk_ug")
+        self.assertEqual([g["main_grade"] for g in data["groups"]], ["1st", "2:1", "2:2", "3rd", "Fail"])
+        self.assertEqual(data["groups"][0]["bands"][0], {"grade": "Max 1st", "marks": 30})
+    
+    def test_versioned_requests_are_cached_as_immutable(self):
+        """Only URLs carrying the current band data version are marked immutable."""
+        from feedback.utils import grade_band_data_version
+        
+        params = {"max_marks": "40", "subdivision": "none", "degree_level": "MEng/MSc"}
+        resp = self.client.get(reverse("grade_bands_data"), {**params, "v": grade_band_data_version()})
+        self.assertIn("immutable", resp["Cache-Control"])
+        self.assertIn("max-age=31536000", resp["Cache-Control"])
+        self.assertEqual(resp.json()["groups"][0]["main_grade"], "Dist")
+        
+        resp = self.client.get(reverse("grade_bands_data"), {**params, "v": "outdated"})
+        self.assertNotIn("immutable", resp["Cache-Control"])
+    
+    def test_invalid_params(self):
+        """Missing params give no groups and a non-numeric max is rejected."""
+        self.assertEqual(self.client.get(reverse("grade_bands_data")).json()["groups"], [])
+        resp = self.client.get(reverse("grade_bands_data"), {"max_marks": "lots", "subdivision": "none"})
+        self.assertEqual(resp.status_code, 400)
+    
+    def test_out_of_range_marks_are_rejected(self):
+        """Only max_marks the band table covers (1-1000) are solved."""
+        for max_marks in ("0", "1001", "10000000000000000000000003"):
+            resp = self.client.get(reverse("grade_bands_data"), {"max_marks": max_marks, "subdivision": "none"})
+            self.assertEqual(resp.status_code, 400, max_marks)
+            self.assertIn("1 to 1000", resp.json()["error"])
+
+class GradeBandsBatchTests(TestCase):
+    def test_batch_returns_every_requested_preview(self):
+        """GET /feedback/grade-bands-data/batch/ returns all previews in one response."""
+        resp = self.client.get(
+            reverse("grade_bands_data_batch"),
+            {"items": "30:high_low,20:none", "degree_level": "MEng/MSc"}
+        )
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(data["scheme"], "uk_level7")
+        self.assertEqual(set(data["previews"]), {"30:high_low", "20:none"})
+        self.assertEqual(data["previews"]["20:none"][0]["main_grade"], "Dist")
+    
+    def test_batch_rejects_malformed_or_oversized_requests(self):
+        """Items must be max:subdivision pairs and the batch size is capped."""
+        url = reverse("grade_bands_data_batch")
+        self.assertEqual(self.client.get(url, {"items": "thirty:none"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"items": "30:none,1001:none"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"items": "0:none"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"items": ",".join(["10:none"] * 201)}).status_code, 400)
+    
+    def test_edit_page_embeds_initial_previews(self):
+        """template_edit embeds each grade category's preview so no fetches are needed on load."""
+        import json
+        template = AssessmentTemplate.objects.create(
+            component=1,
+            title="Embedded",
+            module_code="CS400",
+            module_title="Previews",
+            assessment_title="CW1",
+            weighting=50,
+            max_marks=50,
+            categories=[
+                {"label": "Design", "max": 30, "type": "grade", "subdivision": "high_low"},
+                {"label": "Testing", "max": 30, "type": "grade", "subdivision": "high_low"},
+                {"label": "Report", "max": 20, "type": "numeric"},
+            ]
+        )
+        resp = self.client.get(reverse("template_edit", kwargs={"pk": template.pk}))
+        previews = json.loads(resp.context["band_previews_json"])
+        self.assertEqual(list(previews), ["30:high_low"])
+        self.assertEqual(previews["30:high_low"][0]["bands"][0], {"grade": "Max 1st", "marks": 30})
+        self.assertContains(resp, "bandPreviews")
+
+class GroupBandsByMainGradeTests(TestCase):
+    def test_groups_follow_band_main_grades(self):
+        """Bands are grouped under their main grade in display order."""
+        from feedback.utils import calculate_grade_bands
+        from feedback.utils import group_bands_by_main_grade
+        
+        grouped = group_bands_by_main_grade(calculate_grade_bands(30, "high_low"))
+        self.assertEqual(list(grouped), ["1st", "2:1", "2:2", "3rd", "Fail"])
+        self.assertEqual([b["grade"] for b in grouped["1st"]], ["Max 1st", "High 1st", "Low 1st"])
+        
+        # Level 7 groups under Dist/Merit/Pass/Fail and leaves out the 3rd bands
+        grouped = group_bands_by_main_grade(calculate_grade_bands(30, "high_low", degree_level="MEng/MSc"))
+        self.assertEqual(list(grouped), ["Dist", "Merit", "Pass", "Fail"])
+        self.assertEqual(len(grouped["Fail"]), 4)
+
+class GradeBandCacheStatsViewTests(TestCase):
+    def test_cache_stats_returns_counters_as_json(self):
+        """GET /feedback/stats/grade-band-cache/ reports the grade band cache counters."""
+        from feedback.utils import clear_grade_band_cache
+        clear_grade_band_cache()
+        
+        self.client.get(reverse("grade_bands_preview"), {"max_marks": 20, "subdivision": "none"})
+        self.client.get(reverse("grade_bands_preview"), {"max_marks": 20, "subdivision": "none"})
+        
+        resp = self.client.get(reverse("grade_band_cache_stats"))
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(data["hits"], 1)
+        self.assertEqual(data["misses"], 1)
+        self.assertIn("evictions", data)
+
+class SubdivisionMatrixViewTests(TestCase):
+    def test_subdivision_matrix_returns_cacheable_ranges(self):
+        """GET /feedback/subdivision-matrix/ returns valid ranges with long-lived caching headers."""
+        resp = self.client.get(reverse("subdivision_matrix"))
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(data["max_marks"], 1000)
+        self.assertEqual(data["degree_levels"], {"BEng": "uk_ug", "MEng/MSc": "uk_level7"})
+        self.assertEqual(data["valid"]["uk_ug"]["none"], [[9, 1000]])
+        self.assertIn("bands_version", data)
+        self.assertIn("max-age=86400", resp["Cache-Control"])
+        
+        # Revalidation with the ETag is answered without a body
+        resp = self.client.get(reverse("subdivision_matrix"), HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(resp.status_code, 304)
+
 class TemplateSeparateViewsTest(TestCase):
     """Test that staff can view rubric and feedback sheet separately"""
     
@@ -591,6 +1061,188 @@ class TemplateSeparateViewsTest(TestCase):
         self.assertEqual(url, f"/feedback/template/{template.pk}/feedback-sheet/")
 
 
+class RubricPageCacheTests(TestCase):
+    """The rendered rubric is cached per template content and dropped on save/delete."""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.template = AssessmentTemplate.objects.create(
+            component=1,
+            title="Cached Rubric",
+            module_code="CS200",
+            module_title="Caching",
+            assessment_title="CW1",
+            weighting=50,
+            max_marks=30,
+            categories=[{"label": "Design", "max": 30, "type": "grade", "subdivision": "high_low"}]
+        )
+        self.url = reverse("template_rubric", kwargs={"pk": self.template.pk})
+    
+    def test_second_request_is_served_from_cache(self):
+        """A repeat GET returns the same page without rendering it again."""
+        first = self.client.get(self.url)
+        self.assertTemplateUsed(first, "feedback/template_rubric.html")
+        
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertTemplateNotUsed(second, "feedback/template_rubric.html")
+        self.assertEqual(second.content, first.content)
+    
+    def test_save_invalidates_cached_rubric(self):
+        """Saving the template through autosave shows the new content straight away."""
+        from django.core.cache import cache
+        from feedback.page_cache import rubric_cache_key
+        
+        self.client.get(self.url)
+        old_key = rubric_cache_key(self.template.pk, self.template.content_hash)
+        self.assertIsNotNone(cache.get(old_key))
+        
+        import json
+        self.client.post(
+            reverse("template_update", kwargs={"pk": self.template.pk}),
+            data=json.dumps({"title": "Renamed Rubric"}),
+            content_type="application/json"
+        )
+        self.assertIsNone(cache.get(old_key))
+        self.assertContains(self.client.get(self.url), "Renamed Rubric")
+    
+    def test_delete_invalidates_cached_rubric(self):
+        """Deleting the template drops its cached rubric."""
+        from django.core.cache import cache
+        from feedback.page_cache import rubric_cache_key
+        
+        self.client.get(self.url)
+        key = rubric_cache_key(self.template.pk, self.template.content_hash)
+        self.template.delete()
+        self.assertIsNone(cache.get(key))
+
+class ConditionalGetTests(TestCase):
+    """Rubric, feedback sheet and edit pages answer conditional GETs with 304s."""
+    
+    PAGES = ("template_rubric", "template_feedback_sheet", "template_edit")
+    
+    def setUp(self):
+        self.template = AssessmentTemplate.objects.create(
+            component=1,
+            title="Conditional",
+            module_code="CS300",
+            module_title="HTTP",
+            assessment_title="CW1",
+            weighting=50,
+            max_marks=30,
+            categories=[{"label": "Design", "max": 30, "type": "grade", "subdivision": "none"}]
+        )
+    
+    def test_pages_send_validators_and_honour_if_none_match(self):
+        """Each page sends a strong ETag and Last-Modified and returns 304 for a matching ETag."""
+        for name in self.PAGES:
+            url = reverse(name, kwargs={"pk": self.template.pk})
+            if name == "template_edit":
+                # Sets the CSRF cookie the edit page's ETag depends on
+                self.client.get(url)
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200)
+            self.assertFalse(resp["ETag"].startswith("W/"))
+            if name != "template_edit":
+                self.assertIn("Last-Modified", resp)
+            
+            again = self.client.get(url, HTTP_IF_NONE_MATCH=resp["ETag"])
+            self.assertEqual(again.status_code, 304, name)
+            self.assertEqual(again.content, b"")
+    
+    def test_edit_page_revalidates_only_for_the_same_csrf_cookie(self):
+        """The edit page's embedded CSRF token must match the client's cookie."""
+        from django.conf import settings
+        from django.test import Client
+        
+        url = reverse("template_edit", kwargs={"pk": self.template.pk})
+        first = self.client.get(url)
+        self.assertNotIn("ETag", first)
+        self.assertIn("Cookie", first["Vary"])
+        resp = self.client.get(url)
+        etag = resp["ETag"]
+        
+        again = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, 304)
+        self.assertIn("Cookie", again["Vary"])
+        
+        # A client without the cookie gets the page, and a cookie, again
+        fresh = Client()
+        no_cookie = fresh.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(no_cookie.status_code, 200)
+        self.assertIn(settings.CSRF_COOKIE_NAME, no_cookie.cookies)
+        self.assertNotIn("ETag", no_cookie)
+        
+        # As does one with a different cookie
+        other_cookie = fresh.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(other_cookie.status_code, 200)
+        self.assertNotEqual(other_cookie["ETag"], etag)
+    
+    def test_if_modified_since_returns_304_until_saved(self):
+        """If-Modified-Since is honoured and a save makes the page fresh again."""
+        url = reverse("template_rubric", kwargs={"pk": self.template.pk})
+        resp = self.client.get(url)
+        last_modified = resp["Last-Modified"]
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+    
+    def test_autosave_changes_etag(self):
+        """An autosave through template_update changes the ETag so clients refetch."""
+        import json
+        url = reverse("template_rubric", kwargs={"pk": self.template.pk})
+        etag = self.client.get(url)["ETag"]
+        
+        self.client.post(
+            reverse("template_update", kwargs={"pk": self.template.pk}),
+            data=json.dumps({"title": "Changed"}),
+            content_type="application/json"
+        )
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp["ETag"], etag)
+        self.assertContains(resp, "Changed")
+    
+    def test_deploys_change_etag_and_last_modified(self):
+        """A new release's pages aren't answered with 304s for the old release's."""
+        from django.test import override_settings
+        from django.utils.http import parse_http_date
+        from feedback.page_cache import render_modified
+        
+        url = reverse("template_rubric", kwargs={"pk": self.template.pk})
+        resp = self.client.get(url)
+        with override_settings(FEEDBACK_DEPLOY_ID="next-release"):
+            again = self.client.get(url, HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(again.status_code, 200)
+        self.assertNotEqual(again["ETag"], resp["ETag"])
+        
+        # Code newer than the template dates the page
+        self.template.refresh_from_db()
+        self.assertGreaterEqual(
+            parse_http_date(resp["Last-Modified"]),
+            int(max(self.template.updated_at, render_modified()).timestamp()),
+        )
+
+class CompiledTemplateViewTests(TestCase):
+    def test_views_compile_rows_without_stored_data(self):
+        """Rows saved before display data existed still render their grade bands."""
+        template = AssessmentTemplate.objects.create(
+            component=1,
+            title="Legacy",
+            module_code="CS100",
+            module_title="Legacy Module",
+            assessment_title="CW1",
+            weighting=50,
+            max_marks=30,
+            categories=[{"label": "Design", "max": 30, "type": "grade", "subdivision": "none"}]
+        )
+        AssessmentTemplate.objects.filter(pk=template.pk).update(compiled={}, content_hash="")
+        
+        rubric = self.client.get(reverse("template_rubric", kwargs={"pk": template.pk}))
+        self.assertContains(rubric, "Max 1st")
+        sheet = self.client.get(reverse("template_feedback_sheet", kwargs={"pk": template.pk}))
+        self.assertEqual(sheet.context["total_marks"], 30)
+        self.assertIsNone(sheet.context["marks_mismatch"])
+
 class ChartViewTests(TestCase):
     """Tests for chart configuration in template views"""
     
@@ -0,0 +1,181 @@
+"""Per-request timing: total, database, template rendering and cache.
+
+`feedback.middleware.RequestTimingMiddleware` starts a `RequestTiming` for
+each request and keeps it in a context variable, which follows the request
+into sync_to_async threads. While it's set:
+
+- every query is timed by a wrapper installed on each new database
+  connection;
+- top-level template renders are timed by wrapping the Django template
+  backend's render;
+- cache reads through `TimedLocMemCache` (the configured cache backend)
+  count as hits or misses.
+
+`install()` sets up the query and template hooks and is called from the
+app's ready(). Queries are only timed when the header or the slow request
+log is on, and templates only when the header is on, so a deployment with
+both off runs unhooked.
+"""
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+
+_current = ContextVar("feedback_request_timing", default=None)
+
+_MISSING = object()
+
+DEFAULT_SLOW_REQUEST_MS = 500
+
+
+def server_timing_enabled():
+    return getattr(settings, "FEEDBACK_SERVER_TIMING", False)
+
+
+def slow_request_threshold():
+    """Milliseconds above which requests are logged, or None if they aren't."""
+    return getattr(settings, "FEEDBACK_SLOW_REQUEST_MS", DEFAULT_SLOW_REQUEST_MS)
+
+
+class RequestTiming:
+    """Timings gathered while handling one request (times in seconds)."""
+
+    __slots__ = (
+        "start", "db_time", "queries", "template_time", "template_depth",
+        "cache_time", "cache_hits", "cache_misses",
+    )
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db_time = 0.0
+        self.queries = 0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.cache_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def server_timing(self, total):
+        """Value of the Server-Timing header."""
+        return ", ".join([
+            f"total;dur={total * 1000:.1f}",
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f"template;dur={self.template_time * 1000:.1f}",
+            f'cache;dur={self.cache_time * 1000:.1f};desc="{self.cache_hits} hits / {self.cache_misses} misses"',
+        ])
+
+    def as_dict(self, total):
+        return {
+            "total_ms": round(total * 1000, 1),
+            "db_ms": round(self.db_time * 1000, 1),
+            "queries": self.queries,
+            # None when template rendering isn't being timed
+            "template_ms": round(self.template_time * 1000, 1) if templates_timed() else None,
+            "cache_ms": round(self.cache_time * 1000, 1),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+
+def start_timing():
+    """Start timing a request; returns (timing, token for `stop_timing`)."""
+    timing = RequestTiming()
+    return timing, _current.set(timing)
+
+
+def stop_timing(token):
+    _current.reset(token)
+
+
+def current_timing():
+    return _current.get()
+
+
+def time_query(execute, sql, params, many, context):
+    """Database execute wrapper adding each query to the current request's timing."""
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.db_time += time.perf_counter() - start
+        timing.queries += 1
+
+
+def _install_query_timer(sender, connection, **kwargs):
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+def _timed_render(render):
+    @wraps(render)
+    def wrapper(self, context=None, request=None):
+        timing = _current.get()
+        if timing is None:
+            return render(self, context, request)
+        # Templates rendered while rendering another are already counted
+        timing.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            timing.template_depth -= 1
+            if timing.template_depth == 0:
+                timing.template_time += time.perf_counter() - start
+    wrapper._feedback_timed = True
+    return wrapper
+
+
+def templates_timed():
+    from django.template.backends.django import Template
+
+    return getattr(Template.render, "_feedback_timed", False)
+
+
+def install():
+    """
+    Time queries on every new connection, if the Server-Timing header or the
+    slow request log is on, and every template render, if the header is on.
+    """
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+    from django.template.backends.django import Template
+
+    if not server_timing_enabled() and slow_request_threshold() is None:
+        return
+
+    connection_created.connect(_install_query_timer, dispatch_uid="feedback.timing.query_timer")
+    # Connections opened before the signal was connected
+    for connection in connections.all(initialized_only=True):
+        _install_query_timer(None, connection)
+
+    if server_timing_enabled() and not templates_timed():
+        Template.render = _timed_render(Template.render)
+
+
+class TimedLocMemCache(LocMemCache):
+    """
+    Local-memory cache that counts hits and misses in the request timing.
+
+    `get_many` and `get_or_set` go through `get`, so they're counted too.
+    """
+
+    def get(self, key, default=None, version=None):
+        timing = _current.get()
+        if timing is None:
+            return super().get(key, default, version)
+        start = time.perf_counter()
+        value = super().get(key, _MISSING, version)
+        timing.cache_time += time.perf_counter() - start
+        if value is _MISSING:
+            timing.cache_misses += 1
+            return default
+        timing.cache_hits += 1
+        return value
@@ -3,11 +3,24 @@ from . import views
 
 urlpatterns = [
     path("", views.home, name="home"),
+    path("search/", views.template_search, name="template_search"),
     path("template/new/", views.template_new, name="template_new"),
     path("template/<int:pk>/rubric/", views.template_rubric, name="template_rubric"),
     path("template/<int:pk>/feedback-sheet/", views.template_feedback_sheet, name="template_feedback_sheet"),
     path("template/<int:pk>/edit/", views.template_edit, name="template_edit"),
     path("template/<int:pk>/update/", views.template_update, name="template_update"),
+    path("template/<int:pk>/flush/", views.template_flush, name="template_flush"),
     path("template/<int:pk>/delete/", views.template_delete, name="template_delete"),
     path("grade-bands-preview/", views.grade_bands_preview, name="grade_bands_preview"),
+    path("grade-bands-data/", views.grade_bands_data, name="grade_bands_data"),
+    path("grade-bands-data/batch/", views.grade_bands_data_batch, name="grade_bands_data_batch"),
+    path("subdivision-matrix/", views.subdivision_matrix, name="subdivision_matrix"),
+    path("stats/grade-band-cache/", views.grade_band_cache_stats, name="grade_band_cache_stats"),
+]
+
+# Served instead of the views above to ASGI requests (see core.urls_asgi)
+async_urlpatterns = [
+    path("template/<int:pk>/update/", views.template_update_async, name="template_update"),
+    path("template/<int:pk>/delete/", views.template_delete_async, name="template_delete"),
+    path("grade-bands-preview/", views.grade_bands_preview_async, name="grade_bands_preview"),
 ]
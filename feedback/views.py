@@ -1,15 +1,158 @@
 from django.shortcuts import render, redirect
-from django.http import JsonResponse
+from django.core.cache import cache
+from django.db.models import Value
+from django.db.models.functions import Upper
+from django.http import JsonResponse, HttpResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, etag
+from django.views.decorators.vary import vary_on_cookie
 from feedback.models import AssessmentTemplate
-from feedback.utils import calculate_grade_bands, validate_subdivision
-
+from feedback.grading_schemes import scheme_for_degree_level
+from feedback.autosave import AutosaveConflict, autosave_buffer
+from feedback.compiled import compiled_data
+from feedback.json_patch import JsonPatchConflict, JsonPatchError, apply_patch
+from feedback.page_cache import PAGE_CACHE_TIMEOUT, render_modified, render_version, rubric_cache_key
+from feedback.search import SEARCH_RESULT_LIMIT, filter_templates, search_templates
+from feedback.utils import (
+    GRADE_BAND_TABLE_MAX_MARKS,
+    get_grade_bands,
+    grade_band_cache_info,
+    grade_band_data_version,
+    group_bands_by_main_grade,
+    subdivision_validity_matrix,
+)
+
+from functools import lru_cache, wraps
+from urllib.parse import urlencode
+import hashlib
 import random
 
+def _template_validators(request, pk):
+    """Version, content hash and save time of a template, fetched once per request."""
+    validators = getattr(request, "_template_validators", None)
+    if validators is None or validators[0] != pk:
+        row = AssessmentTemplate.objects.filter(pk=pk).values("version", "content_hash", "updated_at").first()
+        validators = (pk, row)
+        request._template_validators = validators
+    return validators[1]
+
+def _template_etag(request, pk):
+    row = _template_validators(request, pk)
+    if row is None:
+        return None
+    return f"{row['version']}-{row['content_hash'][:16] or 'legacy'}-{render_version()}"
+
+def _template_last_modified(request, pk):
+    row = _template_validators(request, pk)
+    return max(row["updated_at"], render_modified()) if row else None
+
+# Pages that only change when the template (or the code rendering it, see
+# `render_version`) changes answer conditional GETs
+template_conditional = condition(etag_func=_template_etag, last_modified_func=_template_last_modified)
+
+def _edit_page_etag(request, pk):
+    """
+    ETag of the edit page, which embeds a CSRF token for the CSRF cookie.
+    
+    The cookie is part of the ETag, so a page cached under another cookie
+    is sent again. Without a cookie there's no ETag: the full response is
+    what sets the cookie its token needs.
+    """
+    from django.conf import settings
+    
+    csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME)
+    etag = _template_etag(request, pk)
+    if not csrf_cookie or etag is None:
+        return None
+    return f"{etag}-{hashlib.sha256(csrf_cookie.encode()).hexdigest()[:16]}"
+
+# No Last-Modified: If-Modified-Since can't tell the CSRF cookies apart
+edit_page_conditional = condition(etag_func=_edit_page_etag)
+
+def read_your_writes(view):
+    """Write buffered autosaves of the template before the view reads it."""
+    @wraps(view)
+    def wrapper(request, pk, *args, **kwargs):
+        if autosave_buffer.has_pending(pk):
+            autosave_buffer.flush(pk)
+        return view(request, pk, *args, **kwargs)
+    return wrapper
+
+# Templates listed per home page
+HOME_PAGE_SIZE = 25
+
+# Columns the home listing shows; the categories/charts JSON is never loaded
+HOME_LIST_FIELDS = ("id", "title", "module_code", "component", "assessment_title", "category_count")
+
+def _int_param(request, name):
+    try:
+        return int(request.GET[name])
+    except (KeyError, ValueError):
+        return None
+
 def home(request):
-    templates = AssessmentTemplate.objects.all().order_by('-id')
+    """
+    List templates newest first, with search, filters and keyset pagination.
+    
+    Pages are addressed by id (`?after=<id>` for older, `?before=<id>` for
+    newer) rather than offset, so every page is an index range scan however
+    many templates there are.
+    """
+    filters = {
+        "q": request.GET.get("q", "").strip(),
+        "module_code": request.GET.get("module_code", "").strip(),
+        "title": request.GET.get("title", "").strip(),
+        "component": _int_param(request, "component"),
+        "degree_level": request.GET.get("degree_level", ""),
+    }
+    
+    templates = AssessmentTemplate.objects.only(*HOME_LIST_FIELDS)
+    if filters["q"]:
+        templates = filter_templates(templates, filters["q"])
+    if filters["module_code"]:
+        # Matches the expression index on UPPER(module_code)
+        templates = templates.alias(module_code_upper=Upper("module_code")).filter(
+            module_code_upper=Upper(Value(filters["module_code"])),
+        )
+    if filters["title"]:
+        templates = templates.filter(title__icontains=filters["title"])
+    if filters["component"] is not None:
+        templates = templates.filter(component=filters["component"])
+    degree_levels = [value for value, _ in AssessmentTemplate._meta.get_field("degree_level").choices]
+    if filters["degree_level"] in degree_levels:
+        templates = templates.filter(degree_level=filters["degree_level"])
+    else:
+        filters["degree_level"] = ""
+    
+    # Fetch one extra row to know whether there is another page
+    after = _int_param(request, "after")
+    before = _int_param(request, "before")
+    if before is not None:
+        page = list(templates.filter(id__gt=before).order_by("id")[:HOME_PAGE_SIZE + 1])
+        has_newer = len(page) > HOME_PAGE_SIZE
+        page = page[:HOME_PAGE_SIZE][::-1]
+        has_older = True
+    else:
+        if after is not None:
+            templates = templates.filter(id__lt=after)
+        page = list(templates.order_by("-id")[:HOME_PAGE_SIZE + 1])
+        has_older = len(page) > HOME_PAGE_SIZE
+        page = page[:HOME_PAGE_SIZE]
+        has_newer = after is not None
+    
+    # Query string of the active filters, for pagination links
+    filter_query = urlencode({name: value for name, value in filters.items() if value not in ("", None)})
+    
     return render(request, "feedback/home.html", {
         "page_title": "Feedback",
-        "templates": templates
+        "templates": page,
+        "filters": filters,
+        "filtering": bool(filter_query),
+        "filter_query": filter_query,
+        "degree_levels": degree_levels,
+        "newer_cursor": page[0].id if page and has_newer else None,
+        "older_cursor": page[-1].id if page and has_older else None,
     })
 
 def template_new(request):
@@ -26,375 +169,296 @@ def template_new(request):
     )
     return redirect("template_edit", pk=tpl.id)
 
+@read_your_writes
+@vary_on_cookie
+@edit_page_conditional
 def template_edit(request, pk):
     """Edit page with auto-save functionality."""
     import json
     tpl = AssessmentTemplate.objects.get(pk=pk)
+    
+    # Embed the initial grade band previews so the editor opens without
+    # fetching one preview per category
+    band_previews = {}
+    for cat in tpl.categories or []:
+        if cat.get("type") == "grade" and cat.get("subdivision"):
+            try:
+                max_marks = int(cat.get("max"))
+            except (TypeError, ValueError):
+                continue
+            key = f"{max_marks}:{cat['subdivision']}"
+            if key not in band_previews:
+                band_previews[key] = _band_groups(max_marks, cat["subdivision"], tpl.degree_level)
+    
     return render(request, "feedback/template_edit.html", {
         "template": tpl,
-        "categories_json": json.dumps(tpl.categories if tpl.categories else [])
+        "categories_json": json.dumps(tpl.categories if tpl.categories else []),
+        "band_previews_json": json.dumps(band_previews)
     })
 
+# Fields the editor autosaves
+AUTOSAVE_FIELDS = (
+    "title", "module_code", "module_title", "assessment_title", "weighting",
+    "max_marks", "component", "categories", "charts", "degree_level",
+)
+
+# JSON documents the editor can send as JSON Patch operations
+PATCHABLE_FIELDS = ("categories", "charts")
+
 def template_update(request, pk):
-    """AJAX endpoint for auto-saving template updates."""
-    import json
-    from django.http import JsonResponse
+    """
+    AJAX endpoint for auto-saving template updates.
     
-    if request.method != "POST":
-        return JsonResponse({"error": "POST required"}, status=405)
+    Accepts PATCH (or POST) with a JSON object of just the fields that
+    changed. `categories` and `charts` can instead be sent as JSON Patch
+    operations under "patch", e.g. {"patch": {"categories": [...]}}; those
+    are applied to the stored documents and the result must pass
+    `AssessmentTemplate.clean`. Only the columns whose values actually
+    differ are written, so editing the title doesn't rewrite the categories
+    JSON, and an update that leaves the content hash unchanged writes
+    nothing.
     
-    tpl = AssessmentTemplate.objects.get(pk=pk)
-    data = json.loads(request.body)
-    
-    # Update fields if provided
-    if "title" in data:
-        tpl.title = data["title"]
-    if "module_code" in data:
-        tpl.module_code = data["module_code"]
-    if "module_title" in data:
-        tpl.module_title = data["module_title"]
-    if "assessment_title" in data:
-        tpl.assessment_title = data["assessment_title"]
-    if "weighting" in data:
-        tpl.weighting = data["weighting"]
-    if "max_marks" in data:
-        tpl.max_marks = data["max_marks"]
-    if "component" in data:
-        tpl.component = data["component"]
-    if "categories" in data:
-        tpl.categories = data["categories"]
-    if "charts" in data:
-        tpl.charts = data["charts"]
-    # Persist degree level if provided by autosave
-    if "degree_level" in data:
-        tpl.degree_level = data["degree_level"]
+    "version" is the template version the edit was made against; if the
+    template has been saved since (another tab, say), the update is
+    rejected with 409 rather than overwriting the newer data. Responses
+    carry the current version.
     
-    try:
-        tpl.save()
-        return JsonResponse({"status": "saved"})
-    except Exception as e:
-        return JsonResponse({"error": str(e)}, status=400)
-
-def grade_bands_preview(request):
-    """AJAX endpoint to calculate grade bands for preview."""
-    from django.http import JsonResponse
-    from django.template.loader import render_to_string
+    With write-behind enabled the changes are buffered and written by the
+    next flush (see `feedback.autosave`). ASGI requests are served by
+    `template_update_async` instead.
+    """
+    import json
+    
+    if request.method not in ("POST", "PATCH"):
+        return JsonResponse({"error": "POST or PATCH required"}, status=405)
     
     try:
-        max_marks = int(request.GET.get('max_marks', 0))
-        subdivision = request.GET.get('subdivision', '')
-        degree_level = request.GET.get('degree_level', None)
-        
-        if max_marks < 1 or not subdivision:
-            return JsonResponse({"html": ""})
-        
-        bands = calculate_grade_bands(max_marks, subdivision, degree_level=degree_level)
-        grouped_bands = _group_bands_by_main_grade(bands)
-        
-        # Render HTML template
-        html = render_to_string('feedback/partials/grade_bands_grid.html', {
-            'grouped_bands': grouped_bands,
-            'descriptions': {},  # Empty for preview, will be filled by JS from existing data
-            'show_textarea': True
-        })
-        
-        return JsonResponse({"html": html})
-    except Exception as e:
-        return JsonResponse({"error": str(e)}, status=400)
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    return _autosave(pk, data)
 
-def template_rubric(request, pk):
-    """View rubric for pasting into assessment briefs"""
-    tpl = AssessmentTemplate.objects.get(pk=pk)
-    
-    # Calculate grade bands for each category
-    categories_with_bands = []
-    total_category_marks = 0
-    for cat in tpl.categories:
-        cat_data = cat.copy()
-        total_category_marks += cat.get("max", 0)
-        
-        if cat.get("type") == "grade" and cat.get("subdivision"):
-            bands = calculate_grade_bands(cat["max"], cat["subdivision"], degree_level=tpl.degree_level)
-            cat_data["bands"] = bands
-            
-            # Group bands by main grade for display
-            grouped_bands = _group_bands_by_main_grade(bands)
-            cat_data["grouped_bands"] = grouped_bands
-            
-            # Attach descriptions (one per main grade)
-            descriptions = cat.get("grade_band_descriptions", {})
-            cat_data["grade_descriptions"] = descriptions
-            
-        categories_with_bands.append(cat_data)
+async def template_update_async(request, pk):
+    """
+    Async variant of `template_update`, served to ASGI requests.
     
-    # Check if marks match
-    marks_mismatch = None
-    if tpl.max_marks and total_category_marks != tpl.max_marks:
-        marks_mismatch = {
-            'total': total_category_marks,
-            'max_marks': tpl.max_marks
-        }
-    
-    return render(request, "feedback/template_rubric.html", {
-        "template": tpl,
-        "categories_with_bands": categories_with_bands,
-        "marks_mismatch": marks_mismatch
-    })
-
-def template_feedback_sheet(request, pk):
-    """View example feedback sheet for students"""
-    """Marks are randomly generated"""
-    tpl = AssessmentTemplate.objects.get(pk=pk)
+    The template is read with the async ORM, and stale, invalid and
+    unchanged autosaves are answered without leaving the event loop. Only
+    the write runs through sync_to_async: its claim has to share a
+    transaction with the save, and the async ORM has no transactions.
+    """
+    import json
     
-    # Calculate grade bands for each category (for reference)
-    categories_with_bands = []
-    total_category_marks = 0
-    for cat in tpl.categories:
-        cat_data = cat.copy()
-        total_category_marks += cat.get("max", 0)
-        
-        if cat.get("type") == "grade" and cat.get("subdivision"):
-            bands = calculate_grade_bands(cat["max"], cat["subdivision"], degree_level=tpl.degree_level)
-            cat_data["bands"] = bands
-            grouped_bands = _group_bands_by_main_grade(bands)
-            cat_data["grouped_bands"] = grouped_bands
-            # Pick a deterministic example grade for this category using a RNG
-            # seeded from the template id so example sheets are repeatable per-template.
-            try:
-                rng = random.Random(tpl.pk)
-                chosen = rng.choice(bands) if bands else None
-                if chosen:
-                    # store an example grade and marks for template display
-                    cat_data["awarded_grade"] = chosen.get("grade")
-                    cat_data["awarded_mark"] = chosen.get("marks")
-                else:
-                    cat_data["awarded_grade"] = None
-                    cat_data["awarded_mark"] = None
-            except Exception:
-                cat_data["awarded_grade"] = None
-                cat_data["awarded_mark"] = None           
-        else:
-            # For numeric categories, provide an example awarded mark for the sample sheet
-            cat_data["awarded_grade"] = None
-            try:
-                rng = random.Random(tpl.pk)
-                max_marks = int(cat.get("max", 0)) if cat.get("max") is not None else 0
-                if max_marks > 0:
-                    # pick a deterministic example between 0 and max using seeded RNG
-                    cat_data["awarded_mark"] = rng.randint(0, max_marks)
-                else:
-                    cat_data["awarded_mark"] = None
-            except Exception:
-                cat_data["awarded_mark"] = None
-        categories_with_bands.append(cat_data)
+    if request.method not in ("POST", "PATCH"):
+        return JsonResponse({"error": "POST or PATCH required"}, status=405)
     
-    # Check if the sum of the category marks match the assessment max_marks
-    marks_mismatch = None
-    if total_category_marks != tpl.max_marks:
-        marks_mismatch = {
-            'total': total_category_marks,
-            'max_marks': tpl.max_marks
-        }
-
-    # Calculate overall grade for the assessment
     try:
-        from feedback.utils import grade_for_percentage
-
-        display_max = total_category_marks if total_category_marks > 0 else 0 # use total of maxima forcategories
-        assessment_mark = None
-        if display_max > 0:
-            # Compute the total awarded mark as the sum of per-category awarded
-            total_awarded_mark = 0
-            for c in categories_with_bands:
-                m = c.get("awarded_mark")
-                try:
-                    if m is not None:
-                        total_awarded_mark += int(m)
-                except Exception:
-                    # ignore non-integer/example values
-                    continue
-
-            assessment_mark = total_awarded_mark
-            # Derive an example grade band from the percentage of the total available marks
-            try:
-                percentage = (assessment_mark / display_max) * 100
-                grade = grade_for_percentage(percentage)
-            except Exception:
-                grade = None
-            assessment_grade = grade
-    except Exception:
-        assessment_grade = None
-
-    # Add awarded_mark_percentage to each category
-    for category in categories_with_bands:
-        max_marks = category.get("max", 0)
-        awarded_mark = category.get("awarded_mark", 0)
-        if max_marks > 0:
-            category["awarded_mark_percentage"] = (awarded_mark / max_marks) * 100
-        else:
-            category["awarded_mark_percentage"] = 0
-
-    # Update charts to include categories_with_bands
-    charts = tpl.charts if tpl.charts else []
-    # Add assessment_mark to each chart
-    for chart in charts:
-        if chart['type'] == 'histogram':
-            chart['student_mark'] = assessment_mark
-    # Map awarded marks to radar chart categories while keeping labels
-    for chart in charts:
-        if chart['type'] == 'radar':
-            chart['awarded_cat_percentages'] = [
-                next((cat['awarded_mark_percentage'] for cat in categories_with_bands if cat['label'] == label), 0) for label in chart['categories']
-            ]
-
-    return render(request, "feedback/template_feedback_sheet.html", {
-        "template": tpl,
-        "categories_with_bands": categories_with_bands,
-        "total_marks": total_category_marks,
-        "assessment_grade": assessment_grade,
-        "assessment_awarded": assessment_mark,
-        "charts": tpl.charts if tpl.charts else [],
-        "marks_mismatch": marks_mismatch
-    })
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    return await _autosave_async(pk, data)
 
-def template_delete(request, pk):
-    """AJAX endpoint to delete a template."""
+def template_flush(request, pk):
+    """
+    Beacon endpoint the editor calls as it closes.
+    
+    Takes a form POST (so `navigator.sendBeacon` can include the CSRF
+    token) with the final unsaved edits as a JSON `payload`, saves them like
+    `template_update` and writes anything buffered for the template.
+    """
+    import json
+    
     if request.method != "POST":
         return JsonResponse({"error": "POST required"}, status=405)
     
-    try:
-        tpl = AssessmentTemplate.objects.get(pk=pk)
-        tpl.delete()
-        return JsonResponse({"status": "deleted"})
-    except AssessmentTemplate.DoesNotExist:
-        return JsonResponse({"error": "Template not found"}, status=404)
-    except Exception as e:
-        return JsonResponse({"error": str(e)}, status=400)
+    response = None
+    if request.POST.get("payload"):
+        try:
+            data = json.loads(request.POST["payload"])
+        except ValueError:
+            return JsonResponse({"error": "Invalid JSON"}, status=400)
+        response = _autosave(pk, data)
+    autosave_buffer.flush(pk)
+    return response or JsonResponse({"status": "flushed"})
+
+def _version_conflict(version):
+    return JsonResponse(
+        {"error": "The template has been changed elsewhere; reload to continue editing",
+         "conflict": "version", "version": version},
+        status=409,
+    )
 
-def _group_bands_by_main_grade(bands):
-    """Group bands by main grade.
+# Times an autosave is read and written again when another save of the
+# template lands in between (only possible for patches without a version)
+AUTOSAVE_ATTEMPTS = 3
+
+def _autosave_payload_error(data):
+    """Return a 400 response for a malformed autosave payload, else None."""
+    if not isinstance(data, dict):
+        return JsonResponse({"error": "Expected a JSON object of fields"}, status=400)
+    patches = data.get("patch", {})
+    if not isinstance(patches, dict) or not set(patches) <= set(PATCHABLE_FIELDS):
+        return JsonResponse({"error": f"Only {', '.join(PATCHABLE_FIELDS)} can be patched"}, status=400)
+    return None
+
+def _autosave(pk, data):
+    """Validate an autosave payload and write (or buffer) the changed fields."""
+    error = _autosave_payload_error(data)
+    if error is not None:
+        return error
+    
+    for _ in range(AUTOSAVE_ATTEMPTS):
+        response = _autosave_attempt(pk, data)
+        if response is not None:
+            return response
+    return _version_conflict(AssessmentTemplate.objects.values_list("version", flat=True).get(pk=pk))
+
+async def _autosave_async(pk, data):
+    """`_autosave` for async views."""
+    error = _autosave_payload_error(data)
+    if error is not None:
+        return error
+    
+    for _ in range(AUTOSAVE_ATTEMPTS):
+        response = await _autosave_attempt_async(pk, data)
+        if response is not None:
+            return response
+    return _version_conflict(await AssessmentTemplate.objects.values_list("version", flat=True).aget(pk=pk))
 
-    Supports both undergraduate main grades ("1st", "2:1", "2:2", "3rd", "Fail")
-    and postgraduate main grades ("Dist", "Merit", "Pass", "Fail"). The
-    function inspects band labels to decide which set to use.
-    'Maximum 1st' is grouped with other '1st' bands (or 'Dist' bands when
-    remapped).
+def _autosave_attempt(pk, data):
     """
-    # Determine if bands appear to be postgraduate-labelled
-    pg_indicators = ('Dist', 'Merit', 'Pass')
-    use_pg = any(any(ind in band['grade'] for ind in pg_indicators) for band in bands)
-
-    if use_pg:
-        main_grades = ["Dist", "Merit", "Pass", "Fail"]
-    else:
-        main_grades = ["1st", "2:1", "2:2", "3rd", "Fail"]
-    grouped = {}
+    Read, patch and write a template once.
     
-    for band in bands:
-        # Find which main grade this band belongs to
-        main_grade = None
-        for grade in main_grades:
-            if grade in band["grade"]:
-                main_grade = grade
-                break
-
-        if main_grade:
-            grouped.setdefault(main_grade, []).append(band)
+    The template is read and patched outside any transaction: on SQLite a
+    transaction that reads and then writes can't wait for the write lock
+    (its upgrade fails at once with "database is locked"), and unchanged or
+    buffered autosaves shouldn't take that lock at all. See `_write_autosave`
+    for the write.
     
-    return grouped
-from django.shortcuts import render, redirect
-from django.http import JsonResponse
-from feedback.models import AssessmentTemplate
-from feedback.utils import calculate_grade_bands, validate_subdivision
-
-import random
-
-def home(request):
-    templates = AssessmentTemplate.objects.all().order_by('-id')
-    return render(request, "feedback/home.html", {
-        "page_title": "Feedback",
-        "templates": templates
-    })
-
-def template_new(request):
-    """Create a new template and redirect to edit page."""
-    tpl = AssessmentTemplate.objects.create(
-        component=1,
-        title="Untitled Template",
-        module_code="",
-        module_title="",
-        assessment_title="",
-        weighting=0,
-        max_marks=0,
-        categories=[]
-    )
-    return redirect("template_edit", pk=tpl.id)
-
-def template_edit(request, pk):
-    """Edit page with auto-save functionality."""
-    import json
-    tpl = AssessmentTemplate.objects.get(pk=pk)
-    return render(request, "feedback/template_edit.html", {
-        "template": tpl,
-        "categories_json": json.dumps(tpl.categories if tpl.categories else [])
-    })
+    Returns None if the template was saved between the read and the write.
+    """
+    buffered = autosave_buffer.enabled
+    tpl = autosave_buffer.load(pk) if buffered else AssessmentTemplate.objects.get(pk=pk)
+    
+    response, values, changed = _prepare_autosave(tpl, data)
+    if response is not None:
+        return response
+    
+    if buffered:
+        try:
+            version = autosave_buffer.stage(tpl, changed)
+        except AutosaveConflict as e:
+            return _version_conflict(e.version)
+        return JsonResponse({"status": "saved", "updated": changed, "version": version})
+    return _write_autosave(pk, tpl, data, values, changed)
+
+async def _autosave_attempt_async(pk, data):
+    """`_autosave_attempt`, reading the template with the async ORM."""
+    from asgiref.sync import sync_to_async
+    
+    if autosave_buffer.enabled:
+        # The buffer is shared with sync requests and guarded by a thread lock
+        return await sync_to_async(_autosave_attempt)(pk, data)
+    
+    tpl = await AssessmentTemplate.objects.aget(pk=pk)
+    response, values, changed = _prepare_autosave(tpl, data)
+    if response is not None:
+        return response
+    return await sync_to_async(_write_autosave)(pk, tpl, data, values, changed)
 
-def template_update(request, pk):
-    """AJAX endpoint for auto-saving template updates."""
-    import json
-    from django.http import JsonResponse
+def _prepare_autosave(tpl, data):
+    """
+    Check and apply an autosave to a template that has been read.
     
-    if request.method != "POST":
-        return JsonResponse({"error": "POST required"}, status=405)
+    Does no database work. Returns (response, values, changed): a response
+    when the autosave is answered without writing (a stale version, a bad
+    patch or no change), otherwise the new field values and the names of
+    the fields that change, already set on `tpl`.
+    """
+    from django.core.exceptions import ValidationError
     
-    tpl = AssessmentTemplate.objects.get(pk=pk)
-    data = json.loads(request.body)
-    # (no debug prints) - receive data but do not log to stdout in tests
-    
-    # Update fields if provided
-    if "title" in data:
-        tpl.title = data["title"]
-    if "module_code" in data:
-        tpl.module_code = data["module_code"]
-    if "module_title" in data:
-        tpl.module_title = data["module_title"]
-    if "assessment_title" in data:
-        tpl.assessment_title = data["assessment_title"]
-    if "weighting" in data:
-        tpl.weighting = data["weighting"]
-    if "max_marks" in data:
-        tpl.max_marks = data["max_marks"]
-    if "component" in data:
-        tpl.component = data["component"]
-    if "categories" in data:
-        tpl.categories = data["categories"]
-    if "charts" in data:
-        tpl.charts = data["charts"]
-    # Persist degree level if provided by autosave
-    if "degree_level" in data:
-        tpl.degree_level = data["degree_level"]
+    base_version = data.get("version")
+    if base_version is not None and base_version != tpl.version:
+        return _version_conflict(tpl.version), None, None
+    
+    patches = data.get("patch", {})
+    values = {field: data[field] for field in AUTOSAVE_FIELDS if field in data}
+    for field, operations in patches.items():
+        try:
+            values[field] = apply_patch(getattr(tpl, field), operations)
+        except JsonPatchConflict as e:
+            return JsonResponse({"error": str(e)}, status=409), None, None
+        except JsonPatchError as e:
+            return JsonResponse({"error": str(e)}, status=400), None, None
+    
+    changed = [field for field, value in values.items() if getattr(tpl, field) != value]
+    for field in changed:
+        setattr(tpl, field, values[field])
+    if not changed or tpl.compute_content_hash() == tpl.content_hash:
+        return JsonResponse({"status": "saved", "updated": [], "version": tpl.version}), None, None
+    
+    if patches:
+        try:
+            tpl.clean()
+        except ValidationError as e:
+            return JsonResponse({"error": "; ".join(e.messages)}, status=400), None, None
+    return None, values, changed
+
+def _write_autosave(pk, tpl, data, values, changed):
+    """
+    Write an autosave prepared by `_prepare_autosave`.
     
+    The write claims the row with an UPDATE as its transaction's first
+    statement, so it waits out the busy timeout like any single write. For
+    patches and versioned edits the UPDATE is conditional on the version
+    that was read; other edits re-read the row once it's claimed and write
+    their values over it, so the version and derived fields follow every
+    save.
+    
+    Returns None if the template was saved since it was read.
+    """
+    from django.db import transaction
+    from django.db.models import F
+    
+    # Patches were applied to, and versioned edits checked against, the
+    # version read; plain values from clients that don't send a version
+    # simply replace what's stored, so they're applied to the row as it is
+    # once the claim holds the write lock
+    versioned = data.get("version") is not None or bool(data.get("patch"))
+    claim = AssessmentTemplate.objects.filter(pk=pk)
+    if versioned:
+        claim = claim.filter(version=tpl.version)
     try:
-        tpl.save()
-        return JsonResponse({"status": "saved"})
+        with transaction.atomic():
+            if not claim.update(version=F("version")):
+                return None
+            if not versioned:
+                tpl = AssessmentTemplate.objects.get(pk=pk)
+                changed = [field for field in changed if getattr(tpl, field) != values[field]]
+                if not changed:
+                    return JsonResponse({"status": "saved", "updated": [], "version": tpl.version})
+                for field in changed:
+                    setattr(tpl, field, values[field])
+            tpl.save(update_fields=changed)
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=400)
+    return JsonResponse({"status": "saved", "updated": changed, "version": tpl.version})
 
 def grade_bands_preview(request):
     """AJAX endpoint to calculate grade bands for preview."""
-    from django.http import JsonResponse
+    # No database access; the bands come from the in-memory table
     from django.template.loader import render_to_string
     
     try:
-        max_marks = int(request.GET.get('max_marks', 0))
+        max_marks = _max_marks_param(request)
         subdivision = request.GET.get('subdivision', '')
         degree_level = request.GET.get('degree_level', None)
         
-        if max_marks < 1 or not subdivision:
+        if not max_marks or not subdivision:
             return JsonResponse({"html": ""})
         
-        bands = calculate_grade_bands(max_marks, subdivision, degree_level=degree_level)
-        grouped_bands = _group_bands_by_main_grade(bands)
+        bands = get_grade_bands(max_marks, subdivision, degree_level=degree_level)
+        grouped_bands = group_bands_by_main_grade(bands)
         
         # Render HTML template
         html = render_to_string('feedback/partials/grade_bands_grid.html', {
@@ -407,62 +471,193 @@ def grade_bands_preview(request):
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=400)
 
+async def grade_bands_preview_async(request):
+    """
+    Async variant of `grade_bands_preview`, served to ASGI requests.
+    
+    The preview does no I/O, so it's built on the event loop rather than
+    handed to a thread.
+    """
+    return grade_bands_preview(request)
+
+def _parse_max_marks(value):
+    """
+    Parse a max_marks query value, which must be a whole number in the range
+    the grade band table covers (and templates allow).
+    """
+    try:
+        max_marks = int(value)
+    except ValueError:
+        max_marks = None
+    if max_marks is None or not 1 <= max_marks <= GRADE_BAND_TABLE_MAX_MARKS:
+        raise ValueError(f"max_marks must be a whole number from 1 to {GRADE_BAND_TABLE_MAX_MARKS}")
+    return max_marks
+
+def _max_marks_param(request):
+    """The request's max_marks, or 0 when it isn't given."""
+    value = request.GET.get('max_marks', '')
+    return _parse_max_marks(value) if value else 0
+
+# A year; the band data for a versioned URL never changes
+GRADE_BAND_DATA_MAX_AGE = 60 * 60 * 24 * 365
+
+def grade_bands_data(request):
+    """
+    JSON endpoint returning grade band data for the editor to render.
+    
+    The result only depends on the query string and the grading scheme
+    definitions, so requests carrying the current band data version (`v`)
+    are cacheable as immutable by browsers and proxies.
+    """
+    try:
+        max_marks = _max_marks_param(request)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    subdivision = request.GET.get('subdivision', '')
+    degree_level = request.GET.get('degree_level', None)
+    
+    response = JsonResponse({
+        "max_marks": max_marks,
+        "subdivision": subdivision,
+        "scheme": scheme_for_degree_level(degree_level).name,
+        "groups": _band_groups(max_marks, subdivision, degree_level),
+    })
+    return _cache_band_data(request, response)
+
+# Most previews a batch request may ask for
+GRADE_BANDS_BATCH_LIMIT = 200
+
+def grade_bands_data_batch(request):
+    """
+    JSON endpoint returning band data for several previews at once.
+    
+    `items` is a comma-separated list of `max_marks:subdivision` pairs, all
+    for one `degree_level`, e.g. `?items=30:high_low,20:none&degree_level=BEng`.
+    Previews are keyed by their `max_marks:subdivision` pair.
+    """
+    degree_level = request.GET.get('degree_level', None)
+    items = [item for item in request.GET.get('items', '').split(',') if item]
+    if len(items) > GRADE_BANDS_BATCH_LIMIT:
+        return JsonResponse({"error": f"At most {GRADE_BANDS_BATCH_LIMIT} items per request"}, status=400)
+    
+    previews = {}
+    for item in items:
+        max_marks, _, subdivision = item.partition(':')
+        try:
+            max_marks = _parse_max_marks(max_marks)
+        except ValueError as e:
+            return JsonResponse({"error": f"Invalid item '{item}'; {e}"}, status=400)
+        previews[item] = _band_groups(max_marks, subdivision, degree_level)
+    
+    response = JsonResponse({
+        "scheme": scheme_for_degree_level(degree_level).name,
+        "previews": previews,
+    })
+    return _cache_band_data(request, response)
+
+def _band_groups(max_marks, subdivision, degree_level):
+    """Band data grouped by main grade, as rendered by the editor."""
+    if max_marks < 1 or not subdivision:
+        return []
+    bands = get_grade_bands(max_marks, subdivision, degree_level=degree_level)
+    return [
+        {"main_grade": main_grade, "bands": [{"grade": band.grade, "marks": band.marks} for band in band_list]}
+        for main_grade, band_list in group_bands_by_main_grade(bands).items()
+    ]
+
+def _cache_band_data(request, response):
+    if request.GET.get('v') == grade_band_data_version():
+        patch_cache_control(response, public=True, max_age=GRADE_BAND_DATA_MAX_AGE, immutable=True)
+    else:
+        # Unversioned or outdated URLs may change on the next deploy
+        patch_cache_control(response, public=True, max_age=3600)
+    return response
+
+def template_search(request):
+    """
+    Ranked full-text search over templates and their grade band descriptions.
+    
+    GET `q` is free text; `limit` caps the results (default and maximum
+    SEARCH_RESULT_LIMIT). Returns {"query", "results"}, best matches first.
+    """
+    query = request.GET.get("q", "").strip()
+    try:
+        limit = min(max(int(request.GET.get("limit", SEARCH_RESULT_LIMIT)), 1), SEARCH_RESULT_LIMIT)
+    except ValueError:
+        return JsonResponse({"error": "limit must be an integer"}, status=400)
+    
+    return JsonResponse({"query": query, "results": search_templates(query, limit=limit)})
+
+def grade_band_cache_stats(request):
+    """JSON endpoint exposing grade band cache counters for monitoring."""
+    return JsonResponse(grade_band_cache_info())
+
+@lru_cache(maxsize=1)
+def _subdivision_matrix_body():
+    """Serialised validity matrix; it only changes when the code does."""
+    import json
+    
+    degree_levels = AssessmentTemplate._meta.get_field("degree_level").choices
+    payload = {
+        "max_marks": GRADE_BAND_TABLE_MAX_MARKS,
+        "degree_levels": {value: scheme_for_degree_level(value).name for value, _ in degree_levels},
+        "valid": subdivision_validity_matrix(),
+        "bands_version": grade_band_data_version(),
+    }
+    body = json.dumps(payload, separators=(",", ":"))
+    return body, hashlib.sha256(body.encode()).hexdigest()[:16]
+
+@cache_control(public=True, max_age=86400)
+@etag(lambda request: _subdivision_matrix_body()[1])
+def subdivision_matrix(request):
+    """JSON endpoint listing the max_marks ranges where each subdivision is valid."""
+    return HttpResponse(_subdivision_matrix_body()[0], content_type="application/json")
+
+@read_your_writes
+@template_conditional
 def template_rubric(request, pk):
     """View rubric for pasting into assessment briefs"""
+    # The page only changes when the template does, so serve it from the
+    # cache while the stored content hash matches
+    row = _template_validators(request, pk)
+    content_hash = row["content_hash"] if row else None
+    if content_hash:
+        html = cache.get(rubric_cache_key(pk, content_hash))
+        if html is not None:
+            return HttpResponse(html)
+    
     tpl = AssessmentTemplate.objects.get(pk=pk)
     
-    # Calculate grade bands for each category
-    categories_with_bands = []
-    total_category_marks = 0
-    for cat in tpl.categories:
-        cat_data = cat.copy()
-        total_category_marks += cat.get("max", 0)
-        
-        if cat.get("type") == "grade" and cat.get("subdivision"):
-            bands = calculate_grade_bands(cat["max"], cat["subdivision"], degree_level=tpl.degree_level)
-            cat_data["bands"] = bands
-            
-            # Group bands by main grade for display
-            grouped_bands = _group_bands_by_main_grade(bands)
-            cat_data["grouped_bands"] = grouped_bands
-            
-            # Attach descriptions (one per main grade)
-            descriptions = cat.get("grade_band_descriptions", {})
-            cat_data["grade_descriptions"] = descriptions
-            
-        categories_with_bands.append(cat_data)
+    # Bands, grouped bands and totals are precomputed when the template is saved
+    compiled = compiled_data(tpl)
+    categories_with_bands = compiled["categories"]
     
     # Check if marks match
-    marks_mismatch = None
-    if tpl.max_marks and total_category_marks != tpl.max_marks:
-        marks_mismatch = {
-            'total': total_category_marks,
-            'max_marks': tpl.max_marks
-        }
-    
-    return render(request, "feedback/template_rubric.html", {
+    marks_mismatch = compiled["marks_mismatch"] if tpl.max_marks else None
+    
+    response = render(request, "feedback/template_rubric.html", {
         "template": tpl,
         "categories_with_bands": categories_with_bands,
         "marks_mismatch": marks_mismatch
     })
+    if tpl.content_hash:
+        cache.set(rubric_cache_key(tpl.pk, tpl.content_hash), response.content, PAGE_CACHE_TIMEOUT)
+    return response
 
+@read_your_writes
+@template_conditional
 def template_feedback_sheet(request, pk):
     """View example feedback sheet for students"""
     """Marks are randomly generated"""
     tpl = AssessmentTemplate.objects.get(pk=pk)
     
-    # Calculate grade bands for each category (for reference)
+    # Grade bands for each category (for reference) are precomputed on save
+    compiled = compiled_data(tpl)
     categories_with_bands = []
-    total_category_marks = 0
-    for cat in tpl.categories:
-        cat_data = cat.copy()
-        total_category_marks += cat.get("max", 0)
-        
-        if cat.get("type") == "grade" and cat.get("subdivision"):
-            bands = calculate_grade_bands(cat["max"], cat["subdivision"], degree_level=tpl.degree_level)
-            cat_data["bands"] = bands
-            grouped_bands = _group_bands_by_main_grade(bands)
-            cat_data["grouped_bands"] = grouped_bands
+    total_category_marks = compiled["total_category_marks"]
+    for cat_data in compiled["categories"]:
+        if cat_data.get("type") == "grade" and cat_data.get("subdivision"):
+            bands = cat_data["bands"]
             # Pick a deterministic example grade for this category using a RNG
             # seeded from the template id so example sheets are repeatable per-template.
             try:
@@ -470,8 +665,8 @@ def template_feedback_sheet(request, pk):
                 chosen = rng.choice(bands) if bands else None
                 if chosen:
                     # store an example grade and marks for template display
-                    cat_data["awarded_grade"] = chosen.get("grade")
-                    cat_data["awarded_mark"] = chosen.get("marks")
+                    cat_data["awarded_grade"] = chosen["grade"]
+                    cat_data["awarded_mark"] = chosen["marks"]
                 else:
                     cat_data["awarded_grade"] = None
                     cat_data["awarded_mark"] = None
@@ -483,7 +678,7 @@ def template_feedback_sheet(request, pk):
             cat_data["awarded_grade"] = None
             try:
                 rng = random.Random(tpl.pk)
-                max_marks = int(cat.get("max", 0)) if cat.get("max") is not None else 0
+                max_marks = int(cat_data.get("max", 0)) if cat_data.get("max") is not None else 0
                 if max_marks > 0:
                     # pick a deterministic example between 0 and max using seeded RNG
                     cat_data["awarded_mark"] = rng.randint(0, max_marks)
@@ -494,12 +689,7 @@ def template_feedback_sheet(request, pk):
         categories_with_bands.append(cat_data)
     
     # Check if the sum of the category marks match the assessment max_marks
-    marks_mismatch = None
-    if total_category_marks != tpl.max_marks:
-        marks_mismatch = {
-            'total': total_category_marks,
-            'max_marks': tpl.max_marks
-        }
+    marks_mismatch = compiled["marks_mismatch"]
 
     # Calculate overall grade for the assessment
     try:
@@ -569,6 +759,7 @@ def template_delete(request, pk):
     
     try:
         tpl = AssessmentTemplate.objects.get(pk=pk)
+        autosave_buffer.discard(pk)
         tpl.delete()
         return JsonResponse({"status": "deleted"})
     except AssessmentTemplate.DoesNotExist:
@@ -576,34 +767,17 @@ def template_delete(request, pk):
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=400)
 
-def _group_bands_by_main_grade(bands):
-    """Group bands by main grade.
-
-    Supports both undergraduate main grades ("1st", "2:1", "2:2", "3rd", "Fail")
-    and postgraduate main grades ("Dist", "Merit", "Pass", "Fail"). The
-    function inspects band labels to decide which set to use.
-    'Maximum 1st' is grouped with other '1st' bands (or 'Dist' bands when
-    remapped).
-    """
-    # Determine if bands appear to be postgraduate-labelled
-    pg_indicators = ('Dist', 'Merit', 'Pass')
-    use_pg = any(any(ind in band['grade'] for ind in pg_indicators) for band in bands)
-
-    if use_pg:
-        main_grades = ["Dist", "Merit", "Pass", "Fail"]
-    else:
-        main_grades = ["1st", "2:1", "2:2", "3rd", "Fail"]
-    grouped = {}
-    
-    for band in bands:
-        # Find which main grade this band belongs to
-        main_grade = None
-        for grade in main_grades:
-            if grade in band["grade"]:
-                main_grade = grade
-                break
-
-        if main_grade:
-            grouped.setdefault(main_grade, []).append(band)
+async def template_delete_async(request, pk):
+    """Async variant of `template_delete`, served to ASGI requests."""
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
     
-    return grouped
\ No newline at end of file
+    try:
+        tpl = await AssessmentTemplate.objects.aget(pk=pk)
+        autosave_buffer.discard(pk)
+        await tpl.adelete()
+        return JsonResponse({"status": "deleted"})
+    except AssessmentTemplate.DoesNotExist:
+        return JsonResponse({"error": "Template not found"}, status=404)
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=400)
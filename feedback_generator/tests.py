@@ -1,3 +1,78 @@
+import json
+
+from asgiref.sync import async_to_sync
 from django.test import TestCase
+from feedback.tests.query_budget import QueryBudgetMixin, create_phrase_bank
+from feedback_generator.models import FeedbackRow, Question
+
+
+class FeedbackGeneratorEndpointTests(TestCase):
+    """Tests for the JSON endpoints that edit questions and rows."""
+    
+    def setUp(self):
+        self.question = Question.objects.create(text="Introduction", order=1)
+        self.row = FeedbackRow.objects.create(
+            question=self.question, label="Structure", text_positive="Clear", text_negative="Unclear", order=1
+        )
+    
+    def post(self, name, payload):
+        return self.client.post(f"/feedback-generator/{name}/", data=json.dumps(payload), content_type="application/json")
+    
+    def get(self, name):
+        return self.client.get(f"/feedback-generator/{name}/")
+    
+    def test_edit_and_add_rows(self):
+        self.assertEqual(self.post("edit_row", {"id": self.row.id, "label": "Layout"}).status_code, 200)
+        self.row.refresh_from_db()
+        self.assertEqual(self.row.label, "Layout")
+        
+        self.assertEqual(self.post("add_row", {"question_id": self.question.id, "label": "Content"}).status_code, 200)
+        self.assertEqual(list(self.question.rows.values_list("label", "order")), [("Layout", 1), ("Content", 2)])
+    
+    def test_missing_objects_and_methods_are_errors(self):
+        self.assertEqual(self.post("delete_row", {"id": 999}).status_code, 400)
+        self.assertEqual(self.post("add_row", {}).status_code, 400)
+        self.assertEqual(self.get("edit_row").status_code, 405)
+    
+    def test_question_lifecycle(self):
+        self.post("add_question", {"text": "Method"})
+        second = Question.objects.get(text="Method")
+        self.assertEqual(second.order, 2)
+        
+        self.post("reorder_questions", {"order": [second.id, self.question.id]})
+        self.assertEqual(list(Question.objects.values_list("text", flat=True)), ["Method", "Introduction"])
+        
+        self.post("edit_question", {"id": second.id, "text": "Methods"})
+        self.post("delete_question", {"id": self.question.id})
+        self.assertEqual(list(Question.objects.values_list("text", flat=True)), ["Methods"])
+        self.assertFalse(FeedbackRow.objects.exists())
+
+
+
+class AsyncFeedbackGeneratorEndpointTests(FeedbackGeneratorEndpointTests):
+    """The same tests through the ASGI handler, which routes to the async variants."""
+    
+    def routed(self, response):
+        self.assertTrue(response.resolver_match.func.__name__.endswith("_async"), response.resolver_match)
+        return response
+    
+    def post(self, name, payload):
+        return self.routed(async_to_sync(self.async_client.post)(
+            f"/feedback-generator/{name}/", data=json.dumps(payload), content_type="application/json"
+        ))
+    
+    def get(self, name):
+        return self.routed(async_to_sync(self.async_client.get)(f"/feedback-generator/{name}/"))
+
 
-# Create your tests here.
+class IndexQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Query and time budget for the phrase bank page."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        create_phrase_bank(questions=50, rows=30)
+    
+    def test_index_queries_dont_grow_with_questions_or_rows(self):
+        # Questions, their prefetched rows, and the flat row id list
+        response = self.assertViewBudget("/feedback-generator/", queries=3, seconds=2.0)
+        self.assertContains(response, "Question 49")
@@ -11,3 +11,14 @@ urlpatterns = [
     path('delete_question/', views.delete_question, name='delete_question'),
     path('reorder_questions/', views.reorder_questions, name='reorder_questions'),
 ]
+
+# Served instead of the views above to ASGI requests (see core.urls_asgi)
+async_urlpatterns = [
+    path('edit_row/', views.edit_row_async, name='edit_row'),
+    path('add_row/', views.add_row_async, name='add_row'),
+    path('delete_row/', views.delete_row_async, name='delete_row'),
+    path('add_question/', views.add_question_async, name='add_question'),
+    path('edit_question/', views.edit_question_async, name='edit_question'),
+    path('delete_question/', views.delete_question_async, name='delete_question'),
+    path('reorder_questions/', views.reorder_questions_async, name='reorder_questions'),
+]
@@ -1,4 +1,4 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render, get_object_or_404, aget_object_or_404
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.db import models
@@ -130,3 +130,119 @@ def reorder_questions(request):
         except Exception as e:
             return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
     return JsonResponse({'status': 'error', 'message': 'Invalid method'}, status=405)
+
+# Async variants of the endpoints above, served to ASGI requests (see
+# core.urls_asgi). They use the async ORM, so a single ASGI worker doesn't
+# tie up a thread per request waiting on the database.
+
+@csrf_exempt
+async def edit_row_async(request):
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            row = await aget_object_or_404(FeedbackRow, id=data.get('id'))
+            row.label = data.get('label', row.label)
+            row.text_positive = data.get('text_positive', row.text_positive)
+            row.text_negative = data.get('text_negative', row.text_negative)
+            await row.asave()
+            return JsonResponse({'status': 'success', 'message': 'Row updated successfully'})
+        except Exception as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    return JsonResponse({'status': 'error', 'message': 'Invalid method'}, status=405)
+
+@csrf_exempt
+async def add_row_async(request):
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            question_id = data.get('question_id')
+            if not question_id:
+                return JsonResponse({'status': 'error', 'message': 'Question ID required'}, status=400)
+            
+            question = await aget_object_or_404(Question, id=question_id)
+            
+            # Find next order in this question
+            max_order = (await FeedbackRow.objects.filter(question=question).aaggregate(models.Max('order')))['order__max']
+            new_order = (max_order or 0) + 1
+            
+            await FeedbackRow.objects.acreate(
+                question=question,
+                label=data.get('label', 'New Criteria'),
+                text_positive=data.get('text_positive', ''),
+                text_negative=data.get('text_negative', ''),
+                order=new_order
+            )
+            return JsonResponse({'status': 'success', 'message': 'Row added successfully'})
+        except Exception as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    return JsonResponse({'status': 'error', 'message': 'Invalid method'}, status=405)
+
+@csrf_exempt
+async def delete_row_async(request):
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            row = await aget_object_or_404(FeedbackRow, id=data.get('id'))
+            await row.adelete()
+            return JsonResponse({'status': 'success', 'message': 'Row deleted successfully'})
+        except Exception as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    return JsonResponse({'status': 'error', 'message': 'Invalid method'}, status=405)
+
+@csrf_exempt
+async def add_question_async(request):
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            # Find next order
+            max_order = (await Question.objects.aaggregate(models.Max('order')))['order__max']
+            new_order = (max_order or 0) + 1
+            
+            await Question.objects.acreate(
+                text=data.get('text', 'New Question'),
+                order=new_order
+            )
+            return JsonResponse({'status': 'success', 'message': 'Question added successfully'})
+        except Exception as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    return JsonResponse({'status': 'error', 'message': 'Invalid method'}, status=405)
+
+@csrf_exempt
+async def delete_question_async(request):
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            question = await aget_object_or_404(Question, id=data.get('id'))
+            await question.adelete()
+            return JsonResponse({'status': 'success', 'message': 'Question deleted successfully'})
+        except Exception as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    return JsonResponse({'status': 'error', 'message': 'Invalid method'}, status=405)
+
+@csrf_exempt
+async def edit_question_async(request):
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            question = await aget_object_or_404(Question, id=data.get('id'))
+            question.text = data.get('text', question.text)
+            await question.asave()
+            return JsonResponse({'status': 'success', 'message': 'Question updated successfully'})
+        except Exception as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    return JsonResponse({'status': 'error', 'message': 'Invalid method'}, status=405)
+
+@csrf_exempt
+async def reorder_questions_async(request):
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            order_data = data.get('order', []) # Expect list of IDs in new order
+            
+            for index, question_id in enumerate(order_data):
+                await Question.objects.filter(id=question_id).aupdate(order=index)
+                
+            return JsonResponse({'status': 'success', 'message': 'Questions reordered successfully'})
+        except Exception as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    return JsonResponse({'status': 'error', 'message': 'Invalid method'}, status=405)
@@ -0,0 +1,98 @@
+# functional_tests/test_home_search.py
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from .base import FunctionalTestBase
+from feedback.views import HOME_PAGE_SIZE
+
+
+class HomeSearchFT(FunctionalTestBase):
+    """Functional tests for searching, filtering and paging the home listing."""
+
+    def listed_titles(self):
+        return [item.find_element(By.TAG_NAME, "h5").text for item in self.browser.find_elements(By.CSS_SELECTOR, ".list-group-item")]
+
+    def submit_search(self, **fields):
+        form = self.wait.until(EC.presence_of_element_located((By.ID, "template-search")))
+        for name, value in fields.items():
+            field = form.find_element(By.NAME, name)
+            field.clear()
+            field.send_keys(value)
+        form.find_element(By.CSS_SELECTOR, "button[type=submit]").click()
+        self.wait.until(EC.staleness_of(form))
+
+    def test_staff_member_searches_and_filters_templates(self):
+        """
+        GIVEN: Templates for several modules exist
+        WHEN: A staff member searches by text and filters by module code
+        THEN: Only the matching templates are listed, and Clear shows them all again
+        """
+        # GIVEN: Templates for three modules, one stored with a lower-case code
+        self.create_test_template(title="Introduction to Programming", module_code="CS101")
+        self.create_test_template(title="Database Systems", module_code="CS202", component=2)
+        self.create_test_template(title="Data Structures", module_code="cs102")
+
+        # WHEN: Staff member searches for "Database"
+        self.navigate_to_home()
+        self.submit_search(q="Database")
+
+        # THEN: Only the matching template is listed
+        self.assertEqual(self.listed_titles(), ["Database Systems"])
+
+        # WHEN: They clear the search
+        self.browser.find_element(By.LINK_TEXT, "Clear").click()
+        self.wait.until(EC.url_to_be(f"{self.live_server_url}/feedback/"))
+
+        # THEN: Every template is listed again, newest first
+        self.assertEqual(self.listed_titles(), ["Data Structures", "Database Systems", "Introduction to Programming"])
+
+        # WHEN: They filter by a module code typed in a different case
+        self.submit_search(module_code="CS102")
+
+        # THEN: The template is found regardless of case
+        self.assertEqual(self.listed_titles(), ["Data Structures"])
+        self.assertEqual(self.browser.find_element(By.NAME, "module_code").get_attribute("value"), "CS102")
+
+        # WHEN: They filter by a module code no template has
+        self.submit_search(module_code="XX999")
+
+        # THEN: They're told nothing matches and can get back to the full list
+        self.assertIn("No templates match your search", self.browser.find_element(By.TAG_NAME, "body").text)
+        self.browser.find_element(By.LINK_TEXT, "Show all templates").click()
+        self.wait.until(lambda d: len(self.listed_titles()) == 3)
+
+    def test_staff_member_pages_through_templates(self):
+        """
+        GIVEN: More templates exist than fit on one page
+        WHEN: A staff member follows the Older and Newer links
+        THEN: They see every template once, page by page, with their filter kept
+        """
+        # GIVEN: Two more templates than a page holds, all for one module
+        for i in range(HOME_PAGE_SIZE + 2):
+            self.create_test_template(title=f"Template {i:02d}", module_code="CS301")
+        self.create_test_template(title="Other module", module_code="CS999")
+
+        # WHEN: Staff member filters by the module
+        self.navigate_to_home()
+        self.submit_search(module_code="CS301")
+
+        # THEN: A full page is shown, newest first, with only an Older link
+        first_page = self.listed_titles()
+        self.assertEqual(len(first_page), HOME_PAGE_SIZE)
+        self.assertEqual(first_page[0], f"Template {HOME_PAGE_SIZE + 1:02d}")
+        self.assertFalse(self.browser.find_elements(By.ID, "newer-templates"))
+
+        # WHEN: They follow the Older link
+        self.browser.find_element(By.ID, "older-templates").click()
+        self.wait.until(EC.url_contains("after="))
+
+        # THEN: The remaining two templates of the module are shown
+        self.assertEqual(self.listed_titles(), ["Template 01", "Template 00"])
+        self.assertIn("module_code=CS301", self.browser.current_url)
+        self.assertFalse(self.browser.find_elements(By.ID, "older-templates"))
+
+        # WHEN: They follow the Newer link
+        self.browser.find_element(By.ID, "newer-templates").click()
+        self.wait.until(EC.url_contains("before="))
+
+        # THEN: They're back on the first page
+        self.assertEqual(self.listed_titles(), first_page)
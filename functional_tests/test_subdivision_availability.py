@@ -0,0 +1,41 @@
+from selenium.webdriver.common.by import By
+from .base import FunctionalTestBase
+
+
+class SubdivisionAvailabilityFT(FunctionalTestBase):
+    """
+    Functional tests for disabling subdivisions that would produce
+    overlapping grade bands for the entered max marks.
+    """
+
+    def test_invalid_subdivisions_are_disabled_for_max_marks(self):
+        """
+        GIVEN: A staff member creates an MEng/MSc template with a 10-mark grade category
+        WHEN: They look at the subdivision buttons
+        THEN: Subdivisions that are invalid for 10 marks are disabled
+        WHEN: They raise the max marks to 30
+        THEN: Every subdivision is available again
+        """
+        self.navigate_to_home()
+        self.create_new_template()
+        self.select_box_action('degree_level', 'MEng/MSc')
+
+        self.add_category_row()
+        self.fill_category(0, "Knowledge", 10, category_type='grade', subdivision='none')
+
+        row = self.get_category_rows()[0]
+        high_low = row.find_element(By.CSS_SELECTOR, "button[data-subdivision='high_low']")
+        self.wait.until(lambda d: not high_low.is_enabled())
+        self.assertIn("10 marks", high_low.get_attribute("title"))
+
+        # The current selection stays clickable so the saved choice is still shown
+        current = row.find_element(By.CSS_SELECTOR, "button[data-subdivision='none']")
+        self.assertTrue(current.is_enabled())
+
+        max_input = row.find_element(By.CSS_SELECTOR, "input.cat-max")
+        max_input.clear()
+        max_input.send_keys("30")
+
+        self.wait.until(lambda d: high_low.is_enabled())
+        for btn in row.find_elements(By.CSS_SELECTOR, ".subdivision-btn"):
+            self.assertTrue(btn.is_enabled())